@@ -1,12 +1,22 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
+from django.contrib.auth.forms import AdminPasswordChangeForm
 
 from .models import EmailVerificationToken, PasswordResetToken, User
 
 
+class RevokingPasswordChangeForm(AdminPasswordChangeForm):
+    """Admin password change that also revokes the user's outstanding tokens."""
+
+    def save(self, commit=True):
+        self.user.revoke_tokens()
+        return super().save(commit)
+
+
 @admin.register(User)
 class UserAdmin(DjangoUserAdmin):
     model = User
+    change_password_form = RevokingPasswordChangeForm
     list_display = ("email", "first_name", "last_name", "is_active", "is_email_verified", "is_staff")
     ordering = ("email",)
     search_fields = ("email", "first_name", "last_name")
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from project import routers
+
+from .cache import get_cached_user, get_token_version
+from .models import User
+from .tokens import VERSION_CLAIM
+
+
+class ClaimsUser(TokenUser):
+    """Request user built from access-token claims instead of a database row."""
+
+    @cached_property
+    def id(self) -> int:
+        return int(super().id)
+
+    @cached_property
+    def email(self) -> str:
+        return self.token.get("email", "")
+
+    @cached_property
+    def is_email_verified(self) -> bool:
+        return self.token.get("is_email_verified", False)
+
+    @cached_property
+    def version(self) -> int:
+        return self.token.get(VERSION_CLAIM, 0)
+
+    def load(self) -> User | None:
+        """Return the full user row for views that need more than the claims."""
+        return get_cached_user(self.id)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """Authenticates from token claims without loading ``accounts.User``.
+
+    The token's version claim is checked against a short-lived cached copy of
+    the user's ``token_version``, so password changes and deactivation still
+    revoke outstanding tokens. Tokens issued without claims fall back to the
+    database lookup done by ``JWTAuthentication``. The user id is handed to
+    the replica router so recent writers keep reading from the primary.
+    """
+
+    def get_user(self, validated_token: Token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is not None:
+            routers.bind_user(int(user_id))
+        if VERSION_CLAIM not in validated_token:
+            return JWTAuthentication.get_user(self, validated_token)
+        user = super().get_user(validated_token)
+        if get_token_version(user.id) != user.version:
+            raise AuthenticationFailed(
+                _("Token is no longer valid."), code="token_revoked"
+            )
+        return user
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import User
+
+# Cached in place of a version for users who may no longer authenticate.
+REVOKED = -1
+
+
+def _user_key(user_id: int) -> str:
+    return f"accounts:user:{user_id}"
+
+
+def _version_key(user_id: int) -> str:
+    return f"accounts:user-version:{user_id}"
+
+
+def _ttl() -> int:
+    return settings.AUTH_USER_CACHE_TTL_SECONDS
+
+
+def get_cached_user(user_id: int) -> User | None:
+    """Return the full user row, served from the cache for a short TTL."""
+    key = _user_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = User.objects.filter(pk=user_id).first()
+        if user is not None:
+            cache.set(key, user, _ttl())
+    return user
+
+
+def get_token_version(user_id: int) -> int:
+    """Return the token version tokens must carry, or ``REVOKED``.
+
+    Revocations reach other workers only through this cache, so it must be
+    shared between processes; settings refuse the per-process default
+    outside DEBUG.
+    """
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        row = (
+            User.objects.filter(pk=user_id)
+            .values_list("token_version", "is_active")
+            .first()
+        )
+        version = row[0] if row and row[1] else REVOKED
+        cache.set(key, version, _ttl())
+    return version
+
+
+def refresh_user_cache(user: User) -> None:
+    """Publish a saved user's token version and drop its cached row.
+
+    Called from ``post_save``; queryset ``update()`` calls bypass it, so
+    changes made that way are only picked up once the TTL expires.
+    """
+    version = user.token_version if user.is_active else REVOKED
+    cache.set(_version_key(user.pk), version, _ttl())
+    cache.delete(_user_key(user.pk))
+
+
+def forget_user(user_id: int) -> None:
+    cache.set(_version_key(user_id), REVOKED, _ttl())
+    cache.delete(_user_key(user_id))
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0003_user_token_version"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                Lower("email"),
+                name="accounts_user_email_lower_uniq",
+                violation_error_message="A user with that email already exists.",
+            ),
+        ),
+    ]
@@ -7,12 +7,27 @@ from django.conf import settings
 from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
 from django.contrib.auth.models import PermissionsMixin
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Lower
 from django.utils import timezone
 
 
 class UserManager(BaseUserManager):
     use_in_migrations = True
 
+    def by_email(self, email: str) -> models.QuerySet:
+        """Users whose email equals ``email`` ignoring case.
+
+        Compares ``LOWER(email)`` so the lookup can use the functional unique
+        index; ``email__iexact`` compiles to ``UPPER(...)`` and cannot.
+        """
+        return self.alias(email_lower=Lower("email")).filter(
+            email_lower=Lower(Value(email))
+        )
+
+    def get_by_natural_key(self, username: str):
+        return self.by_email(username).get()
+
     def _create_user(self, email: str, password: str | None, **extra_fields):
         if not email:
             raise ValueError("The email address must be set.")
@@ -49,6 +64,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
     is_email_verified = models.BooleanField(default=False)
+    # Embedded in issued tokens; bumping it revokes every outstanding token.
+    token_version = models.PositiveIntegerField(default=0)
     date_joined = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -57,9 +74,26 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS: list[str] = []
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                Lower("email"),
+                name="accounts_user_email_lower_uniq",
+                violation_error_message="A user with that email already exists.",
+            ),
+        ]
+
     def __str__(self) -> str:
         return self.email
 
+    def revoke_tokens(self) -> None:
+        """Invalidate every token issued so far; takes effect on ``save()``.
+
+        Not done in ``set_password``: Django also calls it to upgrade the
+        hash on login, which must not log the user out.
+        """
+        self.token_version += 1
+
 
 class TokenBase(models.Model):
     token = models.CharField(max_length=255, unique=True)
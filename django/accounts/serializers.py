@@ -3,8 +3,12 @@ from __future__ import annotations
 from django.contrib.auth import authenticate
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 
 from .models import EmailVerificationToken, PasswordResetToken, User
+from .tokens import VERSION_CLAIM, apply_user_claims
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -38,6 +42,14 @@ class RegisterSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ("email", "first_name", "last_name", "password")
+        # The field's own UniqueValidator matches case-sensitively; validate_email
+        # checks against the Lower(email) constraint instead.
+        extra_kwargs = {"email": {"validators": []}}
+
+    def validate_email(self, value: str) -> str:
+        if User.objects.by_email(value).exists():
+            raise serializers.ValidationError(_("user with this email already exists."))
+        return value
 
     def create(self, validated_data):
         password = validated_data.pop("password")
@@ -70,7 +82,11 @@ class EmailVerificationSerializer(serializers.Serializer):
     token = serializers.CharField()
 
     def validate_token(self, value: str):
-        token = EmailVerificationToken.objects.filter(token=value, consumed_at__isnull=True).first()
+        token = (
+            EmailVerificationToken.objects.select_related("user")
+            .filter(token=value, consumed_at__isnull=True)
+            .first()
+        )
         if not token or not token.is_valid():
             raise serializers.ValidationError(_("Invalid or expired token."))
         self.context["token_instance"] = token
@@ -81,7 +97,7 @@ class ResendVerificationSerializer(serializers.Serializer):
     email = serializers.EmailField()
 
     def validate_email(self, value: str):
-        user = User.objects.filter(email=value).first()
+        user = User.objects.by_email(value).first()
         if not user:
             raise serializers.ValidationError(_("User not found."))
         if user.is_email_verified:
@@ -100,7 +116,11 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
 
     def validate(self, attrs):
         token_value = attrs.get("token")
-        token = PasswordResetToken.objects.filter(token=token_value, consumed_at__isnull=True).first()
+        token = (
+            PasswordResetToken.objects.select_related("user")
+            .filter(token=token_value, consumed_at__isnull=True)
+            .first()
+        )
         if not token or not token.is_valid():
             raise serializers.ValidationError({"token": _("Invalid or expired token.")})
         attrs["token_instance"] = token
@@ -114,3 +134,38 @@ class UserUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ("first_name", "last_name")
+
+
+class UserTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refreshes tokens with claims re-read from the user row.
+
+    Refresh is the one place the user is loaded, so profile changes reach the
+    claims here and a bumped ``token_version`` rejects the refresh token.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user = User.objects.filter(pk=refresh.get(api_settings.USER_ID_CLAIM)).first()
+        if (
+            user is None
+            or not api_settings.USER_AUTHENTICATION_RULE(user)
+            or refresh.get(VERSION_CLAIM, user.token_version) != user.token_version
+        ):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+        apply_user_claims(refresh, user)
+
+        data = {"access": str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    refresh.blacklist()
+                except AttributeError:
+                    pass
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+        return data
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import forget_user, refresh_user_cache
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance: User, **kwargs) -> None:  # noqa: ARG001
+    refresh_user_cache(instance)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance: User, **kwargs) -> None:  # noqa: ARG001
+    forget_user(instance.pk)
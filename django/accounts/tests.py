@@ -0,0 +1,84 @@
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .admin import RevokingPasswordChangeForm
+from .models import PasswordResetToken, User
+
+PASSWORD = "correct horse battery"
+
+
+class WeakPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """The default hasher with the iteration count of an older Django release."""
+
+    iterations = 1000
+
+
+class TokenVersionTests(TestCase):
+    def _user(self) -> User:
+        return User.objects.create_user(
+            email="ada@example.com", password=PASSWORD, is_email_verified=True
+        )
+
+    def _login(self) -> dict:
+        response = self.client.post(
+            reverse("login"), {"email": "ada@example.com", "password": PASSWORD}
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()["token"]
+
+    def test_hash_upgrade_on_login_keeps_tokens_valid(self):
+        with override_settings(
+            PASSWORD_HASHERS=["accounts.tests.WeakPBKDF2PasswordHasher"]
+        ):
+            user = self._user()
+        old_hash = user.password
+
+        token = self._login()
+
+        user.refresh_from_db()
+        self.assertNotEqual(user.password, old_hash)
+        self.assertEqual(user.token_version, 0)
+        me = self.client.get(
+            reverse("me"), HTTP_AUTHORIZATION=f"Bearer {token['access']}"
+        )
+        self.assertEqual(me.status_code, 200)
+        refreshed = self.client.post(
+            reverse("token_refresh"), {"refresh": token["refresh"]}
+        )
+        self.assertEqual(refreshed.status_code, 200)
+
+    def test_password_reset_revokes_tokens(self):
+        user = self._user()
+        token = self._login()
+        reset = PasswordResetToken.create_for_user(user)
+
+        response = self.client.post(
+            reverse("reset_password"),
+            {"token": reset.token, "password": "a new password"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        user.refresh_from_db()
+        self.assertEqual(user.token_version, 1)
+        me = self.client.get(
+            reverse("me"), HTTP_AUTHORIZATION=f"Bearer {token['access']}"
+        )
+        self.assertEqual(me.status_code, 401)
+
+    def test_admin_password_change_revokes_tokens(self):
+        user = self._user()
+        form = RevokingPasswordChangeForm(
+            user,
+            {
+                "password1": "a new password",
+                "password2": "a new password",
+                "usable_password": "true",
+            },
+        )
+
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+
+        user.refresh_from_db()
+        self.assertEqual(user.token_version, 1)
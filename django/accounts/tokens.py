@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import Any
+
+from rest_framework_simplejwt.tokens import RefreshToken, Token
+
+from .models import User
+
+VERSION_CLAIM = "ver"
+
+
+def user_claims(user: User) -> dict[str, Any]:
+    """Claims that let authenticated requests skip loading the user row."""
+    return {
+        "email": user.email,
+        "is_staff": user.is_staff,
+        "is_email_verified": user.is_email_verified,
+        VERSION_CLAIM: user.token_version,
+    }
+
+
+def apply_user_claims(token: Token, user: User) -> None:
+    for claim, value in user_claims(user).items():
+        token[claim] = value
+
+
+class UserRefreshToken(RefreshToken):
+    """Refresh token whose access tokens carry the user's claims."""
+
+    @classmethod
+    def for_user(cls, user: User) -> "UserRefreshToken":
+        token = super().for_user(user)
+        apply_user_claims(token, user)
+        return token
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 from rest_framework import permissions, status
+from rest_framework.exceptions import NotAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
 
 from notifications import notifier
 
+from .cache import get_cached_user
 from .emails import send_password_reset_email, send_verification_email
 from .models import EmailVerificationToken, PasswordResetToken, User
 from .serializers import (
@@ -20,6 +21,7 @@ from .serializers import (
     UserUpdateSerializer,
     UserSerializer,
 )
+from .tokens import UserRefreshToken
 
 
 class RegisterView(APIView):
@@ -32,7 +34,7 @@ class RegisterView(APIView):
         token = EmailVerificationToken.create_for_user(user)
         send_verification_email(user.email, token.token)
 
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
         return Response(
             {
                 "user": UserSerializer(user, context={"request": request}).data,
@@ -54,7 +56,7 @@ class LoginView(APIView):
         serializer.is_valid(raise_exception=True)
         user: User = serializer.validated_data["user"]
 
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
         return Response(
             {
                 "user": UserSerializer(user, context={"request": request}).data,
@@ -71,11 +73,14 @@ class MeView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        return Response(UserSerializer(request.user, context={"request": request}).data)
+        user = get_cached_user(request.user.id)
+        if user is None:
+            raise NotAuthenticated()
+        return Response(UserSerializer(user, context={"request": request}).data)
 
     def patch(self, request):
         serializer = UserUpdateSerializer(
-            instance=request.user,
+            instance=User.objects.get(pk=request.user.id),
             data=request.data,
             partial=True,
         )
@@ -130,7 +135,7 @@ class ForgotPasswordView(APIView):
         serializer = PasswordResetRequestSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         email = serializer.validated_data["email"]
-        user = User.objects.filter(email=email).first()
+        user = User.objects.by_email(email).first()
         if user:
             token = PasswordResetToken.create_for_user(user)
             send_password_reset_email(user.email, token.token)
@@ -148,6 +153,7 @@ class ResetPasswordView(APIView):
         token: PasswordResetToken = serializer.validated_data["token_instance"]
         user = token.user
         user.set_password(serializer.validated_data["password"])
+        user.revoke_tokens()
         user.save()
         token.mark_consumed()
         return Response({"message": "Password updated successfully."})
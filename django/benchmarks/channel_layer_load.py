@@ -0,0 +1,169 @@
+"""Connects and broadcasts per second through the production channel layer.
+
+Worker processes stand in for ASGI servers: each joins ``--consumers``
+channels to their user and broadcast-shard groups the way
+``NotificationConsumer.connect`` does, then waits for every broadcast. The
+publisher sends broadcasts the way ``NotificationManager.broadcast`` does.
+Without ``--url`` the run starts local pub/sub stand-ins (see
+``resp_broker.py``) instead of Redis.
+
+    python benchmarks/channel_layer_load.py --workers 4 --consumers 2500 --shards 1 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def _setup_django(urls: list[str], shards: int) -> None:
+    os.environ["DJANGO_CHANNEL_LAYER_URLS"] = ",".join(urls)
+    os.environ["NOTIFICATIONS_BROADCAST_SHARDS"] = str(shards)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
+    import django
+
+    django.setup()
+
+
+async def _consume(args, worker: int, ready, results) -> None:
+    from channels.layers import get_channel_layer
+    from notifications.groups import broadcast_group_for, user_group
+
+    layer = get_channel_layer()
+    started = time.perf_counter()
+    channels = []
+    for index in range(args.consumers):
+        channel = await layer.new_channel()
+        await layer.group_add(user_group(worker * args.consumers + index), channel)
+        await layer.group_add(broadcast_group_for(channel), channel)
+        channels.append(channel)
+    connect_seconds = time.perf_counter() - started
+    ready.put(connect_seconds)
+
+    async def drain(channel: str) -> None:
+        for _ in range(args.broadcasts):
+            await layer.receive(channel)
+
+    await asyncio.gather(*(drain(channel) for channel in channels))
+    results.put(time.perf_counter())
+    await layer.flush()
+
+
+def _worker(args, urls, shards, worker, ready, results) -> None:
+    _setup_django(urls, shards)
+    asyncio.run(_consume(args, worker, ready, results))
+
+
+async def _publish(args) -> None:
+    from channels.layers import get_channel_layer
+    from notifications.dispatcher import send_batch
+    from notifications.encoding import encode_frame
+    from notifications.groups import broadcast_groups
+
+    layer = get_channel_layer()
+    groups = broadcast_groups()
+    for index in range(args.broadcasts):
+        event = {"type": "user.notification", "text": encode_frame({"n": index})}
+        await send_batch(layer, [(group, event) for group in groups])
+    await layer.flush()
+
+
+def _run(args, urls: list[str], shards: int) -> dict:
+    context = multiprocessing.get_context("spawn")
+    ready, results = context.Queue(), context.Queue()
+    workers = [
+        context.Process(
+            target=_worker, args=(args, urls, shards, worker, ready, results)
+        )
+        for worker in range(args.workers)
+    ]
+    for process in workers:
+        process.start()
+    connect_seconds = [ready.get() for _ in workers]
+    # Subscriptions are asynchronous on the broker side; give them a moment.
+    time.sleep(0.5)
+
+    from django.conf import settings
+
+    settings.NOTIFICATIONS_BROADCAST_SHARDS = shards
+    started = time.perf_counter()
+    asyncio.run(_publish(args))
+    finished = max(results.get() for _ in workers)
+    for process in workers:
+        process.join()
+
+    connections = args.workers * args.consumers
+    elapsed = finished - started
+    return {
+        "shards": shards,
+        "brokers": len(urls),
+        "connections": connections,
+        "connects_per_second": round(connections / max(connect_seconds), 1),
+        "broadcasts_per_second": round(args.broadcasts / elapsed, 1),
+        "deliveries_per_second": round(args.broadcasts * connections / elapsed, 1),
+    }
+
+
+def _serve_broker(port: int) -> None:
+    from resp_broker import PubSubBroker
+
+    async def serve() -> None:
+        await PubSubBroker(port=port).start()
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+def _start_local_brokers(count: int) -> list[str]:
+    """Run each stand-in in its own process, as separate Redis servers would."""
+    context = multiprocessing.get_context("spawn")
+    urls = []
+    for _ in range(count):
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        context.Process(target=_serve_broker, args=(port,), daemon=True).start()
+        urls.append(f"redis://127.0.0.1:{port}/0")
+    for url in urls:
+        port = int(url.rsplit(":", 1)[1].split("/")[0])
+        for _ in range(100):
+            try:
+                socket.create_connection(("127.0.0.1", port)).close()
+                break
+            except ConnectionRefusedError:
+                time.sleep(0.05)
+    return urls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--url", action="append", default=[], help="Redis URL (repeatable)"
+    )
+    parser.add_argument(
+        "--brokers", type=int, default=4, help="local stand-ins without --url"
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--consumers", type=int, default=1000, help="per worker")
+    parser.add_argument("--broadcasts", type=int, default=50)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 8])
+    args = parser.parse_args()
+    urls = args.url or _start_local_brokers(args.brokers)
+    _setup_django(urls, args.shards[0])
+    for shards in args.shards:
+        print(json.dumps(_run(args, urls, shards)))
+
+
+if __name__ == "__main__":
+    main()
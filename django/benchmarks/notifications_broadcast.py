@@ -0,0 +1,88 @@
+"""CPU spent by NotificationConsumer handling one broadcast across N clients.
+
+Compares the previous handler, which ran ``json.dumps`` in every consumer,
+with forwarding the pre-encoded text frame published by ``NotificationManager``.
+
+    python benchmarks/notifications_broadcast.py --consumers 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from notifications.consumers import NotificationConsumer  # noqa: E402
+from notifications.encoding import ENCODER_NAME, encode_frame  # noqa: E402
+
+PAYLOAD = {
+    "event": "team_invitation",
+    "team": {"id": 42, "name": "Platform"},
+    "role": "member",
+    "invited_by": {"id": 7, "email": "owner@example.com", "first_name": "Ada"},
+}
+
+
+class SilentConsumer(NotificationConsumer):
+    async def send(self, text_data=None, bytes_data=None, close=False):  # noqa: ARG002
+        return None
+
+
+class PerConsumerEncoding(SilentConsumer):
+    async def user_notification(self, event):
+        await self.send(text_data=json.dumps(event.get("payload", {})))
+
+
+async def _cpu_ms(consumer_class, count: int, event_factory, rounds: int) -> float:
+    consumers = [consumer_class() for _ in range(count)]
+    started = time.process_time()
+    for _ in range(rounds):
+        # The manager builds the event once per broadcast; consumers share it.
+        event = event_factory()
+        for consumer in consumers:
+            await consumer.user_notification(event)
+    return (time.process_time() - started) * 1000 / rounds
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    before = await _cpu_ms(
+        PerConsumerEncoding,
+        args.consumers,
+        lambda: {"type": "user.notification", "payload": PAYLOAD},
+        args.rounds,
+    )
+    after = await _cpu_ms(
+        SilentConsumer,
+        args.consumers,
+        lambda: {"type": "user.notification", "text": encode_frame(PAYLOAD)},
+        args.rounds,
+    )
+    return {
+        "consumers": args.consumers,
+        "encoder": ENCODER_NAME,
+        "per_consumer_encoding_cpu_ms": round(before, 3),
+        "pre_encoded_cpu_ms": round(after, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--consumers", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_run(args))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Local stand-in for the Redis pub/sub subset used by the channel layer.
+
+``channels_redis.pubsub.RedisPubSubChannelLayer`` only needs PUBLISH,
+SUBSCRIBE and UNSUBSCRIBE, which this broker implements over the Redis wire
+protocol so load tests can run several ASGI-like processes without a Redis
+server. It keeps nothing on disk and is not meant for production.
+
+    python benchmarks/resp_broker.py --port 6390
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import defaultdict
+
+
+def _bulk(value: bytes) -> bytes:
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def _array(*items: bytes, kind: bytes = b"*") -> bytes:
+    return kind + b"%d\r\n" % len(items) + b"".join(items)
+
+
+def _push(protocol: int, *items: bytes) -> bytes:
+    # RESP3 clients expect pub/sub traffic as out-of-band push frames.
+    return _array(*items, kind=b">" if protocol == 3 else b"*")
+
+
+def _integer(value: int) -> bytes:
+    return b":%d\r\n" % value
+
+
+class PubSubBroker:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.host = host
+        self.port = port
+        self._server: asyncio.AbstractServer | None = None
+        self._subscribers: defaultdict[bytes, set[asyncio.StreamWriter]] = defaultdict(
+            set
+        )
+        self._protocols: dict[asyncio.StreamWriter, int] = {}
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}/0"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        channels: set[bytes] = set()
+        self._protocols[writer] = 2
+        try:
+            while command := await self._read_command(reader):
+                writer.write(self._execute(command, writer, channels))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for channel in channels:
+                self._subscribers[channel].discard(writer)
+            self._protocols.pop(writer, None)
+            writer.close()
+
+    @staticmethod
+    async def _read_command(reader: asyncio.StreamReader) -> list[bytes] | None:
+        header = await reader.readline()
+        if not header:
+            return None
+        if not header.startswith(b"*"):
+            return header.split()
+        parts = []
+        for _ in range(int(header[1:])):
+            length = int((await reader.readline())[1:])
+            parts.append((await reader.readexactly(length + 2))[:-2])
+        return parts
+
+    def _execute(
+        self,
+        command: list[bytes],
+        writer: asyncio.StreamWriter,
+        channels: set[bytes],
+    ) -> bytes:
+        name, args = command[0].upper(), command[1:]
+        if name == b"PUBLISH":
+            channel, message = args
+            receivers = list(self._subscribers.get(channel, ()))
+            for receiver in receivers:
+                protocol = self._protocols.get(receiver, 2)
+                receiver.write(
+                    _push(protocol, _bulk(b"message"), _bulk(channel), _bulk(message))
+                )
+            return _integer(len(receivers))
+        if name in (b"SUBSCRIBE", b"UNSUBSCRIBE"):
+            reply = b""
+            for channel in args:
+                if name == b"SUBSCRIBE":
+                    channels.add(channel)
+                    self._subscribers[channel].add(writer)
+                else:
+                    channels.discard(channel)
+                    self._subscribers[channel].discard(writer)
+                reply += _push(
+                    self._protocols[writer],
+                    _bulk(name.lower()),
+                    _bulk(channel),
+                    _integer(len(channels)),
+                )
+            return reply
+        if name == b"HELLO":
+            protocol = int(args[0]) if args else 2
+            self._protocols[writer] = protocol
+            pairs = (
+                (b"server", _bulk(b"redis")),
+                (b"version", _bulk(b"7.2.0")),
+                (b"proto", _integer(protocol)),
+            )
+            body = b"".join(_bulk(key) + value for key, value in pairs)
+            if protocol == 3:
+                return b"%%%d\r\n" % len(pairs) + body
+            return b"*%d\r\n" % (2 * len(pairs)) + body
+        if name == b"PING":
+            return b"+PONG\r\n"
+        if name in (b"CLIENT", b"SELECT", b"AUTH"):
+            return b"+OK\r\n"
+        return b"-ERR unsupported command '%s'\r\n" % name
+
+
+async def _serve(host: str, port: int) -> None:
+    broker = PubSubBroker(host, port)
+    await broker.start()
+    print(f"Pub/sub broker listening on {broker.url}")
+    await asyncio.Event().wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+    asyncio.run(_serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Seed the configured database with load-test volumes of users and teams.
+
+Users are verified, share one password and are named
+``loadtest-<n>@example.com`` so ``load_test.py`` can log in as any of them.
+Team ``n`` is owned by user ``n`` and gets ``--members-per-team`` other
+members drawn at random, so the first users all own a team. Rows go in
+through batched ``bulk_create`` calls; the password is hashed once. Uses
+``DJANGO_DATABASE_URL`` like the server, so run migrations first.
+
+    python benchmarks/seed.py --users 1000000 --teams 100000 --members-per-team 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.db import models, transaction  # noqa: E402
+
+from accounts.models import User  # noqa: E402
+from benchmarks.load_test import EMAIL_TEMPLATE, PASSWORD  # noqa: E402
+from teams.models import Team, TeamMembership  # noqa: E402
+
+
+def _bulk_create(
+    model: type[models.Model], objects: Iterable[models.Model], batch_size: int
+) -> list[int]:
+    ids: list[int] = []
+    objects = iter(objects)
+    while batch := list(islice(objects, batch_size)):
+        ids.extend(obj.pk for obj in model.objects.bulk_create(batch))
+    return ids
+
+
+def seed(
+    users: int, teams: int, members_per_team: int, batch_size: int, seed: int
+) -> dict:
+    if teams > users:
+        raise SystemExit("--teams cannot exceed --users: team n is owned by user n")
+    existing = User.objects.filter(email__startswith="loadtest-").count()
+    if existing:
+        raise SystemExit(
+            f"{existing} load-test users already exist; seed an empty database"
+        )
+    rng = random.Random(seed)
+    password = make_password(PASSWORD)
+
+    def memberships(
+        user_ids: list[int], team_ids: list[int]
+    ) -> Iterator[TeamMembership]:
+        for index, team_id in enumerate(team_ids):
+            owner_id = user_ids[index]
+            yield TeamMembership(
+                team_id=team_id, user_id=owner_id, role=TeamMembership.ROLE_OWNER
+            )
+            members: set[int] = set()
+            while len(members) < min(members_per_team, users - 1):
+                candidate = user_ids[rng.randrange(users)]
+                if candidate != owner_id:
+                    members.add(candidate)
+            for user_id in members:
+                yield TeamMembership(
+                    team_id=team_id, user_id=user_id, invited_by_id=owner_id
+                )
+
+    started = time.perf_counter()
+    with transaction.atomic():
+        user_ids = _bulk_create(
+            User,
+            (
+                User(
+                    email=EMAIL_TEMPLATE.format(n),
+                    password=password,
+                    first_name="Load",
+                    last_name=f"Test {n}",
+                    is_email_verified=True,
+                )
+                for n in range(1, users + 1)
+            ),
+            batch_size,
+        )
+        team_ids = _bulk_create(
+            Team,
+            (
+                Team(name=f"loadtest-team-{n}", owner_id=user_ids[n - 1])
+                for n in range(1, teams + 1)
+            ),
+            batch_size,
+        )
+        membership_count = len(
+            _bulk_create(TeamMembership, memberships(user_ids, team_ids), batch_size)
+        )
+
+    return {
+        "users": len(user_ids),
+        "teams": len(team_ids),
+        "memberships": membership_count,
+        "seconds": round(time.perf_counter() - started, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--teams", type=int, default=100_000)
+    parser.add_argument("--members-per-team", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument(
+        "--seed", type=int, default=0, help="random seed for membership sampling"
+    )
+    args = parser.parse_args()
+
+    summary = seed(
+        args.users, args.teams, args.members_per_team, args.batch_size, args.seed
+    )
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
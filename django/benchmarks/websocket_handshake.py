@@ -0,0 +1,124 @@
+"""Websocket handshakes per second during a reconnect storm.
+
+Compares the previous stack (``AuthMiddlewareStack`` plus a consumer that
+validates the JWT itself) with ``JWTAuthMiddleware``. Clients send a Django
+session cookie, as browsers logged into the admin do, so the previous stack
+pays for its session and user lookups. Runs against a throwaway SQLite
+database.
+
+    python benchmarks/websocket_handshake.py --clients 10000 --concurrency 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
+os.environ["DJANGO_DATABASE_URL"] = (
+    f"sqlite:///{Path(tempfile.mkdtemp()) / 'handshake.sqlite3'}"
+)
+
+import django  # noqa: E402
+
+django.setup()
+
+from channels.auth import AuthMiddlewareStack  # noqa: E402
+from channels.routing import URLRouter  # noqa: E402
+from channels.testing import WebsocketCommunicator  # noqa: E402
+from django.contrib.auth import (  # noqa: E402
+    BACKEND_SESSION_KEY,
+    HASH_SESSION_KEY,
+    SESSION_KEY,
+)
+from django.contrib.sessions.backends.db import SessionStore  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.urls import re_path  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from accounts.models import User  # noqa: E402
+from notifications.consumers import NotificationConsumer  # noqa: E402
+from notifications.middleware import JWTAuthMiddleware, user_id_from_scope  # noqa: E402
+from notifications.routing import websocket_urlpatterns  # noqa: E402
+
+
+class TokenCheckingConsumer(NotificationConsumer):
+    """The previous consumer, which decoded the access token itself."""
+
+    async def connect(self) -> None:
+        self.scope["user_id"] = user_id_from_scope(self.scope)
+        await super().connect()
+
+
+def _stacks():
+    before = AuthMiddlewareStack(
+        URLRouter([re_path(r"^ws/notifications/?$", TokenCheckingConsumer.as_asgi())])
+    )
+    after = JWTAuthMiddleware(URLRouter(websocket_urlpatterns))
+    return {"auth_middleware_stack": before, "jwt_middleware": after}
+
+
+def _credentials() -> tuple[str, list[tuple[bytes, bytes]]]:
+    call_command("migrate", verbosity=0)
+    user = User.objects.create_user(email="storm@example.com", password="password123")
+    session = SessionStore()
+    session[SESSION_KEY] = str(user.pk)
+    session[BACKEND_SESSION_KEY] = "django.contrib.auth.backends.ModelBackend"
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.create()
+    access = AccessToken.for_user(user)
+    cookie = f"sessionid={session.session_key}".encode()
+    return f"/ws/notifications/?token={access}", [(b"cookie", cookie)]
+
+
+async def _storm(application, path, headers, clients: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    failures = 0
+
+    async def handshake() -> None:
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            communicator = WebsocketCommunicator(application, path, headers=headers)
+            connected, _ = await communicator.connect(timeout=30)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if not connected:
+                failures += 1
+            await communicator.disconnect()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(handshake() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "handshakes_per_second": round(clients / elapsed, 1),
+        "p50_ms": round(quantiles[49], 2),
+        "p99_ms": round(quantiles[98], 2),
+        "failures": failures,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    args = parser.parse_args()
+    path, headers = _credentials()
+    for name, application in _stacks().items():
+        result = asyncio.run(
+            _storm(application, path, headers, args.clients, args.concurrency)
+        )
+        print(json.dumps({"stack": name, "clients": args.clients, **result}))
+
+
+if __name__ == "__main__":
+    main()
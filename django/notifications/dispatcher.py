@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import threading
+from concurrent.futures import Future, wait
+from typing import Any, Callable
+
+from asgiref.sync import async_to_sync
+from channels.layers import InMemoryChannelLayer
+
+logger = logging.getLogger(__name__)
+
+# (group name, channel-layer event)
+Message = tuple[str, dict[str, Any]]
+
+
+async def send_batch(channel_layer, batch: list[Message]) -> None:
+    """Send every message in ``batch`` concurrently; failures are logged."""
+    results = await asyncio.gather(
+        *(channel_layer.group_send(group, event) for group, event in batch),
+        return_exceptions=True,
+    )
+    for (group, _), result in zip(batch, results):
+        if isinstance(result, Exception):
+            logger.error("Failed to send notification to %s", group, exc_info=result)
+
+
+class NotificationDispatcher:
+    """Sends notification batches from a background thread with its own loop.
+
+    Views hand over a batch and return immediately instead of bridging into
+    the channel layer with ``async_to_sync``. The thread starts on first use
+    and pending batches are drained at interpreter exit.
+
+    The in-memory channel layer is not thread-safe: its queues belong to the
+    server's event loop. Batches for it are sent there with ``async_to_sync``
+    instead, which blocks the caller until they are delivered.
+    """
+
+    def __init__(self, get_layer: Callable[[], Any]) -> None:
+        self._get_layer = get_layer
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+        self._pending: set[Future] = set()
+
+    def submit(self, batch: list[Message]) -> None:
+        if not batch:
+            return
+        layer = self._get_layer()
+        if isinstance(layer, InMemoryChannelLayer):
+            async_to_sync(send_batch)(layer, batch)
+            return
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(send_batch(layer, batch), loop)
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Wait for in-flight batches, then stop the loop thread."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        wait(list(self._pending), timeout=timeout)
+        loop.call_soon_threadsafe(loop.stop)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever,
+                    name="notification-dispatcher",
+                    daemon=True,
+                ).start()
+                self._loop = loop
+                atexit.register(self.close)
+            return self._loop
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import zlib
+
+from django.conf import settings
+
+BROADCAST_GROUP_PREFIX = "broadcast"
+
+
+def broadcast_shards() -> int:
+    return max(int(getattr(settings, "NOTIFICATIONS_BROADCAST_SHARDS", 1)), 1)
+
+
+def user_group(user_id: int) -> str:
+    return f"user_{user_id}"
+
+
+def broadcast_group_for(channel_name: str) -> str:
+    """Return the broadcast shard a consumer joins, stable for its channel name."""
+    shard = zlib.crc32(channel_name.encode("utf-8")) % broadcast_shards()
+    return f"{BROADCAST_GROUP_PREFIX}_{shard}"
+
+
+def broadcast_groups() -> list[str]:
+    return [f"{BROADCAST_GROUP_PREFIX}_{shard}" for shard in range(broadcast_shards())]
@@ -1,46 +1,78 @@
 from __future__ import annotations
 
-from typing import Any, Mapping
+from contextlib import contextmanager
+from typing import Any, Iterator, Mapping
 
-from asgiref.sync import async_to_sync
+from asgiref.local import Local
 from channels.layers import get_channel_layer
+from django.db import transaction
+
+from .dispatcher import Message, NotificationDispatcher
+from .encoding import encode_frame
+from .groups import broadcast_groups, user_group
 
 
 class NotificationManager:
-    """Dispatches websocket notifications to connected clients."""
+    """Dispatches websocket notifications to connected clients.
 
-    _broadcast_group = "broadcast"
+    Payloads are encoded once here; consumers forward the pre-encoded text
+    frame as-is, so a broadcast costs one serialization however many
+    clients receive it. Broadcasts go to every shard of the broadcast group
+    concurrently, so no single group_send has to reach every client.
 
-    def __init__(self) -> None:
-        self._layer = None
+    Notifications are queued with ``transaction.on_commit``, so nothing is
+    sent for work that rolls back. Inside ``buffer()`` (opened per request by
+    ``NotificationBufferMiddleware``) committed notifications are collected
+    and handed to the background dispatcher as one batch when the block
+    exits; elsewhere each one is dispatched as soon as it commits.
+    """
 
-    def _group_name(self, user_id: int) -> str:
-        return f"user_{user_id}"
+    def __init__(self, dispatcher: NotificationDispatcher | None = None) -> None:
+        self._layer = None
+        self._dispatcher = dispatcher or NotificationDispatcher(self._get_layer)
+        self._local = Local()
 
     def _get_layer(self):
         if self._layer is None:
             self._layer = get_channel_layer()
         return self._layer
 
-    def send_user_notification(self, *, user_id: int, payload: Mapping[str, Any]) -> None:
+    def send_user_notification(
+        self, *, user_id: int, payload: Mapping[str, Any]
+    ) -> None:
         """Send a notification to a single user if a channel layer is configured."""
-        channel_layer = self._get_layer()
-        if channel_layer is None:
-            return
-        async_to_sync(channel_layer.group_send)(
-            self._group_name(user_id=user_id),
-            {"type": "user.notification", "payload": dict(payload)},
-        )
+        event = {"type": "user.notification", "text": encode_frame(dict(payload))}
+        self._enqueue([(user_group(user_id), event)])
 
     def broadcast(self, payload: Mapping[str, Any]) -> None:
         """Send a notification to all connected clients."""
-        channel_layer = self._get_layer()
-        if channel_layer is None:
+        event = {"type": "user.notification", "text": encode_frame(dict(payload))}
+        self._enqueue([(group, event) for group in broadcast_groups()])
+
+    @contextmanager
+    def buffer(self) -> Iterator[None]:
+        """Collect notifications committed inside the block into one batch."""
+        if getattr(self._local, "pending", None) is not None:
+            yield
+            return
+        self._local.pending = []
+        try:
+            yield
+        finally:
+            batch, self._local.pending = self._local.pending, None
+            self._dispatcher.submit(batch)
+
+    def _enqueue(self, messages: list[Message]) -> None:
+        if self._get_layer() is None:
             return
-        async_to_sync(channel_layer.group_send)(
-            self._broadcast_group,
-            {"type": "user.notification", "payload": dict(payload)},
-        )
+        transaction.on_commit(lambda: self._collect(messages))
+
+    def _collect(self, messages: list[Message]) -> None:
+        pending = getattr(self._local, "pending", None)
+        if pending is None:
+            self._dispatcher.submit(messages)
+        else:
+            pending.extend(messages)
 
 
 notifier = NotificationManager()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from urllib.parse import parse_qs
+
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .manager import notifier
+
+
+def _parse_token(scope) -> str | None:
+    query_string = scope.get("query_string", b"")
+    if query_string:
+        tokens = parse_qs(query_string.decode("utf-8")).get("token")
+        if tokens:
+            return tokens[0]
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, credentials = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and credentials:
+                return credentials
+    return None
+
+
+def user_id_from_scope(scope) -> int | None:
+    token = _parse_token(scope)
+    if not token:
+        return None
+    try:
+        access = AccessToken(token)
+    except (TokenError, InvalidToken):
+        return None
+    user_id = access.get(api_settings.USER_ID_CLAIM)
+    return int(user_id) if user_id is not None else None
+
+
+class JWTAuthMiddleware:
+    """Resolves ``scope["user_id"]`` from a JWT access token.
+
+    The token comes from the ``token`` query parameter or a bearer
+    ``Authorization`` header. Unlike ``AuthMiddlewareStack`` it never reads
+    cookies, sessions or the user table, so a handshake costs one signature
+    check. ``user_id`` is ``None`` when the token is missing or invalid.
+    """
+
+    def __init__(self, inner) -> None:
+        self.inner = inner
+
+    async def __call__(self, scope, receive, send):
+        scope = dict(scope, user_id=user_id_from_scope(scope))
+        return await self.inner(scope, receive, send)
+
+
+class NotificationBufferMiddleware:
+    """Sends the notifications a request commits as one background batch."""
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with notifier.buffer():
+            return self.get_response(request)
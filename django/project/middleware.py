@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import logging
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http.request import HttpRequest
+
+from . import routers
+from .query_budget import QueryBudget, QueryBudgetExceeded
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReplicaPinningMiddleware:
+    """Scopes replica routing state to the request and records its writes.
+
+    Only safe methods may read from replicas, so validation done by writing
+    requests always sees the primary's rows.
+    """
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest):
+        routers.reset(pinned=request.method not in SAFE_METHODS)
+        response = self.get_response(request)
+        routers.remember_writes()
+        return response
+
+
+class QueryBudgetMiddleware:
+    """Flags requests that exceed ``QUERY_BUDGET`` queries or repeat a statement.
+
+    Violations are logged with the offending call sites, and raised under
+    ``DEBUG`` so they fail loudly in development. Removed from the stack
+    when ``QUERY_BUDGET`` is 0.
+    """
+
+    def __init__(self, get_response) -> None:
+        if not settings.QUERY_BUDGET:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest):
+        try:
+            with QueryBudget(settings.QUERY_BUDGET) as budget:
+                response = self.get_response(request)
+        except QueryBudgetExceeded:
+            if settings.DEBUG:
+                raise
+            logger.warning(
+                "Query budget exceeded by %s %s: %s\n%s",
+                request.method,
+                request.path,
+                "; ".join(budget.problems()),
+                budget.report(),
+            )
+        return response
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import functools
+import sys
+from collections import defaultdict
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable
+
+from django.conf import settings
+from django.db import connections
+
+_THIS_FILE = str(Path(__file__).resolve())
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block runs more queries, or more repeats, than budgeted."""
+
+
+@dataclass(slots=True)
+class RecordedQuery:
+    alias: str
+    sql: str
+    call_site: str
+
+
+def _call_site(depth: int = 3) -> str:
+    root = str(settings.BASE_DIR)
+    sites: list[str] = []
+    frame = sys._getframe(1)
+    while frame is not None and len(sites) < depth:
+        filename = frame.f_code.co_filename
+        if (
+            filename != _THIS_FILE
+            and filename.startswith(root)
+            and "site-packages" not in filename
+        ):
+            relative = Path(filename).relative_to(root)
+            sites.append(f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}")
+        frame = frame.f_back
+    return " <- ".join(sites) or "<unknown>"
+
+
+class QueryBudget:
+    """Asserts a block stays within a query budget and flags N+1 patterns.
+
+    Works as a context manager or decorator. On exit the block fails with
+    ``QueryBudgetExceeded`` if it ran more than ``max_queries`` statements
+    on the watched aliases (all configured databases by default), or the
+    same parameterized SQL more than ``max_repeats`` times; the report lists
+    each statement with the project call sites that issued it.
+    """
+
+    def __init__(
+        self,
+        max_queries: int | None = None,
+        *,
+        max_repeats: int | None = 2,
+        using: Iterable[str] | None = None,
+    ) -> None:
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.using = list(using) if using is not None else None
+        self.queries: list[RecordedQuery] = []
+        self._stack: ExitStack | None = None
+
+    def _wrapper(self, alias: str) -> Callable:
+        def record(execute, sql, params, many, context):
+            self.queries.append(RecordedQuery(alias, sql, _call_site()))
+            return execute(sql, params, many, context)
+
+        return record
+
+    def __enter__(self) -> "QueryBudget":
+        self.queries = []
+        self._stack = ExitStack()
+        for alias in self.using if self.using is not None else list(connections):
+            self._stack.enter_context(
+                connections[alias].execute_wrapper(self._wrapper(alias))
+            )
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self._stack.close()
+        self._stack = None
+        if exc_type is None:
+            self.check()
+
+    def __call__(self, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            budget = QueryBudget(
+                self.max_queries, max_repeats=self.max_repeats, using=self.using
+            )
+            with budget:
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    def repeated(self) -> dict[str, list[RecordedQuery]]:
+        """Statements executed more than ``max_repeats`` times, keyed by SQL."""
+        if self.max_repeats is None:
+            return {}
+        by_sql: dict[str, list[RecordedQuery]] = defaultdict(list)
+        for query in self.queries:
+            by_sql[query.sql].append(query)
+        return {
+            sql: runs for sql, runs in by_sql.items() if len(runs) > self.max_repeats
+        }
+
+    def problems(self) -> list[str]:
+        problems: list[str] = []
+        if self.max_queries is not None and self.count > self.max_queries:
+            problems.append(
+                f"{self.count} queries executed, budget is {self.max_queries}"
+            )
+        repeated = self.repeated()
+        if repeated:
+            problems.append(
+                f"{len(repeated)} statement(s) repeated more than "
+                f"{self.max_repeats} times (likely N+1)"
+            )
+        return problems
+
+    def check(self) -> None:
+        problems = self.problems()
+        if problems:
+            raise QueryBudgetExceeded("; ".join(problems) + "\n" + self.report())
+
+    def report(self) -> str:
+        repeated = self.repeated()
+        lines = []
+        for index, query in enumerate(self.queries, start=1):
+            marker = " [repeated]" if query.sql in repeated else ""
+            lines.append(
+                f"  {index}. [{query.alias}] {query.sql}{marker}\n"
+                f"     at {query.call_site}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import random
+
+from asgiref.local import Local
+from django.conf import settings
+from django.core.cache import cache
+
+# Per-request routing state, reset by ReplicaPinningMiddleware.
+_state = Local()
+
+
+def _pin_key(user_id: int) -> str:
+    return f"db:pinned:{user_id}"
+
+
+def reset(*, pinned: bool = False) -> None:
+    _state.pinned = pinned
+    _state.wrote = False
+    _state.user_id = None
+
+
+def bind_user(user_id: int) -> None:
+    """Record who the request is for; users who wrote recently stay on the primary."""
+    _state.user_id = user_id
+    if (
+        settings.DATABASE_REPLICAS
+        and not getattr(_state, "pinned", False)
+        and cache.get(_pin_key(user_id))
+    ):
+        _state.pinned = True
+
+
+def remember_writes() -> None:
+    """Keep the request's user on the primary for a while if it wrote anything."""
+    user_id = getattr(_state, "user_id", None)
+    if settings.DATABASE_REPLICAS and getattr(_state, "wrote", False) and user_id:
+        cache.set(_pin_key(user_id), True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+class ReplicaRouter:
+    """Sends reads for the account and team apps to a random replica.
+
+    Writes always go to ``default``. Requests with unsafe methods read from
+    ``default`` throughout, as does any request after its first write, and
+    ``remember_writes`` extends that to the user's requests for
+    ``DATABASE_REPLICA_PIN_SECONDS``. Without replicas configured everything
+    stays on ``default``.
+    """
+
+    route_app_labels = {"accounts", "teams"}
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if (
+            not replicas
+            or model._meta.app_label not in self.route_app_labels
+            or getattr(_state, "pinned", False)
+        ):
+            return None
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label not in self.route_app_labels:
+            return None
+        _state.pinned = True
+        _state.wrote = True
+        # Explicit, or Django would write rows fetched from a replica back to it.
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {"default", *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -4,6 +4,7 @@ from datetime import timedelta
 from pathlib import Path
 
 import environ
+from django.core.exceptions import ImproperlyConfigured
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 ROOT_DIR = BASE_DIR.parent
@@ -12,6 +13,16 @@ env = environ.Env(
     DJANGO_DEBUG=(bool, True),
     AUTH_EMAIL_VERIFICATION_EXPIRATION_HOURS=(int, 48),
     AUTH_PASSWORD_RESET_EXPIRATION_MINUTES=(int, 30),
+    AUTH_USER_CACHE_TTL_SECONDS=(int, 30),
+    NOTIFICATIONS_BROADCAST_SHARDS=(int, 1),
+    DJANGO_DB_CONN_MAX_AGE=(int, 0),
+    DJANGO_DB_HEALTH_CHECKS=(bool, True),
+    DJANGO_DB_POOL=(bool, False),
+    DJANGO_DB_POOL_MIN_SIZE=(int, 2),
+    DJANGO_DB_POOL_MAX_SIZE=(int, 10),
+    DJANGO_DB_POOL_TIMEOUT=(int, 30),
+    DJANGO_DB_REPLICA_PIN_SECONDS=(int, 5),
+    DJANGO_QUERY_BUDGET=(int, 0),
 )
 
 BACKEND_DIR = ROOT_DIR / "backend"
@@ -47,12 +58,15 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "project.middleware.ReplicaPinningMiddleware",
+    "project.middleware.QueryBudgetMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "notifications.middleware.NotificationBufferMiddleware",
 ]
 
 ROOT_URLCONF = "project.urls"
@@ -76,21 +90,104 @@ TEMPLATES = [
 WSGI_APPLICATION = "project.wsgi.application"
 ASGI_APPLICATION = "project.asgi.application"
 
-CHANNEL_LAYERS = {
-    "default": {
-        "BACKEND": "channels.layers.InMemoryChannelLayer",
+# The in-memory layer only reaches consumers in the same process; set
+# DJANGO_CHANNEL_LAYER_URLS (comma-separated Redis URLs) when running several
+# ASGI workers. Groups are spread across the listed servers by name.
+CHANNEL_LAYER_URLS = env.list("DJANGO_CHANNEL_LAYER_URLS", default=[])
+if CHANNEL_LAYER_URLS:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.pubsub.RedisPubSubChannelLayer",
+            "CONFIG": {
+                "hosts": CHANNEL_LAYER_URLS,
+                "prefix": env("DJANGO_CHANNEL_LAYER_PREFIX", default="notifications"),
+            },
+        }
     }
-}
+else:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels.layers.InMemoryChannelLayer",
+        }
+    }
+
+# Consumers spread across this many broadcast groups; a broadcast is published
+# to each shard concurrently, so with several Redis servers the broadcast
+# traffic is spread across them instead of pinned to the one owning a group.
+# Every extra shard is another publish per broadcast, so keep the default of 1
+# unless measurements show the broker is the bottleneck.
+NOTIFICATIONS_BROADCAST_SHARDS = env("NOTIFICATIONS_BROADCAST_SHARDS")
+
+
+def _database(config: dict) -> dict:
+    """Apply connection reuse settings to a parsed database config.
+
+    PostgreSQL can use psycopg's connection pool (DJANGO_DB_POOL); Django
+    requires CONN_MAX_AGE=0 then, since the pool owns connection lifetime.
+    Otherwise connections persist for DJANGO_DB_CONN_MAX_AGE seconds, and
+    health checks ping a reused connection once at the start of a request
+    instead of failing the request on a dropped one. That defaults to 0:
+    under ASGI (daphne) a request may run on a fresh thread, and each
+    thread would keep its own persistent connection open, so reuse there
+    should come from the pool.
+    """
+    health_checks = env("DJANGO_DB_HEALTH_CHECKS")
+    if env("DJANGO_DB_POOL") and config["ENGINE"] == "django.db.backends.postgresql":
+        from psycopg_pool import ConnectionPool
+
+        pool = {
+            "min_size": env("DJANGO_DB_POOL_MIN_SIZE"),
+            "max_size": env("DJANGO_DB_POOL_MAX_SIZE"),
+            "timeout": env("DJANGO_DB_POOL_TIMEOUT"),
+        }
+        if health_checks:
+            pool["check"] = ConnectionPool.check_connection
+        config["OPTIONS"] = {**config.get("OPTIONS", {}), "pool": pool}
+        config["CONN_MAX_AGE"] = 0
+    else:
+        config["CONN_MAX_AGE"] = env("DJANGO_DB_CONN_MAX_AGE")
+        config["CONN_HEALTH_CHECKS"] = health_checks
+    return config
+
 
 DATABASES = {
-    "default": env.db(
-        "DJANGO_DATABASE_URL",
-        default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}",
+    "default": _database(
+        env.db(
+            "DJANGO_DATABASE_URL",
+            default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}",
+        )
     )
 }
 
+# Reads for accounts and teams are spread across these; see project.routers.
+DATABASE_REPLICAS = []
+for index, url in enumerate(env.list("DJANGO_DATABASE_REPLICA_URLS", default=[])):
+    alias = f"replica_{index}"
+    DATABASES[alias] = _database(env.db_url_config(url))
+    DATABASES[alias]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["project.routers.ReplicaRouter"]
+DATABASE_REPLICA_PIN_SECONDS = env("DJANGO_DB_REPLICA_PIN_SECONDS")
+
+# Per-request query ceiling checked by project.middleware.QueryBudgetMiddleware
+# (0 disables it); repeated statements are flagged as likely N+1 queries.
+QUERY_BUDGET = env("DJANGO_QUERY_BUDGET")
+
 AUTH_USER_MODEL = "accounts.User"
 
+CACHES = {"default": env.cache("DJANGO_CACHE_URL", default="locmemcache://")}
+# Token revocations (password resets, deactivation) are published through the
+# cache; with a per-process cache other workers would keep accepting revoked
+# access tokens until AUTH_USER_CACHE_TTL_SECONDS expires.
+if (
+    not DEBUG
+    and CACHES["default"]["BACKEND"] == "django.core.cache.backends.locmem.LocMemCache"
+):
+    raise ImproperlyConfigured(
+        "DJANGO_CACHE_URL must point at a shared cache (e.g. Redis) when DJANGO_DEBUG is off."
+    )
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -110,7 +207,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.StatelessJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
 }
@@ -125,6 +222,8 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
+    "TOKEN_USER_CLASS": "accounts.authentication.ClaimsUser",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.UserTokenRefreshSerializer",
 }
 
 CORS_ALLOW_ALL_ORIGINS = False
@@ -146,3 +245,7 @@ AUTH_EMAIL_VERIFICATION_EXPIRATION_HOURS = env(
 AUTH_PASSWORD_RESET_EXPIRATION_MINUTES = env(
     "AUTH_PASSWORD_RESET_EXPIRATION_MINUTES"
 )
+
+# How long authenticated requests may trust a cached token version or user
+# row; saves through the ORM refresh the cache immediately.
+AUTH_USER_CACHE_TTL_SECONDS = env("AUTH_USER_CACHE_TTL_SECONDS")
@@ -0,0 +1,13 @@
+"""Pytest fixtures; add ``pytest_plugins = ["project.testing"]`` to a conftest."""
+
+from __future__ import annotations
+
+import pytest
+
+from .query_budget import QueryBudget
+
+
+@pytest.fixture()
+def query_budget() -> type[QueryBudget]:
+    """``QueryBudget``, for use as ``with query_budget(3): ...``."""
+    return QueryBudget
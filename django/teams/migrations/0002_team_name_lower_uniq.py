@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("teams", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="team",
+            constraint=models.UniqueConstraint(
+                Lower("name"),
+                name="teams_team_name_lower_uniq",
+                violation_error_message="A team with that name already exists.",
+            ),
+        ),
+    ]
@@ -2,10 +2,20 @@ from __future__ import annotations
 
 from django.conf import settings
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Lower
 
 User = settings.AUTH_USER_MODEL
 
 
+class TeamManager(models.Manager):
+    def by_name(self, name: str) -> models.QuerySet:
+        """Teams named ``name`` ignoring case, via the ``Lower(name)`` index."""
+        return self.alias(name_lower=Lower("name")).filter(
+            name_lower=Lower(Value(name))
+        )
+
+
 class Team(models.Model):
     name = models.CharField(max_length=127, unique=True)
     owner = models.ForeignKey(
@@ -16,8 +26,17 @@ class Team(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TeamManager()
+
     class Meta:
         ordering = ("id",)
+        constraints = [
+            models.UniqueConstraint(
+                Lower("name"),
+                name="teams_team_name_lower_uniq",
+                violation_error_message="A team with that name already exists.",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -31,6 +31,8 @@ class TeamCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Team
         fields = ("name",)
+        # The view checks names case-insensitively, against Lower(name).
+        extra_kwargs = {"name": {"validators": []}}
 
 
 class TeamInviteSerializer(serializers.Serializer):
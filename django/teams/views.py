@@ -28,7 +28,7 @@ class TeamListCreateView(APIView):
 
     def get(self, request):
         teams = (
-            Team.objects.filter(memberships__user=request.user)
+            Team.objects.filter(memberships__user_id=request.user.id)
             .select_related("owner")
             .prefetch_related(
                 Prefetch(
@@ -46,24 +46,29 @@ class TeamListCreateView(APIView):
         serializer = TeamCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        if Team.objects.filter(name__iexact=serializer.validated_data["name"]).exists():
-            return Response(
-                {"detail": "A team with that name already exists."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        name_taken = Response(
+            {"detail": "A team with that name already exists."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+        if Team.objects.by_name(serializer.validated_data["name"]).exists():
+            return name_taken
 
-        with transaction.atomic():
-            team = Team.objects.create(
-                name=serializer.validated_data["name"],
-                owner=request.user,
-            )
-            TeamMembership.objects.create(
-                team=team,
-                user=request.user,
-                role=TeamMembership.ROLE_OWNER,
-                status=TeamMembership.STATUS_ACTIVE,
-                invited_by=request.user,
-            )
+        try:
+            with transaction.atomic():
+                team = Team.objects.create(
+                    name=serializer.validated_data["name"],
+                    owner_id=request.user.id,
+                )
+                TeamMembership.objects.create(
+                    team=team,
+                    user_id=request.user.id,
+                    role=TeamMembership.ROLE_OWNER,
+                    status=TeamMembership.STATUS_ACTIVE,
+                    invited_by_id=request.user.id,
+                )
+        except IntegrityError:
+            # A concurrent request created the same name after the check.
+            return name_taken
 
         detail = TeamSerializer(team)
         return Response(detail.data, status=status.HTTP_201_CREATED)
@@ -75,16 +80,14 @@ class TeamInviteView(APIView):
     def post(self, request, team_id: int):
         team = get_object_or_404(Team.objects.select_related("owner"), pk=team_id)
         actor_membership = TeamMembership.objects.filter(
-            team=team, user=request.user
+            team=team, user_id=request.user.id
         ).first()
         _ensure_can_manage(actor_membership)
 
         serializer = TeamInviteSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        target_user = User.objects.filter(
-            email__iexact=serializer.validated_data["email"]
-        ).first()
+        target_user = User.objects.by_email(serializer.validated_data["email"]).first()
         if target_user is None:
             return Response(
                 {"detail": "Invited user not found."},
@@ -103,7 +106,7 @@ class TeamInviteView(APIView):
                 user=target_user,
                 role=serializer.validated_data["role"],
                 status=TeamMembership.STATUS_ACTIVE,
-                invited_by=request.user,
+                invited_by_id=request.user.id,
             )
         except IntegrityError:
             return Response(
@@ -133,7 +136,7 @@ class TeamMemberUpdateView(APIView):
     def patch(self, request, team_id: int, member_id: int):
         team = get_object_or_404(Team.objects.select_related("owner"), pk=team_id)
         actor_membership = TeamMembership.objects.filter(
-            team=team, user=request.user
+            team=team, user_id=request.user.id
         ).first()
         _ensure_can_manage(actor_membership)
 
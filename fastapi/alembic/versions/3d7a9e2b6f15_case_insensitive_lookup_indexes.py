@@ -0,0 +1,81 @@
+"""case-insensitive lookup indexes
+
+Revision ID: 3d7a9e2b6f15
+Revises: 8f6d2b5a1c94
+Create Date: 2026-10-18 05:05:00.000000
+
+Emails and team names are looked up, and checked for sign-up and creation
+conflicts, as lower(column) = lower(value). These unique expression indexes
+serve those comparisons and make uniqueness case-insensitive; the upgrade
+fails if existing rows differ only by case, which must be merged first.
+
+On PostgreSQL, ``alembic -x concurrently=true upgrade head`` builds and
+drops the indexes with CONCURRENTLY, outside a transaction.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3d7a9e2b6f15"
+down_revision: Union[str, None] = "8f6d2b5a1c94"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _concurrently() -> bool:
+    requested = context.get_x_argument(as_dictionary=True).get("concurrently", "")
+    return (
+        requested.strip().lower() in {"1", "true", "yes", "on"}
+        and op.get_context().dialect.name == "postgresql"
+    )
+
+
+def _run(steps) -> None:
+    concurrently = _concurrently()
+    if not concurrently:
+        steps(concurrently)
+        return
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        steps(concurrently)
+
+
+def _upgrade_indexes(concurrently: bool) -> None:
+    op.create_index(
+        "ix_users_email_lower",
+        "users",
+        [sa.text("lower(email)")],
+        unique=True,
+        postgresql_concurrently=concurrently,
+    )
+    op.create_index(
+        "ix_teams_name_lower",
+        "teams",
+        [sa.text("lower(name)")],
+        unique=True,
+        postgresql_concurrently=concurrently,
+    )
+
+
+def _downgrade_indexes(concurrently: bool) -> None:
+    op.drop_index(
+        "ix_teams_name_lower", table_name="teams", postgresql_concurrently=concurrently
+    )
+    op.drop_index(
+        "ix_users_email_lower", table_name="users", postgresql_concurrently=concurrently
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _run(_upgrade_indexes)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _run(_downgrade_indexes)
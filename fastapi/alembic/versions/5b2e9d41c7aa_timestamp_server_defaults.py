@@ -0,0 +1,35 @@
+"""timestamp server defaults
+
+Revision ID: 5b2e9d41c7aa
+Revises: cb03071aaae2
+Create Date: 2026-10-18 02:25:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b2e9d41c7aa"
+down_revision: Union[str, None] = "cb03071aaae2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The database now stamps created_at/updated_at; the ORM reads them back
+    # with RETURNING instead of refreshing rows after each write.
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.alter_column("created_at", server_default=sa.func.now())
+        batch_op.alter_column("updated_at", server_default=sa.func.now())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.alter_column("updated_at", server_default=None)
+        batch_op.alter_column("created_at", server_default=None)
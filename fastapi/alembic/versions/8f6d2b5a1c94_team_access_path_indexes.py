@@ -0,0 +1,107 @@
+"""team access path indexes
+
+Revision ID: 8f6d2b5a1c94
+Revises: e4a1c7f09b3d
+Create Date: 2026-10-18 04:20:00.000000
+
+Replaces the single-column team_memberships indexes with ones shaped like
+the hot queries:
+
+* "teams for a user" (list_teams) filters memberships by user_id and joins
+  on team_id; ix_team_memberships_user_id_team_id answers that from the
+  index alone, and teams are then read by primary key and sorted by
+  created_at within the user's (small) set of teams.
+* "membership by (team_id, user_id)" already has the uq_team_member unique
+  index, which also serves lookups by team_id alone, so
+  ix_team_memberships_team_id is redundant.
+
+On PostgreSQL, ``alembic -x concurrently=true upgrade head`` builds and
+drops the indexes with CONCURRENTLY, outside a transaction, so existing
+deployments keep serving writes to team_memberships meanwhile. If a
+concurrent build fails it leaves an INVALID index behind; drop it before
+retrying.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import context, op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8f6d2b5a1c94"
+down_revision: Union[str, None] = "e4a1c7f09b3d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _concurrently() -> bool:
+    requested = context.get_x_argument(as_dictionary=True).get("concurrently", "")
+    return (
+        requested.strip().lower() in {"1", "true", "yes", "on"}
+        and op.get_context().dialect.name == "postgresql"
+    )
+
+
+def _run(steps) -> None:
+    concurrently = _concurrently()
+    if not concurrently:
+        steps(concurrently)
+        return
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        steps(concurrently)
+
+
+def _upgrade_indexes(concurrently: bool) -> None:
+    # Build the new index before dropping the ones it replaces, so the
+    # lookups always have an index to use.
+    op.create_index(
+        "ix_team_memberships_user_id_team_id",
+        "team_memberships",
+        ["user_id", "team_id"],
+        unique=False,
+        postgresql_concurrently=concurrently,
+    )
+    op.drop_index(
+        "ix_team_memberships_user_id",
+        table_name="team_memberships",
+        postgresql_concurrently=concurrently,
+    )
+    op.drop_index(
+        "ix_team_memberships_team_id",
+        table_name="team_memberships",
+        postgresql_concurrently=concurrently,
+    )
+
+
+def _downgrade_indexes(concurrently: bool) -> None:
+    op.create_index(
+        "ix_team_memberships_team_id",
+        "team_memberships",
+        ["team_id"],
+        unique=False,
+        postgresql_concurrently=concurrently,
+    )
+    op.create_index(
+        "ix_team_memberships_user_id",
+        "team_memberships",
+        ["user_id"],
+        unique=False,
+        postgresql_concurrently=concurrently,
+    )
+    op.drop_index(
+        "ix_team_memberships_user_id_team_id",
+        table_name="team_memberships",
+        postgresql_concurrently=concurrently,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _run(_upgrade_indexes)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _run(_downgrade_indexes)
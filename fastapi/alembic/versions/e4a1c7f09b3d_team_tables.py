@@ -0,0 +1,124 @@
+"""team tables
+
+Revision ID: e4a1c7f09b3d
+Revises: 5b2e9d41c7aa
+Create Date: 2026-10-18 04:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a1c7f09b3d"
+down_revision: Union[str, None] = "5b2e9d41c7aa"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _teams_schema() -> list:
+    return [
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=127), nullable=False),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    ]
+
+
+def _team_memberships_schema() -> list:
+    return [
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("role", sa.String(length=32), nullable=False),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("invited_by_id", sa.Integer(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["invited_by_id"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["team_id"], ["teams.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("team_id", "user_id", name="uq_team_member"),
+    ]
+
+
+TEAM_TABLES = {"teams": _teams_schema, "team_memberships": _team_memberships_schema}
+TEAM_INDEXES = {
+    "teams": {"ix_teams_id": ["id"], "ix_teams_owner_id": ["owner_id"]},
+    "team_memberships": {
+        "ix_team_memberships_team_id": ["team_id"],
+        "ix_team_memberships_user_id": ["user_id"],
+    },
+}
+
+
+def _existing_tables() -> set[str]:
+    if context.is_offline_mode():
+        return set()
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _add_timestamp_defaults(table: str) -> None:
+    # SQLite rebuilds the table to change a default; copy_from hands batch
+    # mode the full definition, indexes included, since reflection loses
+    # ON DELETE actions and unnamed unique constraints.
+    metadata = sa.MetaData()
+    sa.Table("users", metadata, sa.Column("id", sa.Integer(), primary_key=True))
+    for name, schema in TEAM_TABLES.items():
+        definition = sa.Table(name, metadata, *schema())
+        for index, columns in TEAM_INDEXES[name].items():
+            sa.Index(index, *(definition.c[column] for column in columns))
+    with op.batch_alter_table(table, copy_from=metadata.tables[table]) as batch_op:
+        batch_op.alter_column("created_at", server_default=sa.func.now())
+        batch_op.alter_column("updated_at", server_default=sa.func.now())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Deployments that predate this migration may already have these tables,
+    # created from the models with metadata.create_all(); keep them and only
+    # add the timestamp defaults the models now rely on.
+    existing = _existing_tables()
+    for table, schema in TEAM_TABLES.items():
+        if table in existing:
+            _add_timestamp_defaults(table)
+            continue
+        op.create_table(table, *schema())
+        for index, columns in TEAM_INDEXES[table].items():
+            op.create_index(index, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TEAM_TABLES):
+        for index in TEAM_INDEXES[table]:
+            op.drop_index(index, table_name=table)
+        op.drop_table(table)
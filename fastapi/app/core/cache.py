@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Lightweight, cache-friendly snapshot of an authenticated user."""
+
+    id: int
+    email: str
+    first_name: str
+    last_name: str
+    is_active: bool
+    is_admin: bool
+    is_email_verified: bool
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_user(cls, user: Any) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            first_name=user.first_name,
+            last_name=user.last_name or "",
+            is_active=user.is_active,
+            is_admin=user.is_admin,
+            is_email_verified=user.is_email_verified,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["created_at"] = self.created_at.isoformat()
+        data["updated_at"] = self.updated_at.isoformat()
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> "Principal":
+        data = json.loads(raw)
+        data["created_at"] = datetime.fromisoformat(data["created_at"])
+        data["updated_at"] = datetime.fromisoformat(data["updated_at"])
+        return cls(**data)
+
+
+class PrincipalCache(ABC):
+    """Caches principals keyed by user id.
+
+    Shared backends add a per-user version stamp to the key and invalidate by
+    bumping it, so stale snapshots become unreachable even on backends without
+    prefix deletes.
+    """
+
+    @abstractmethod
+    async def get(self, user_id: int) -> Principal | None: ...
+
+    @abstractmethod
+    async def set(self, principal: Principal) -> None: ...
+
+    @abstractmethod
+    async def invalidate(self, user_id: int) -> None: ...
+
+
+class NullPrincipalCache(PrincipalCache):
+    """Disables caching; every lookup falls through to the database."""
+
+    async def get(self, user_id: int) -> Principal | None:
+        return None
+
+    async def set(self, principal: Principal) -> None:
+        return None
+
+    async def invalidate(self, user_id: int) -> None:
+        return None
+
+
+class MemoryPrincipalCache(PrincipalCache):
+    """In-process TTL/LRU cache; invalidations are only visible to this worker.
+
+    Entries are keyed by user id alone and invalidation removes them, so the
+    cache never holds more than ``max_entries`` users.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[int, tuple[float, Principal]] = OrderedDict()
+
+    async def get(self, user_id: int) -> Principal | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, principal = entry
+        if expires_at <= self._clock():
+            self._entries.pop(user_id, None)
+            return None
+        self._entries.move_to_end(user_id)
+        return principal
+
+    async def set(self, principal: Principal) -> None:
+        self._entries[principal.id] = (self._clock() + self._ttl, principal)
+        self._entries.move_to_end(principal.id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+
+class RedisPrincipalCache(PrincipalCache):
+    """Shared cache for multi-worker deployments backed by Redis."""
+
+    def __init__(self, *, url: str, ttl_seconds: float, client: Any = None) -> None:
+        if client is None:
+            try:
+                from redis import asyncio as redis_asyncio
+            except ImportError as exc:  # pragma: no cover - optional dependency
+                raise RuntimeError(
+                    "PRINCIPAL_CACHE_BACKEND=redis requires the 'redis' package."
+                ) from exc
+            client = redis_asyncio.from_url(url)
+        self._client = client
+        self._ttl = int(ttl_seconds)
+
+    @staticmethod
+    def _version_key(user_id: int) -> str:
+        return f"principal:{user_id}:version"
+
+    async def _entry_key(self, user_id: int) -> str:
+        version = await self._client.get(self._version_key(user_id))
+        return f"principal:{user_id}:{int(version or 0)}"
+
+    async def get(self, user_id: int) -> Principal | None:
+        raw = await self._client.get(await self._entry_key(user_id))
+        return Principal.from_json(raw) if raw else None
+
+    async def set(self, principal: Principal) -> None:
+        await self._client.set(
+            await self._entry_key(principal.id), principal.to_json(), ex=self._ttl
+        )
+
+    async def invalidate(self, user_id: int) -> None:
+        await self._client.incr(self._version_key(user_id))
+
+
+@lru_cache(maxsize=1)
+def get_principal_cache() -> PrincipalCache:
+    backend = (settings.principal_cache_backend or "memory").lower()
+    if backend == "none":
+        return NullPrincipalCache()
+    if backend == "redis":
+        return RedisPrincipalCache(
+            url=settings.redis_url,
+            ttl_seconds=settings.principal_cache_ttl_seconds,
+        )
+    return MemoryPrincipalCache(
+        ttl_seconds=settings.principal_cache_ttl_seconds,
+        max_entries=settings.principal_cache_max_entries,
+    )
@@ -32,6 +32,34 @@ class Settings:
         default_factory=lambda: os.getenv("ASYNC_DATABASE_URL")
         or os.getenv("DATABASE_URL")
     )
+    read_replica_url: str | None = field(
+        default_factory=lambda: os.getenv("READ_REPLICA_DATABASE_URL") or None
+    )
+    read_after_write_window_seconds: float = field(
+        default_factory=lambda: float(os.getenv("READ_AFTER_WRITE_WINDOW_SECONDS", "5"))
+    )
+    read_after_write_backend: str = field(
+        default_factory=lambda: os.getenv("READ_AFTER_WRITE_BACKEND", "memory")
+    )
+    db_pool_size: int = field(
+        default_factory=lambda: int(os.getenv("DB_POOL_SIZE", "5"))
+    )
+    db_max_overflow: int = field(
+        default_factory=lambda: int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    )
+    db_pool_recycle_seconds: int = field(
+        default_factory=lambda: int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    )
+    db_pool_timeout_seconds: float = field(
+        default_factory=lambda: float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    )
+    db_pool_use_lifo: bool = field(
+        default_factory=lambda: os.getenv("DB_POOL_USE_LIFO", "true").strip().lower()
+        not in {"0", "false", "no", "off"}
+    )
+    db_pool_liveness: str = field(
+        default_factory=lambda: os.getenv("DB_POOL_LIVENESS", "pre_ping")
+    )
 
     secret_key: str = field(default_factory=lambda: os.getenv("SECRET_KEY"))
     algorithm: str = field(default_factory=lambda: os.getenv("ALGORITHM"))
@@ -57,6 +85,78 @@ class Settings:
         default_factory=lambda: os.getenv("SMTP_PASSWORD")
     )
     from_email: str = field(default_factory=lambda: os.getenv("FROM_EMAIL"))
+    smtp_starttls: bool = field(
+        default_factory=lambda: os.getenv("SMTP_STARTTLS", "true").strip().lower()
+        not in {"0", "false", "no", "off"}
+    )
+    email_outbox_workers: int = field(
+        default_factory=lambda: int(os.getenv("EMAIL_OUTBOX_WORKERS", "2"))
+    )
+    email_outbox_max_size: int = field(
+        default_factory=lambda: int(os.getenv("EMAIL_OUTBOX_MAX_SIZE", "10000"))
+    )
+    email_max_attempts: int = field(
+        default_factory=lambda: int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+    )
+    email_retry_base_seconds: float = field(
+        default_factory=lambda: float(os.getenv("EMAIL_RETRY_BASE_SECONDS", "2"))
+    )
+    email_retry_max_seconds: float = field(
+        default_factory=lambda: float(os.getenv("EMAIL_RETRY_MAX_SECONDS", "300"))
+    )
+
+    password_hash_workers: int = field(
+        default_factory=lambda: int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+    )
+    password_hash_max_pending: int = field(
+        default_factory=lambda: int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+    )
+
+    redis_url: str | None = field(default_factory=lambda: os.getenv("REDIS_URL"))
+    notifications_backend: str = field(
+        default_factory=lambda: os.getenv("NOTIFICATIONS_BACKEND", "memory")
+    )
+    notifications_socket_path: str = field(
+        default_factory=lambda: os.getenv(
+            "NOTIFICATIONS_SOCKET_PATH", "/tmp/fastapi-notifications.sock"
+        )
+    )
+    notifications_channel: str = field(
+        default_factory=lambda: os.getenv("NOTIFICATIONS_CHANNEL", "notifications")
+    )
+    notifications_max_pending: int = field(
+        default_factory=lambda: int(os.getenv("NOTIFICATIONS_MAX_PENDING", "100"))
+    )
+    notifications_send_timeout_seconds: float = field(
+        default_factory=lambda: float(
+            os.getenv("NOTIFICATIONS_SEND_TIMEOUT_SECONDS", "5")
+        )
+    )
+    notifications_slow_consumer_policy: str = field(
+        default_factory=lambda: os.getenv(
+            "NOTIFICATIONS_SLOW_CONSUMER_POLICY", "drop_oldest"
+        )
+    )
+    metrics_enabled: bool = field(
+        default_factory=lambda: os.getenv("METRICS_ENABLED", "false").strip().lower()
+        in {"1", "true", "yes", "on"}
+    )
+    metrics_path: str = field(
+        default_factory=lambda: os.getenv("METRICS_PATH", "/internal/metrics")
+    )
+    trusted_output: bool = field(
+        default_factory=lambda: os.getenv("TRUSTED_OUTPUT", "true").strip().lower()
+        not in {"0", "false", "no", "off"}
+    )
+    principal_cache_backend: str = field(
+        default_factory=lambda: os.getenv("PRINCIPAL_CACHE_BACKEND", "memory")
+    )
+    principal_cache_ttl_seconds: int = field(
+        default_factory=lambda: int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+    )
+    principal_cache_max_entries: int = field(
+        default_factory=lambda: int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+    )
 
 
 settings = Settings()
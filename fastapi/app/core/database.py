@@ -1,14 +1,76 @@
 from __future__ import annotations
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, TypeVar
 
-from app.core.config import settings
+from sqlalchemy import Select, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util import await_only
+
+from app.core.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+LIVENESS_STRATEGIES = {"pre_ping", "recycle"}
+
+_CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
 
 
 class Base(DeclarativeBase):
     """Declarative base for SQLAlchemy models."""
 
+    # Fetch server-generated columns (timestamps) with RETURNING as part of
+    # each INSERT and UPDATE, so written rows never need a refresh.
+    __mapper_args__ = {"eager_defaults": True}
+
+
+ModelT = TypeVar("ModelT", bound=Base)
+
+
+def dialect_insert(db: AsyncSession, entity: Any):
+    """The bound dialect's ``insert``, which supports ``on_conflict_do_nothing``."""
+    dialect = db.bind.dialect.name
+    if dialect not in _CONFLICT_INSERTS:
+        raise RuntimeError(f"INSERT ... ON CONFLICT is not supported on {dialect!r}.")
+    return _CONFLICT_INSERTS[dialect](entity)
+
+
+async def insert_or_conflict(
+    db: AsyncSession,
+    model: type[ModelT],
+    values: Mapping[str, Any],
+    *,
+    conflict_on: Sequence[Any],
+) -> ModelT | None:
+    """Insert one ``model`` row, or return ``None`` if it conflicts on ``conflict_on``.
+
+    Issues a single ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` instead of
+    a lookup followed by an insert, so concurrent writers cannot both pass the
+    lookup and have one of them fail on the unique constraint. ``conflict_on``
+    names the columns (or expressions) of the unique index to arbitrate on.
+    The new row comes back as a persistent instance, server defaults included.
+    """
+    statement = (
+        dialect_insert(db, model)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=list(conflict_on))
+        .returning(model)
+    )
+    return (await db.execute(statement)).scalars().first()
+
 
 def _as_bool(value) -> bool:
     if isinstance(value, bool):
@@ -18,22 +80,316 @@ def _as_bool(value) -> bool:
     return bool(value)
 
 
+class PoolMetrics:
+    """Checkout wait timings and disconnect counts for one connection pool."""
+
+    __slots__ = ("checkouts", "wait_seconds_total", "wait_seconds_max", "disconnects")
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.disconnects = 0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        if seconds > self.wait_seconds_max:
+            self.wait_seconds_max = seconds
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout takes.
+
+    The timing covers waiting for a free slot, opening new connections and,
+    with ``pool_pre_ping``, the ping round-trip.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            self.metrics.record_wait(time.perf_counter() - started)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def engine_options(url: str, config: Settings) -> dict[str, Any]:
+    """Build ``create_async_engine`` keyword arguments for ``url``.
+
+    ``pre_ping`` issues a ping on every checkout. ``recycle`` skips it and
+    relies on ``pool_recycle`` retiring connections before server or proxy
+    idle timeouts, plus SQLAlchemy invalidating the whole pool when a
+    statement fails with a disconnect error; only the request that hits the
+    dead connection fails.
+    """
+    liveness = config.db_pool_liveness.strip().lower()
+    if liveness not in LIVENESS_STRATEGIES:
+        raise RuntimeError(
+            f"DB_POOL_LIVENESS must be one of {sorted(LIVENESS_STRATEGIES)}, "
+            f"got {config.db_pool_liveness!r}."
+        )
+
+    options: dict[str, Any] = {
+        "echo": _as_bool(getattr(config, "debug", False)),
+        "pool_pre_ping": liveness == "pre_ping",
+    }
+    parsed = make_url(url)
+    in_memory = parsed.database in (None, "", ":memory:")
+    if parsed.get_backend_name() == "sqlite" and in_memory:
+        # In-memory SQLite shares a single connection (StaticPool), so sizing
+        # does not apply.
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        pool_recycle=config.db_pool_recycle_seconds,
+        pool_timeout=config.db_pool_timeout_seconds,
+        pool_use_lifo=config.db_pool_use_lifo,
+    )
+    return options
+
+
+def _count_disconnects(context) -> None:
+    if not context.is_disconnect or context.engine is None:
+        return
+    metrics = getattr(context.engine.pool, "metrics", None)
+    if metrics is not None:
+        metrics.disconnects += 1
+
+
+def build_engine(url: str, config: Settings) -> AsyncEngine:
+    async_engine = create_async_engine(url, **engine_options(url, config))
+    event.listen(async_engine.sync_engine, "handle_error", _count_disconnects)
+    return async_engine
+
+
+def pool_metrics(bind: AsyncEngine | None = None) -> dict[str, float]:
+    """Snapshot of pool gauges and checkout counters for ``bind`` or ``engine``."""
+    pool = (bind or engine).pool
+    snapshot: dict[str, float] = {}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        snapshot.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            in_use=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        snapshot.update(
+            checkouts=metrics.checkouts,
+            checkout_wait_seconds_total=metrics.wait_seconds_total,
+            checkout_wait_seconds_max=metrics.wait_seconds_max,
+            disconnects=metrics.disconnects,
+        )
+    return snapshot
+
+
+class PrimarySession(Session):
+    """Session on the primary that records whether it committed any writes.
+
+    ``info["wrote"]`` turns true after the first commit that flushed changes
+    or followed an INSERT, UPDATE or DELETE statement.
+    If ``info["user_id"]`` holds the acting user's id, that user is also
+    added to ``recent_writes``.
+    """
+
+
+class RoutingSession(Session):
+    """Session bound to a read replica that falls back to the primary.
+
+    ``info["primary"]`` may hold the request's ``PrimarySession``. Once that
+    session has committed a write, and for anything other than a plain
+    SELECT, statements go to the primary so the request reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        primary = self.info.get("primary")
+        if primary is not None and (
+            self._flushing
+            or not isinstance(clause, Select)
+            or primary.info.get("wrote")
+        ):
+            return primary.get_bind(mapper, clause=clause, **kwargs)
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+class RecentWrites(ABC):
+    """Users who committed a write within the last ``window_seconds``.
+
+    Their reads stay on the primary until replicas have had time to catch up.
+    """
+
+    def __init__(self, window_seconds: float) -> None:
+        self._window = window_seconds
+
+    async def mark(self, user_id: int | None) -> None:
+        if user_id is not None and self._window > 0:
+            await self._mark(user_id)
+
+    async def contains(self, user_id: int | None) -> bool:
+        if user_id is None or self._window <= 0:
+            return False
+        return await self._contains(user_id)
+
+    @abstractmethod
+    async def _mark(self, user_id: int) -> None: ...
+
+    @abstractmethod
+    async def _contains(self, user_id: int) -> bool: ...
+
+
+class MemoryRecentWrites(RecentWrites):
+    """In-process marks; only visible to this worker, so only for single workers."""
+
+    def __init__(
+        self,
+        window_seconds: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(window_seconds)
+        self._clock = clock
+        self._marks: OrderedDict[int, float] = OrderedDict()
+
+    async def _mark(self, user_id: int) -> None:
+        now = self._clock()
+        self._marks[user_id] = now
+        self._marks.move_to_end(user_id)
+        # Marks are kept in write order, so expired ones are always at the front.
+        while self._marks:
+            oldest_id, marked_at = next(iter(self._marks.items()))
+            if now - marked_at < self._window:
+                break
+            del self._marks[oldest_id]
+
+    async def _contains(self, user_id: int) -> bool:
+        marked_at = self._marks.get(user_id)
+        return marked_at is not None and self._clock() - marked_at < self._window
+
+
+class RedisRecentWrites(RecentWrites):
+    """Marks shared by every worker, each a Redis key expiring with the window."""
+
+    def __init__(
+        self, *, url: str | None, window_seconds: float, client: Any = None
+    ) -> None:
+        super().__init__(window_seconds)
+        if client is None:
+            try:
+                from redis import asyncio as redis_asyncio
+            except ImportError as exc:  # pragma: no cover - optional dependency
+                raise RuntimeError(
+                    "READ_AFTER_WRITE_BACKEND=redis requires the 'redis' package."
+                ) from exc
+            client = redis_asyncio.from_url(url)
+        self._client = client
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"recent-write:{user_id}"
+
+    async def _mark(self, user_id: int) -> None:
+        await self._client.set(self._key(user_id), 1, px=int(self._window * 1000))
+
+    async def _contains(self, user_id: int) -> bool:
+        return bool(await self._client.exists(self._key(user_id)))
+
+
+def build_recent_writes(config: Settings) -> RecentWrites:
+    window = config.read_after_write_window_seconds
+    if (config.read_after_write_backend or "memory").lower() == "redis":
+        return RedisRecentWrites(url=config.redis_url, window_seconds=window)
+    return MemoryRecentWrites(window)
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _flag_pending_write(session, flush_context) -> None:
+    session.info["pending_write"] = True
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _flag_statement_write(orm_execute_state) -> None:
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info["pending_write"] = True
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _record_write(session) -> None:
+    if not session.info.pop("pending_write", False):
+        return
+    session.info["wrote"] = True
+    user_id = session.info.get("user_id")
+    if user_id is None or read_engine is None:
+        return
+    try:
+        # Commit hooks run inside AsyncSession's greenlet, so the mark can be
+        # awaited here and is stored before the request returns.
+        await_only(recent_writes.mark(user_id))
+    except Exception:  # noqa: BLE001 - the write itself has committed
+        logger.warning(
+            "Could not record a recent write by user %s", user_id, exc_info=True
+        )
+
+
+@event.listens_for(PrimarySession, "after_rollback")
+def _discard_pending_write(session) -> None:
+    session.info.pop("pending_write", None)
+
+
+def _require_async_driver(url: str) -> None:
+    driver_name = (url.split("://", 1)[0] or "").lower()
+    if "+" not in driver_name:
+        raise RuntimeError(
+            "The configured DATABASE_URL must use an async driver "
+            "(e.g. 'postgresql+asyncpg://'). "
+            "Provide ASYNC_DATABASE_URL or update DATABASE_URL accordingly."
+        )
+
+
 database_url = settings.async_database_url or settings.database_url
 
 if not database_url:
-    raise RuntimeError("DATABASE_URL is not configured; check your environment variables.")
-
-driver_name = (database_url.split("://", 1)[0] or "").lower()
-if "+" not in driver_name:
     raise RuntimeError(
-        "The configured DATABASE_URL must use an async driver (e.g. 'postgresql+asyncpg://'). "
-        "Provide ASYNC_DATABASE_URL or update DATABASE_URL accordingly."
+        "DATABASE_URL is not configured; check your environment variables."
     )
 
-engine = create_async_engine(
-    database_url,
-    echo=_as_bool(getattr(settings, "debug", False)),
-    pool_pre_ping=True,
-)
+_require_async_driver(database_url)
+engine = build_engine(database_url, settings)
+
+read_engine: AsyncEngine | None = None
+if settings.read_replica_url:
+    _require_async_driver(settings.read_replica_url)
+    read_engine = build_engine(settings.read_replica_url, settings)
+
+recent_writes = build_recent_writes(settings)
 
-SessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    sync_session_class=PrimarySession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine or engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
@@ -6,8 +6,11 @@ from jose import JWTError, jwt
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import Principal, PrincipalCache, get_principal_cache
 from app.core.config import oauth2_scheme, settings
-from app.core.database import SessionLocal
+from app.core import database
+from app.core.database import ReadSessionLocal, SessionLocal
+from app.core.metrics import track
 from app.models import User
 
 
@@ -16,10 +19,15 @@ async def get_db() -> AsyncIterator[AsyncSession]:
         yield db
 
 
-async def get_auth_user(
-    token: HTTPAuthorizationCredentials | None = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> User:
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _decode_user_id(token: HTTPAuthorizationCredentials | None) -> int:
     if token is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -27,28 +35,75 @@ async def get_auth_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
     try:
-        payload = jwt.decode(
-            token.credentials,
-            settings.secret_key,
-            algorithms=[settings.algorithm],
-        )
+        with track("jwt"):
+            payload = jwt.decode(
+                token.credentials,
+                settings.secret_key,
+                algorithms=[settings.algorithm],
+            )
         user_id_raw: str | None = payload.get("sub")
         if user_id_raw is None:
-            raise credentials_exception
-        user_id = int(user_id_raw)
+            raise _credentials_exception()
+        return int(user_id_raw)
     except (JWTError, ValueError) as exc:
-        raise credentials_exception from exc
+        raise _credentials_exception() from exc
+
 
+async def _load_user(db: AsyncSession, user_id: int) -> User:
     query = select(User).where(User.id == user_id)
     result = await db.execute(query)
     user = result.scalar_one_or_none()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
+
+
+async def get_auth_user(
+    token: HTTPAuthorizationCredentials | None = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """Resolve the full ORM user; use for handlers that mutate the row."""
+    user_id = _decode_user_id(token)
+    # Commits on this session start the user's read-after-write window.
+    db.info["user_id"] = user_id
+    return await _load_user(db, user_id)
+
+
+async def get_auth_principal(
+    token: HTTPAuthorizationCredentials | None = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+    principal_cache: PrincipalCache = Depends(get_principal_cache),
+) -> Principal:
+    """Resolve a cached principal, only touching the users table on a miss.
+
+    Misses read the primary: a miss usually follows an invalidation after a
+    write, and a lagging replica would put the pre-write row in the cache
+    for its whole TTL.
+    """
+    user_id = _decode_user_id(token)
+    db.info["user_id"] = user_id
+    principal = await principal_cache.get(user_id)
+    if principal is None:
+        principal = Principal.from_user(await _load_user(db, user_id))
+        await principal_cache.set(principal)
+    return principal
+
+
+async def get_read_db(
+    principal: Principal = Depends(get_auth_principal),
+    db: AsyncSession = Depends(get_db),
+) -> AsyncIterator[AsyncSession]:
+    """Session for authenticated read-only handlers, served by the replica.
+
+    Falls back to the request's primary session when no replica is configured,
+    once that session has committed, and for callers who wrote within
+    ``READ_AFTER_WRITE_WINDOW_SECONDS``.
+    """
+    if database.read_engine is None or await database.recent_writes.contains(
+        principal.id
+    ):
+        yield db
+        return
+    async with ReadSessionLocal(info={"primary": db.sync_session}) as read_db:
+        yield read_db
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+PHASES = ("db", "password_hash", "jwt", "notifications")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(pairs: Iterable[tuple[str, str]]) -> str:
+    rendered = ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs)
+    return "{" + rendered + "}" if rendered else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative Prometheus histogram keyed by a tuple of label values."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        buckets: tuple[float, ...],
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for labels, series in sorted(self._series.items()):
+            pairs = list(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), series[:-1]):
+                cumulative += count
+                le = bound if isinstance(bound, str) else _format_value(float(bound))
+                bucket_labels = _format_labels([*pairs, ("le", le)])
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(
+                f"{self.name}_sum{_format_labels(pairs)} {_format_value(series[-1])}"
+            )
+            lines.append(f"{self.name}_count{_format_labels(pairs)} {cumulative}")
+        return lines
+
+
+def _render_samples(
+    kind: str,
+    name: str,
+    documentation: str,
+    samples: list[tuple[dict[str, str], float]],
+) -> list[str]:
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(labels.items())} {_format_value(value)}")
+    return lines
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Time from request start until the response body is sent.",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS,
+)
+request_phase_duration = Histogram(
+    "http_request_phase_seconds",
+    "Time each request spent waiting on a phase "
+    "(db, password_hash, jwt, notifications).",
+    ("route", "phase"),
+    LATENCY_BUCKETS,
+)
+request_queries = Histogram(
+    "http_request_queries",
+    "SQL statements executed per request.",
+    ("route",),
+    QUERY_BUCKETS,
+)
+
+
+class RequestStats:
+    """Time per phase and statement count accumulated during one request."""
+
+    __slots__ = ("phases", "queries")
+
+    def __init__(self) -> None:
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.queries = 0
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+class _Span:
+    __slots__ = ("_stats", "_phase", "_started")
+
+    def __init__(self, stats: RequestStats, phase: str) -> None:
+        self._stats = stats
+        self._phase = phase
+
+    def __enter__(self) -> None:
+        self._started = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stats.phases[self._phase] += time.perf_counter() - self._started
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def track(phase: str) -> _Span | _NoopSpan:
+    """Time a block against ``phase`` for the current request.
+
+    Outside an instrumented request (or with metrics disabled) this is a
+    context-variable lookup returning a shared no-op span.
+    """
+    stats = _current.get()
+    if stats is None:
+        return _NOOP_SPAN
+    return _Span(stats, phase)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, phase breakdown and query counts per route.
+
+    Routes are labelled with their path template so path parameters do not
+    create new series; requests that match no route share ``unmatched``.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            request_duration.observe(
+                (scope["method"], route, str(status_code)), elapsed
+            )
+            for phase, seconds in stats.phases.items():
+                request_phase_duration.observe((route, phase), seconds)
+            request_queries.observe((route,), stats.queries)
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    stats = _current.get()
+    if stats is not None:
+        conn.info["metrics_query"] = (stats, time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    entry = conn.info.pop("metrics_query", None)
+    if entry is not None:
+        stats, started = entry
+        stats.phases["db"] += time.perf_counter() - started
+        stats.queries += 1
+
+
+def instrument_engine(async_engine: AsyncEngine) -> None:
+    """Attribute statement time and counts on ``async_engine`` to the request."""
+    sync_engine = async_engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+Samples = list[tuple[str, str, list[tuple[dict[str, str], float]]]]
+
+
+def render_metrics(gauges: Samples = (), counters: Samples = ()) -> str:
+    """Render all histograms, plus caller-sampled metrics, as Prometheus text.
+
+    ``gauges`` are point-in-time values. ``counters`` only ever grow within
+    a process and are named with a ``_total`` suffix, so ``rate()`` handles
+    worker restarts as counter resets.
+    """
+    lines: list[str] = []
+    for histogram in (request_duration, request_phase_duration, request_queries):
+        lines.extend(histogram.render())
+    for kind, metrics in (("gauge", gauges), ("counter", counters)):
+        for name, documentation, samples in metrics:
+            lines.extend(_render_samples(kind, name, documentation, samples))
+    return "\n".join(lines) + "\n"
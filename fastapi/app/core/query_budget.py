@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType
+from typing import Any, Callable, Iterable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+try:
+    import greenlet
+except ImportError:  # pragma: no cover - installed with SQLAlchemy's asyncio extra
+    greenlet = None
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+_THIS_FILE = str(Path(__file__).resolve())
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block runs more queries, or more repeats, than budgeted."""
+
+
+@dataclass(slots=True)
+class RecordedQuery:
+    statement: str
+    call_site: str
+
+
+def _frames() -> Iterator[FrameType]:
+    # SQLAlchemy's asyncio layer runs statements in a child greenlet whose
+    # stack ends at greenlet_spawn; continue into the awaiting greenlet so
+    # the coroutine that issued the query is found.
+    frame = sys._getframe(1)
+    current = greenlet.getcurrent() if greenlet is not None else None
+    while True:
+        while frame is not None:
+            yield frame
+            frame = frame.f_back
+        current = current.parent if current is not None else None
+        if current is None:
+            return
+        frame = current.gr_frame
+
+
+def _call_site(depth: int = 3) -> str:
+    sites: list[str] = []
+    for frame in _frames():
+        filename = frame.f_code.co_filename
+        if (
+            filename == _THIS_FILE
+            or not filename.startswith(str(PROJECT_ROOT))
+            or "site-packages" in filename
+        ):
+            continue
+        relative = Path(filename).relative_to(PROJECT_ROOT)
+        sites.append(f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}")
+        if len(sites) == depth:
+            break
+    return " <- ".join(sites) or "<unknown>"
+
+
+def _sync_engine(bind: Any) -> Engine:
+    if isinstance(bind, Engine):
+        return bind
+    if hasattr(bind, "sync_engine"):
+        return bind.sync_engine
+    # Session or AsyncSession
+    return _sync_engine(bind.bind)
+
+
+def _default_binds() -> list[Any]:
+    from app.core import database
+
+    return [
+        bind for bind in (database.engine, database.read_engine) if bind is not None
+    ]
+
+
+class QueryBudget:
+    """Asserts a block stays within a query budget and flags N+1 patterns.
+
+    Use as a context manager around code that awaits queries, or as a
+    decorator on sync or async functions. On exit the block fails with
+    ``QueryBudgetExceeded`` if it ran more than ``max_queries`` statements,
+    or any statement text (which SQLAlchemy keeps parameterized) more than
+    ``max_repeats`` times; the report lists each statement with the project
+    call sites that issued it. Statements from other tasks sharing the
+    engines during the block are counted too.
+    """
+
+    def __init__(
+        self,
+        max_queries: int | None = None,
+        *,
+        max_repeats: int | None = 2,
+        binds: Iterable[Any] | None = None,
+    ) -> None:
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self._binds = list(binds) if binds is not None else None
+        self._engines: list[Engine] = []
+        self.queries: list[RecordedQuery] = []
+
+    def _record(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        self.queries.append(RecordedQuery(statement=statement, call_site=_call_site()))
+
+    def __enter__(self) -> "QueryBudget":
+        binds = self._binds if self._binds is not None else _default_binds()
+        self._engines = list(
+            {id(engine): engine for engine in map(_sync_engine, binds)}.values()
+        )
+        self.queries = []
+        for engine in self._engines:
+            event.listen(engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        for engine in self._engines:
+            event.remove(engine, "before_cursor_execute", self._record)
+        if exc_type is None:
+            self.check()
+
+    def __call__(self, func: Callable) -> Callable:
+        def _fresh() -> QueryBudget:
+            return QueryBudget(
+                self.max_queries, max_repeats=self.max_repeats, binds=self._binds
+            )
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with _fresh():
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _fresh():
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    def repeated(self) -> dict[str, list[RecordedQuery]]:
+        """Statements executed more than ``max_repeats`` times, keyed by SQL text."""
+        if self.max_repeats is None:
+            return {}
+        by_statement: dict[str, list[RecordedQuery]] = defaultdict(list)
+        for query in self.queries:
+            by_statement[query.statement].append(query)
+        return {
+            sql: runs
+            for sql, runs in by_statement.items()
+            if len(runs) > self.max_repeats
+        }
+
+    def check(self) -> None:
+        problems: list[str] = []
+        if self.max_queries is not None and self.count > self.max_queries:
+            problems.append(
+                f"{self.count} queries executed, budget is {self.max_queries}"
+            )
+        repeated = self.repeated()
+        if repeated:
+            problems.append(
+                f"{len(repeated)} statement(s) repeated more than "
+                f"{self.max_repeats} times (likely N+1)"
+            )
+        if problems:
+            raise QueryBudgetExceeded("; ".join(problems) + "\n" + self.report())
+
+    def report(self) -> str:
+        repeated = self.repeated()
+        lines = []
+        for index, query in enumerate(self.queries, start=1):
+            marker = " [repeated]" if query.statement in repeated else ""
+            statement = " ".join(query.statement.split())
+            lines.append(f"  {index}. {statement}{marker}\n     at {query.call_site}")
+        return "\n".join(lines)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import types
+import typing
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, TypeVar
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+M = TypeVar("M", bound=BaseModel)
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=None)
+def _nested_fields(
+    model: type[BaseModel],
+) -> tuple[tuple[str, type[BaseModel], bool], ...]:
+    """Fields holding other models, as ``(name, model, is_list)``.
+
+    Covers ``Model``, ``Model | None`` and ``list[Model]``, which is every
+    shape the response schemas use.
+    """
+    nested = []
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+            arguments = [
+                arg for arg in typing.get_args(annotation) if arg is not type(None)
+            ]
+            annotation = arguments[0] if len(arguments) == 1 else annotation
+        is_list = typing.get_origin(annotation) is list
+        if is_list:
+            (annotation,) = typing.get_args(annotation)
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            nested.append((name, annotation, is_list))
+    return tuple(nested)
+
+
+def construct(model: type[M], source: Any) -> M:
+    """Build ``model`` from a mapping or ORM object without validating it.
+
+    Only for data we produced ourselves, such as rows read back from our own
+    database: nothing is coerced or checked (``EmailStr`` included), so the
+    source must already match the schema. Fields the source lacks are left
+    unset, which keeps ``exclude_unset`` projections working.
+    """
+    if isinstance(source, model):
+        return source
+    if isinstance(source, Mapping):
+        values = {name: source[name] for name in model.model_fields if name in source}
+    else:
+        values = {}
+        for name in model.model_fields:
+            value = getattr(source, name, _MISSING)
+            if value is not _MISSING:
+                values[name] = value
+    for name, nested, is_list in _nested_fields(model):
+        value = values.get(name)
+        if value is None:
+            continue
+        if is_list:
+            values[name] = [construct(nested, item) for item in value]
+        else:
+            values[name] = construct(nested, value)
+    return model.model_construct(**values)
+
+
+def _dumps(content: Any) -> bytes:
+    # OPT_UTC_Z writes UTC offsets as "Z", as pydantic does.
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+class TrustedJSONResponse(JSONResponse):
+    """JSON response encoded with orjson; output matches ``model_dump_json``."""
+
+    def render(self, content: Any) -> bytes:
+        return _dumps(content)
+
+
+def _content(model: type[BaseModel], source: Any, exclude_unset: bool) -> Any:
+    if settings.trusted_output:
+        return construct(model, source).model_dump(exclude_unset=exclude_unset)
+    validated = model.model_validate(source, from_attributes=True)
+    return validated.model_dump(mode="json", exclude_unset=exclude_unset)
+
+
+def encode(
+    model: type[BaseModel], source: Any, *, exclude_unset: bool = False
+) -> bytes:
+    """Serialize ``source`` as ``model`` to JSON bytes, e.g. for streamed lines."""
+    return _dumps(_content(model, source, exclude_unset))
+
+
+def trusted_response(
+    model: type[BaseModel],
+    source: Any,
+    *,
+    many: bool = False,
+    status_code: int = 200,
+    exclude_unset: bool = False,
+) -> JSONResponse:
+    """Serialize ``source`` as ``model`` for a route that declares it as its response.
+
+    By default the model is built with ``construct`` and encoded with orjson,
+    skipping the validation FastAPI would otherwise run on the returned value;
+    with ``TRUSTED_OUTPUT`` disabled the source is fully validated instead, as
+    before. ``many`` serializes a sequence of sources as a list. Returning a
+    response bypasses the route's ``status_code`` and
+    ``response_model_exclude_unset``, so both are passed here as well.
+    """
+    if many:
+        content = [_content(model, item, exclude_unset) for item in source]
+    else:
+        content = _content(model, source, exclude_unset)
+    return TrustedJSONResponse(content, status_code=status_code)
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime
+from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -21,12 +29,10 @@ class Team(Base):
         ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(UTC)
+        DateTime(timezone=True), server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
-        default=lambda: datetime.now(UTC),
-        onupdate=lambda: datetime.now(UTC),
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
     owner: Mapped["User"] = relationship(
@@ -40,16 +46,25 @@ class Team(Base):
     )
 
 
+# Names are unique ignoring case; creation conflicts go through this index.
+Index("ix_teams_name_lower", func.lower(Team.name), unique=True)
+
+
 class TeamMembership(Base):
     __tablename__ = "team_memberships"
-    __table_args__ = (UniqueConstraint("team_id", "user_id", name="uq_team_member"),)
+    __table_args__ = (
+        # Also serves lookups by team_id alone, so team_id has no index of its own.
+        UniqueConstraint("team_id", "user_id", name="uq_team_member"),
+        # "Teams for a user": the join keys come from this index alone.
+        Index("ix_team_memberships_user_id_team_id", "user_id", "team_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     team_id: Mapped[int] = mapped_column(
-        ForeignKey("teams.id", ondelete="CASCADE"), index=True, nullable=False
+        ForeignKey("teams.id", ondelete="CASCADE"), nullable=False
     )
     user_id: Mapped[int] = mapped_column(
-        ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     role: Mapped[str] = mapped_column(String(32), default="member")
     status: Mapped[str] = mapped_column(String(32), default="active")
@@ -57,12 +72,10 @@ class TeamMembership(Base):
         ForeignKey("users.id", ondelete="SET NULL"), nullable=True
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(UTC)
+        DateTime(timezone=True), server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
-        default=lambda: datetime.now(UTC),
-        onupdate=lambda: datetime.now(UTC),
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
     team: Mapped["Team"] = relationship("Team", back_populates="memberships")
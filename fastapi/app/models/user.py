@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from datetime import datetime, UTC
+from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Integer, String
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -21,10 +21,17 @@ class User(Base):
     is_email_verified: Mapped[bool] = mapped_column(Boolean, default=False)
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(UTC)
+        DateTime(timezone=True), server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
-        default=lambda: datetime.now(UTC),
-        onupdate=lambda: datetime.now(UTC),
-    )
\ No newline at end of file
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    @classmethod
+    def email_matches(cls, email: str):
+        """``email`` ignoring case, in a form ``ix_users_email_lower`` can serve."""
+        return func.lower(cls.email) == func.lower(email)
+
+
+# Case-insensitive lookups and sign-up conflicts go through this index.
+Index("ix_users_email_lower", func.lower(User.email), unique=True)
@@ -1,7 +1,22 @@
 from __future__ import annotations
 
+from .backends import (
+    InMemoryBackend,
+    NotificationBackend,
+    RedisBackend,
+    UnixSocketBackend,
+    get_notification_backend,
+)
 from .manager import NotificationManager
 
-notifier = NotificationManager()
+notifier = NotificationManager(backend=get_notification_backend())
 
-__all__ = ["notifier", "NotificationManager"]
+__all__ = [
+    "notifier",
+    "InMemoryBackend",
+    "NotificationBackend",
+    "NotificationManager",
+    "RedisBackend",
+    "UnixSocketBackend",
+    "get_notification_backend",
+]
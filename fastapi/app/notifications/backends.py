@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable
+
+from app.core.config import settings
+
+from .encoding import encode_frame
+
+logger = logging.getLogger(__name__)
+
+Envelope = dict[str, Any]
+Deliver = Callable[[Envelope], Awaitable[None]]
+
+
+class NotificationBackend(ABC):
+    """Carries notification envelopes between worker processes.
+
+    Every worker subscribes once via ``start`` and receives every published
+    envelope, then fans it out to the websockets it holds locally.
+    """
+
+    @abstractmethod
+    async def start(self, deliver: Deliver) -> None: ...
+
+    @abstractmethod
+    async def publish(self, envelope: Envelope) -> None: ...
+
+    async def stop(self) -> None:
+        return None
+
+
+class _Backoff:
+    """Exponential delay between reconnect attempts, reset on success."""
+
+    def __init__(self, initial: float, maximum: float) -> None:
+        self._initial = initial
+        self._maximum = maximum
+        self.delay = initial
+
+    def reset(self) -> None:
+        self.delay = self._initial
+
+    async def wait(self) -> None:
+        await asyncio.sleep(self.delay)
+        self.delay = min(self.delay * 2, self._maximum)
+
+
+class InMemoryBackend(NotificationBackend):
+    """Single-process backend; publishing delivers straight to local sockets."""
+
+    def __init__(self) -> None:
+        self._deliver: Deliver | None = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def publish(self, envelope: Envelope) -> None:
+        if self._deliver is not None:
+            await self._deliver(envelope)
+
+
+class UnixSocketBroker:
+    """Relays newline-delimited envelopes to every connected worker."""
+
+    READY = b"READY\n"
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._server: asyncio.AbstractServer | None = None
+        self._peers: set[asyncio.StreamWriter] = set()
+        self._handlers: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self._path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self._path)
+
+    async def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        for peer in list(self._peers):
+            peer.close()
+        for handler in list(self._handlers):
+            handler.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self._path)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        self._peers.add(writer)
+        try:
+            # Tell the worker it is registered before it starts publishing.
+            writer.write(self.READY)
+            await writer.drain()
+            while line := await reader.readline():
+                peers = list(self._peers)
+                for peer in peers:
+                    peer.write(line)
+                await asyncio.gather(
+                    *(peer.drain() for peer in peers), return_exceptions=True
+                )
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # Handlers are leaf tasks; ending quietly keeps asyncio's stream
+            # server from logging the cancellation as an error on shutdown.
+            pass
+        finally:
+            self._peers.discard(writer)
+            self._handlers.discard(handler)
+            writer.close()
+
+
+class UnixSocketBackend(NotificationBackend):
+    """Fans out between workers on one host through a Unix-socket broker.
+
+    The first worker to take the lock file hosts the broker; the others
+    connect to it. If the hosting worker exits its lock is released and a
+    surviving worker takes over when it reconnects. Delivery is best-effort:
+    envelopes published while the broker is being replaced may be lost.
+    The listener keeps reconnecting, with backoff, for the life of the
+    process.
+    """
+
+    def __init__(
+        self,
+        *,
+        path: str,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+    ) -> None:
+        self._path = path
+        self._reconnect_delay = reconnect_delay
+        self._max_reconnect_delay = max_reconnect_delay
+        self._deliver: Deliver | None = None
+        self._broker: UnixSocketBroker | None = None
+        self._lock_fd: int | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._listener: asyncio.Task | None = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+        reader = await self._connect()
+        self._listener = asyncio.create_task(self._listen(reader))
+
+    async def publish(self, envelope: Envelope) -> None:
+        if self._writer is None:
+            if self._deliver is not None:
+                await self._deliver(envelope)
+            return
+        self._writer.write(encode_frame(envelope).encode("utf-8") + b"\n")
+        await self._writer.drain()
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._broker is not None:
+            await self._broker.stop()
+            self._broker = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def _try_lock(self) -> bool:
+        import fcntl
+
+        if self._lock_fd is not None:
+            return True
+        fd = os.open(f"{self._path}.lock", os.O_CREAT | os.O_RDWR, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    async def _connect(self, attempts: int = 20) -> asyncio.StreamReader:
+        for _ in range(attempts):
+            if self._broker is None and self._try_lock():
+                self._broker = UnixSocketBroker(self._path)
+                await self._broker.start()
+            try:
+                reader, writer = await asyncio.open_unix_connection(self._path)
+            except (FileNotFoundError, ConnectionRefusedError):
+                await asyncio.sleep(self._reconnect_delay)
+                continue
+            try:
+                ready = await asyncio.wait_for(reader.readline(), timeout=5)
+            except (asyncio.TimeoutError, ConnectionError):
+                ready = b""
+            if ready == UnixSocketBroker.READY:
+                self._writer = writer
+                return reader
+            writer.close()
+            await asyncio.sleep(self._reconnect_delay)
+        raise RuntimeError(f"Could not reach notification broker at {self._path}")
+
+    async def _listen(self, reader: asyncio.StreamReader | None) -> None:
+        backoff = _Backoff(self._reconnect_delay, self._max_reconnect_delay)
+        while True:
+            try:
+                if reader is None:
+                    reader = await self._connect()
+                    backoff.reset()
+                line = await reader.readline()
+            except (OSError, RuntimeError) as exc:
+                logger.warning(
+                    "Notification broker unreachable (%s); retrying in %.1fs.",
+                    exc,
+                    backoff.delay,
+                )
+                self._drop_writer()
+                reader = None
+                await backoff.wait()
+                continue
+            if not line:
+                logger.warning("Notification broker connection lost; reconnecting.")
+                self._drop_writer()
+                reader = None
+                continue
+            await _safe_deliver(self._deliver, line)
+
+    def _drop_writer(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class RedisBackend(NotificationBackend):
+    """Fans out across hosts through Redis (or any server speaking its pub/sub).
+
+    If the subscription drops, the listener resubscribes with backoff;
+    envelopes published in between are lost.
+    """
+
+    def __init__(
+        self,
+        *,
+        url: str | None,
+        channel: str,
+        client: Any = None,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+    ) -> None:
+        if client is None:
+            try:
+                from redis import asyncio as redis_asyncio
+            except ImportError as exc:  # pragma: no cover - optional dependency
+                raise RuntimeError(
+                    "NOTIFICATIONS_BACKEND=redis requires the 'redis' package."
+                ) from exc
+            client = redis_asyncio.from_url(url)
+        self._client = client
+        self._channel = channel
+        self._reconnect_delay = reconnect_delay
+        self._max_reconnect_delay = max_reconnect_delay
+        self._pubsub: Any = None
+        self._listener: asyncio.Task | None = None
+
+    async def start(self, deliver: Deliver) -> None:
+        await self._subscribe()
+        self._listener = asyncio.create_task(self._listen(deliver))
+
+    async def publish(self, envelope: Envelope) -> None:
+        await self._client.publish(self._channel, encode_frame(envelope))
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(self._channel)
+            await self._pubsub.aclose()
+            self._pubsub = None
+
+    async def _subscribe(self) -> None:
+        self._pubsub = self._client.pubsub()
+        await self._pubsub.subscribe(self._channel)
+
+    async def _listen(self, deliver: Deliver) -> None:
+        backoff = _Backoff(self._reconnect_delay, self._max_reconnect_delay)
+        while True:
+            try:
+                if self._pubsub is None:
+                    await self._subscribe()
+                    backoff.reset()
+                async for message in self._pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    await _safe_deliver(deliver, message["data"])
+                raise ConnectionError("subscription ended")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001 - client errors vary by version
+                logger.warning(
+                    "Notification subscription lost (%s); resubscribing in %.1fs.",
+                    exc,
+                    backoff.delay,
+                )
+                pubsub, self._pubsub = self._pubsub, None
+                if pubsub is not None:
+                    with contextlib.suppress(Exception):
+                        await pubsub.aclose()
+                await backoff.wait()
+
+
+async def _safe_deliver(deliver: Deliver | None, frame: str | bytes) -> None:
+    """Decode and deliver one received frame; errors never stop the listener."""
+    if deliver is None:
+        return
+    try:
+        envelope = json.loads(frame)
+    except ValueError:
+        logger.warning("Dropping malformed notification frame: %.200r", frame)
+        return
+    try:
+        await deliver(envelope)
+    except Exception:  # noqa: BLE001
+        logger.exception("Failed to deliver notification envelope locally.")
+
+
+def get_notification_backend() -> NotificationBackend:
+    backend = (settings.notifications_backend or "memory").lower()
+    if backend == "unix":
+        return UnixSocketBackend(path=settings.notifications_socket_path)
+    if backend == "redis":
+        return RedisBackend(
+            url=settings.redis_url, channel=settings.notifications_channel
+        )
+    return InMemoryBackend()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import json
+from datetime import date, time
+from typing import Any, Callable
+from uuid import UUID
+
+Encoder = Callable[[Any], str]
+
+
+def _default(value: Any) -> Any:
+    """Encode the types orjson and msgspec support natively, as they do."""
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_json_encode: Encoder = json.JSONEncoder(
+    separators=(",", ":"), ensure_ascii=False, default=_default
+).encode
+
+
+def _load_encoder() -> tuple[str, Encoder]:
+    """Pick the fastest JSON encoder available; orjson and msgspec are optional.
+
+    Every encoder accepts the same payloads: non-string dict keys become strings
+    and datetimes, dates and times become ISO 8601 strings.
+    """
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        option = orjson.OPT_NON_STR_KEYS
+        return "orjson", lambda payload: orjson.dumps(payload, option=option).decode()
+    try:
+        import msgspec
+    except ImportError:
+        pass
+    else:
+        encode = msgspec.json.Encoder().encode
+        return "msgspec", lambda payload: encode(payload).decode("utf-8")
+    return "json", _json_encode
+
+
+ENCODER_NAME, encode_frame = _load_encoder()
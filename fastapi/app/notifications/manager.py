@@ -1,72 +1,154 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import logging
 from collections import defaultdict
-from typing import Any, DefaultDict, Set
+from concurrent.futures import Future
+from typing import Any, DefaultDict
 
 from fastapi import WebSocket
-from starlette.websockets import WebSocketDisconnect
+
+from app.core.config import settings
+from app.core.metrics import track
+
+from .backends import Envelope, InMemoryBackend, NotificationBackend
+from .encoding import encode_frame
+from .outbound import OutboundConnection, SlowConsumerPolicy, coalesce_key
+
+logger = logging.getLogger(__name__)
 
 
 class NotificationManager:
-    """Manages websocket connections for in-app notifications."""
+    """Manages websocket connections for in-app notifications.
+
+    Notifications are published through a backend so that every worker
+    process receives them; each worker only writes to the sockets it holds.
+    Payloads are encoded once at publish time and the same text frame is
+    handed to every recipient's writer, so delivery runs concurrently and
+    one slow client cannot hold up the rest.
+    """
 
-    def __init__(self) -> None:
-        self._connections: DefaultDict[int, Set[WebSocket]] = defaultdict(set)
+    def __init__(
+        self,
+        backend: NotificationBackend | None = None,
+        *,
+        max_pending: int | None = None,
+        send_timeout: float | None = None,
+        slow_consumer_policy: SlowConsumerPolicy | None = None,
+    ) -> None:
+        self._connections: DefaultDict[int, dict[WebSocket, OutboundConnection]] = (
+            defaultdict(dict)
+        )
         self._loop: asyncio.AbstractEventLoop | None = None
+        self._backend = backend or InMemoryBackend()
+        self._started = False
+        self._max_pending = max_pending or settings.notifications_max_pending
+        self._send_timeout = send_timeout or settings.notifications_send_timeout_seconds
+        self._policy = (
+            slow_consumer_policy or settings.notifications_slow_consumer_policy
+        )
+        self.publish_failures = 0
+
+    async def start(self) -> None:
+        """Subscribe this worker to the backend; call once at startup."""
+        if self._started:
+            return
+        self._loop = asyncio.get_running_loop()
+        await self._backend.start(self._deliver)
+        self._started = True
+
+    async def stop(self) -> None:
+        for user_id, connections in list(self._connections.items()):
+            for websocket in list(connections):
+                self.disconnect(user_id, websocket)
+        if not self._started:
+            return
+        await self._backend.stop()
+        self._started = False
 
     async def connect(self, user_id: int, websocket: WebSocket) -> None:
         await websocket.accept()
         if self._loop is None:
             self._loop = asyncio.get_running_loop()
-        self._connections[user_id].add(websocket)
+        self._connections[user_id][websocket] = OutboundConnection(
+            websocket,
+            max_pending=self._max_pending,
+            send_timeout=self._send_timeout,
+            policy=self._policy,
+            on_close=lambda: self.disconnect(user_id, websocket),
+        )
 
     def disconnect(self, user_id: int, websocket: WebSocket) -> None:
         connections = self._connections.get(user_id)
         if not connections:
             return
-        connections.discard(websocket)
+        connection = connections.pop(websocket, None)
+        if connection is not None:
+            connection.cancel()
         if not connections:
             self._connections.pop(user_id, None)
 
     def send_user_notification(self, *, user_id: int, payload: dict[str, Any]) -> None:
+        with track("notifications"):
+            self._publish(
+                {
+                    "user_id": user_id,
+                    "frame": encode_frame(payload),
+                    "key": coalesce_key(payload),
+                }
+            )
+
+    def broadcast(self, payload: dict[str, Any]) -> None:
+        with track("notifications"):
+            self._publish(
+                {
+                    "user_id": None,
+                    "frame": encode_frame(payload),
+                    "key": coalesce_key(payload),
+                }
+            )
+
+    def _publish(self, envelope: Envelope) -> None:
         if self._loop is None:
             return
-        asyncio.run_coroutine_threadsafe(
-            self._send_user_notification(user_id=user_id, payload=payload), self._loop
-        )
+        if self._started:
+            coroutine = self._backend.publish(envelope)
+        else:
+            coroutine = self._deliver(envelope)
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        future.add_done_callback(self._check_published)
 
-    async def _send_user_notification(
-        self, *, user_id: int, payload: dict[str, Any]
-    ) -> None:
-        if not self._connections.get(user_id):
+    def _check_published(self, future: Future) -> None:
+        # Runs on the loop thread, so the counter needs no lock.
+        if future.cancelled() or future.exception() is None:
             return
+        self.publish_failures += 1
+        logger.error("Failed to publish notification.", exc_info=future.exception())
 
-        message = json.dumps(payload)
-        # Copy to avoid mutation while iterating.
-        sockets = list(self._connections[user_id])
-        for websocket in sockets:
-            try:
-                await websocket.send_text(message)
-            except WebSocketDisconnect:
-                self.disconnect(user_id, websocket)
-            except RuntimeError:
-                # Websocket is likely closed; remove it.
-                self.disconnect(user_id, websocket)
+    async def _deliver(self, envelope: Envelope) -> None:
+        user_id = envelope.get("user_id")
+        frame = envelope.get("frame")
+        key = envelope.get("key")
+        if frame is None:
+            # Envelope published by a worker that predates pre-encoded frames.
+            payload = envelope.get("payload", {})
+            frame, key = encode_frame(payload), coalesce_key(payload)
+        if user_id is None:
+            self._broadcast(frame, key)
+        else:
+            self._send_user_notification(user_id=int(user_id), frame=frame, key=key)
 
-    def broadcast(self, payload: dict[str, Any]) -> None:
-        if self._loop is None:
+    def _send_user_notification(
+        self, *, user_id: int, frame: str, key: str | None = None
+    ) -> None:
+        connections = self._connections.get(user_id)
+        if not connections:
             return
-        asyncio.run_coroutine_threadsafe(self._broadcast(payload), self._loop)
-
-    async def _broadcast(self, payload: dict[str, Any]) -> None:
-        message = json.dumps(payload)
-        for user_id, sockets in list(self._connections.items()):
-            for websocket in list(sockets):
-                try:
-                    await websocket.send_text(message)
-                except WebSocketDisconnect:
-                    self.disconnect(user_id, websocket)
-                except RuntimeError:
-                    self.disconnect(user_id, websocket)
+        # Copy to avoid mutation while iterating.
+        for connection in list(connections.values()):
+            connection.offer(frame, key)
+
+    def _broadcast(self, frame: str, key: str | None = None) -> None:
+        for connections in list(self._connections.values()):
+            for connection in list(connections.values()):
+                connection.offer(frame, key)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Callable, Literal
+
+from fastapi import WebSocket
+from starlette.websockets import WebSocketDisconnect
+
+logger = logging.getLogger(__name__)
+
+SlowConsumerPolicy = Literal["drop_oldest", "coalesce", "disconnect"]
+
+# "Try again later": the server shed this client because it could not keep up.
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+def coalesce_key(payload: dict[str, Any]) -> str | None:
+    """Key under which a newer notification supersedes an older pending one.
+
+    Notifications for the same ``event`` and ``team_id`` describe the same
+    state, so only the latest is worth sending; payloads without an
+    ``event`` are never coalesced.
+    """
+    event = payload.get("event")
+    if event is None:
+        return None
+    return f"{event}:{payload.get('team_id')}"
+
+
+class OutboundConnection:
+    """Buffers frames for one websocket and writes them from its own task.
+
+    Fan-out only appends to this buffer, so a slow client never delays
+    delivery to anyone else. When the buffer is full the slow-consumer
+    policy applies: ``drop_oldest`` discards the oldest pending frame,
+    ``coalesce`` replaces the pending frame with the same coalesce key (see
+    :func:`coalesce_key`) and otherwise discards the oldest one, and
+    ``disconnect`` closes the socket. Both dropping policies lose
+    notifications and count them in ``dropped``. A send that exceeds
+    ``send_timeout`` always closes the socket.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        *,
+        max_pending: int,
+        send_timeout: float,
+        policy: SlowConsumerPolicy,
+        on_close: Callable[[], None],
+    ) -> None:
+        self.websocket = websocket
+        self.dropped = 0
+        self._max_pending = max_pending
+        self._send_timeout = send_timeout
+        self._policy = policy
+        self._on_close = on_close
+        self._pending: deque[tuple[str | None, str]] = deque()
+        self._ready = asyncio.Event()
+        self._closed = False
+        self._closer: asyncio.Task | None = None
+        self._writer = asyncio.create_task(self._run())
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def offer(self, message: str, key: str | None = None) -> None:
+        if self._closed:
+            return
+        if len(self._pending) >= self._max_pending:
+            if self._policy == "disconnect":
+                self._shed("send buffer full")
+                return
+            self.dropped += 1
+            if not (self._policy == "coalesce" and self._supersede(key)):
+                self._pending.popleft()
+        self._pending.append((key, message))
+        self._ready.set()
+
+    def _supersede(self, key: str | None) -> bool:
+        """Remove the pending frame ``key`` replaces; ``False`` if there is none."""
+        if key is None:
+            return False
+        for index, (pending_key, _) in enumerate(self._pending):
+            if pending_key == key:
+                del self._pending[index]
+                return True
+        return False
+
+    def cancel(self) -> None:
+        self._closed = True
+        self._pending.clear()
+        # wait_for() can swallow a cancellation that races a completed send,
+        # so also wake the writer and let it observe ``_closed`` itself.
+        self._ready.set()
+        self._writer.cancel()
+
+    async def _run(self) -> None:
+        while not self._closed:
+            await self._ready.wait()
+            self._ready.clear()
+            while self._pending and not self._closed:
+                _, message = self._pending.popleft()
+                try:
+                    await asyncio.wait_for(
+                        self.websocket.send_text(message), self._send_timeout
+                    )
+                except asyncio.TimeoutError:
+                    self._shed("send timed out")
+                    return
+                except (WebSocketDisconnect, RuntimeError):
+                    self._close()
+                    return
+
+    def _shed(self, reason: str) -> None:
+        logger.info("Disconnecting slow notification consumer: %s", reason)
+        self._close()
+        self._closer = asyncio.create_task(self._close_socket())
+
+    def _close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._pending.clear()
+        self._on_close()
+
+    async def _close_socket(self) -> None:
+        try:
+            await self.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+        except Exception:  # noqa: BLE001
+            pass
@@ -1,5 +1,6 @@
 from .auth import router as auth_router
 from .team import router as team_router
+from .metrics import router as metrics_router
 from .notifications import router as notifications_router
 
-__all__ = ["auth_router", "team_router", "notifications_router"]
+__all__ = ["auth_router", "team_router", "notifications_router", "metrics_router"]
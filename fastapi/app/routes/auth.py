@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from app.core.dependency import get_auth_user, get_db
+from collections.abc import AsyncIterator
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.cache import Principal, PrincipalCache, get_principal_cache
+from app.core.database import ReadSessionLocal, insert_or_conflict
+from app.core.dependency import get_auth_principal, get_auth_user, get_db, get_read_db
+from app.core.serialization import encode, trusted_response
 from app.models import User
 from app.notifications import notifier
 from app.schemas import (
@@ -19,6 +26,8 @@ from app.schemas import (
     UserCreate,
     UserDetail,
     UserLogin,
+    UserPage,
+    UserSummary,
     UserUpdate,
 )
 from app.services import EmailService, UserService, get_email_service, get_user_service
@@ -39,28 +48,99 @@ async def _get_user(
     if user_id is not None:
         stmt = stmt.where(User.id == user_id)
     if email is not None:
-        stmt = stmt.where(User.email == email)
+        stmt = stmt.where(User.email_matches(email))
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
 
-async def _get_users(db: AsyncSession) -> list[User]:
-    stmt = select(User)
+def _user_columns(fields: str | None) -> list:
+    if not fields:
+        return [getattr(User, name) for name in UserSummary.model_fields]
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(UserSummary.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown user fields: {', '.join(sorted(unknown))}",
+        )
+    # The id is always selected because it doubles as the pagination cursor.
+    return [
+        getattr(User, name)
+        for name in UserSummary.model_fields
+        if name == "id" or name in requested
+    ]
+
+
+async def _get_users_page(
+    db: AsyncSession,
+    *,
+    columns: list,
+    cursor: int | None,
+    limit: int,
+) -> tuple[list[dict], int | None]:
+    """Fetch one keyset page ordered by id, plus the cursor for the next one."""
+    stmt = select(*columns).order_by(User.id).limit(limit + 1)
+    if cursor is not None:
+        stmt = stmt.where(User.id > cursor)
     result = await db.execute(stmt)
-    return list(result.scalars().all())
+    rows = [dict(row) for row in result.mappings()]
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1]["id"]
+    return rows, None
 
 
-@router.get("/", response_model=list[UserDetail])
+async def _stream_users_ndjson(
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    columns: list,
+    cursor: int | None,
+    batch_size: int,
+) -> AsyncIterator[str]:
+    # The export owns its session so it outlives the request-scoped one, and
+    # walks the table in keyset batches so only one batch is held at a time.
+    async with session_factory() as db:
+        while True:
+            rows, cursor = await _get_users_page(
+                db, columns=columns, cursor=cursor, limit=batch_size
+            )
+            for row in rows:
+                yield encode(UserSummary, row, exclude_unset=True) + b"\n"
+            if cursor is None:
+                return
+
+
+@router.get("/", response_model=UserPage, response_model_exclude_unset=True)
 async def list_users(
-    current_user: User = Depends(get_auth_user),
-    db: AsyncSession = Depends(get_db),
-) -> list[User]:
+    current_user: Principal = Depends(get_auth_principal),
+    db: AsyncSession = Depends(get_read_db),
+    cursor: int | None = Query(default=None, ge=0),
+    limit: int = Query(default=50, ge=1, le=500),
+    fields: str | None = Query(default=None),
+    output: Literal["json", "ndjson"] = Query(default="json", alias="format"),
+):
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only administrators can list all users.",
         )
-    return await _get_users(db)
+
+    columns = _user_columns(fields)
+    if output == "ndjson":
+        return StreamingResponse(
+            _stream_users_ndjson(
+                ReadSessionLocal, columns=columns, cursor=cursor, batch_size=limit
+            ),
+            media_type="application/x-ndjson",
+        )
+
+    rows, next_cursor = await _get_users_page(
+        db, columns=columns, cursor=cursor, limit=limit
+    )
+    return trusted_response(
+        UserPage, {"items": rows, "next_cursor": next_cursor}, exclude_unset=True
+    )
 
 
 @router.post("/register", response_model=UserAuth, status_code=status.HTTP_201_CREATED)
@@ -70,27 +150,32 @@ async def register(
     user_service: UserService = Depends(get_user_service),
     email_service: EmailService = Depends(get_email_service),
 ):
-    existing = await _get_user(db, email=data.email)
-    if existing:
+    new_user = await insert_or_conflict(
+        db,
+        User,
+        {
+            "email": data.email,
+            "password": await user_service.hash_password_async(data.password),
+            "first_name": data.first_name,
+            "last_name": data.last_name or "",
+        },
+        conflict_on=[func.lower(User.email)],
+    )
+    if new_user is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
-
-    new_user = User(
-        email=data.email,
-        password=user_service.hash_password(data.password),
-        first_name=data.first_name,
-        last_name=data.last_name or "",
-    )
-    db.add(new_user)
     await db.commit()
-    await db.refresh(new_user)
 
     verification_token = user_service.create_email_verification_token(new_user.id)
     email_service.send_verification_email(new_user.email, verification_token)
 
     tokens = user_service.create_tokens(new_user.id)
-    return {"user": new_user, "token": tokens}
+    return trusted_response(
+        UserAuth,
+        {"user": new_user, "token": tokens},
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
 @router.post("/login", response_model=UserAuth)
@@ -100,7 +185,7 @@ async def login(
     user_service: UserService = Depends(get_user_service),
 ):
     user = await _get_user(db, email=credentials.email)
-    if not user or not user_service.verify_password(
+    if not user or not await user_service.verify_password_async(
         credentials.password, user.password
     ):
         raise HTTPException(
@@ -115,7 +200,7 @@ async def login(
         )
 
     tokens = user_service.create_tokens(user.id)
-    return {"user": user, "token": tokens}
+    return trusted_response(UserAuth, {"user": user, "token": tokens})
 
 
 @router.post("/refresh", response_model=Token)
@@ -137,16 +222,16 @@ async def refresh_token(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
         )
 
-    return user_service.create_tokens(user.id)
+    return trusted_response(Token, user_service.create_tokens(user.id))
 
 
 @router.get("/me", response_model=UserDetail)
-def read_user_me(current_user: User = Depends(get_auth_user)):
+def read_user_me(current_user: Principal = Depends(get_auth_principal)):
     if current_user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication required"
         )
-    return current_user
+    return trusted_response(UserDetail, current_user)
 
 
 @router.patch("/me", response_model=UserDetail)
@@ -154,14 +239,15 @@ async def update_user_me(
     payload: UserUpdate,
     current_user: User = Depends(get_auth_user),
     db: AsyncSession = Depends(get_db),
-) -> User:
+    principal_cache: PrincipalCache = Depends(get_principal_cache),
+) -> JSONResponse:
     if payload.first_name is not None:
         current_user.first_name = payload.first_name
     if payload.last_name is not None:
         current_user.last_name = payload.last_name
 
     await db.commit()
-    await db.refresh(current_user)
+    await principal_cache.invalidate(current_user.id)
 
     notifier.send_user_notification(
         user_id=current_user.id,
@@ -172,7 +258,7 @@ async def update_user_me(
             "last_name": current_user.last_name,
         },
     )
-    return current_user
+    return trusted_response(UserDetail, current_user)
 
 
 @router.post("/verify-email", response_model=Message)
@@ -180,6 +266,7 @@ async def verify_email(
     request: EmailVerificationRequest,
     db: AsyncSession = Depends(get_db),
     user_service: UserService = Depends(get_user_service),
+    principal_cache: PrincipalCache = Depends(get_principal_cache),
 ):
     user_id = user_service.parse_email_verification_token(request.token)
     user = await _get_user(db, user_id=user_id)
@@ -192,7 +279,7 @@ async def verify_email(
 
     user.is_email_verified = True
     await db.commit()
-    await db.refresh(user)
+    await principal_cache.invalidate(user.id)
 
     notifier.send_user_notification(
         user_id=user.id,
@@ -249,6 +336,7 @@ async def reset_password(
     request: PasswordResetConfirm,
     db: AsyncSession = Depends(get_db),
     user_service: UserService = Depends(get_user_service),
+    principal_cache: PrincipalCache = Depends(get_principal_cache),
 ):
     user_id = user_service.parse_password_reset_token(request.token)
     user = await _get_user(db, user_id=user_id)
@@ -257,7 +345,7 @@ async def reset_password(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
-    user.password = user_service.hash_password(request.password)
+    user.password = await user_service.hash_password_async(request.password)
     await db.commit()
-    await db.refresh(user)
+    await principal_cache.invalidate(user.id)
     return Message(message="Password updated successfully.")
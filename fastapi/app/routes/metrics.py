@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.core import database
+from app.core.metrics import Samples, render_metrics
+from app.notifications import notifier
+from app.services import HashExecutor, get_hash_executor
+
+router = APIRouter()
+
+# Stats that only grow within a process; the rest are point-in-time gauges.
+_POOL_COUNTERS = {"checkouts", "checkout_wait_seconds_total", "disconnects"}
+_HASH_COUNTERS = {"submitted", "rejected", "completed", "queue_wait_seconds_total"}
+
+
+def _collect(
+    prefix: str, subject: str, counters: set[str], samples: dict[str, list]
+) -> tuple[Samples, Samples]:
+    """Split ``samples`` into gauges and ``_total``-suffixed counters."""
+    gauges: Samples = []
+    totals: Samples = []
+    for stat, values in samples.items():
+        documentation = f"{subject} {stat.replace('_', ' ')}."
+        if stat in counters:
+            name = f"{prefix}_{stat.removesuffix('_total')}_total"
+            totals.append((name, documentation, values))
+        else:
+            gauges.append((f"{prefix}_{stat}", documentation, values))
+    return gauges, totals
+
+
+def _pool_metrics() -> tuple[Samples, Samples]:
+    engines = {"primary": database.engine, "replica": database.read_engine}
+    samples: dict[str, list] = {}
+    for name, engine in engines.items():
+        if engine is None:
+            continue
+        for stat, value in database.pool_metrics(engine).items():
+            samples.setdefault(stat, []).append(({"engine": name}, value))
+    return _collect("db_pool", "Connection pool", _POOL_COUNTERS, samples)
+
+
+def _hash_metrics(executor: HashExecutor) -> tuple[Samples, Samples]:
+    samples = {stat: [({}, value)] for stat, value in asdict(executor.metrics).items()}
+    gauges, totals = _collect(
+        "password_hash", "Password hashing", _HASH_COUNTERS, samples
+    )
+    pending = [({}, executor.pending)]
+    gauges.insert(
+        0,
+        ("password_hash_pending", "Password hashing jobs queued or running.", pending),
+    )
+    return gauges, totals
+
+
+def _notification_counters() -> Samples:
+    return [
+        (
+            "notifications_publish_failures_total",
+            "Notifications that could not be handed to the backend.",
+            [({}, notifier.publish_failures)],
+        )
+    ]
+
+
+@router.get("", include_in_schema=False)
+def read_metrics(
+    hash_executor: HashExecutor = Depends(get_hash_executor),
+) -> PlainTextResponse:
+    pool_gauges, pool_counters = _pool_metrics()
+    hash_gauges, hash_counters = _hash_metrics(hash_executor)
+    return PlainTextResponse(
+        render_metrics(
+            gauges=[*pool_gauges, *hash_gauges],
+            counters=[*pool_counters, *hash_counters, *_notification_counters()],
+        ),
+        media_type="text/plain; version=0.0.4",
+    )
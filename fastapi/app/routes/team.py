@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+from collections import defaultdict
+from collections.abc import Sequence
+
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi.responses import JSONResponse
+from sqlalchemy import Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependency import get_auth_user, get_db
+from app.core.cache import Principal
+from app.core.database import insert_or_conflict
+from app.core.dependency import get_auth_principal, get_db, get_read_db
+from app.core.serialization import trusted_response
 from app.models import Team, TeamMembership, User
 from app.notifications import notifier
 from app.schemas import (
@@ -14,99 +21,77 @@ from app.schemas import (
     TeamMemberDetail,
     TeamMemberUpdate,
 )
+from app.services import TeamService, get_team_service
 
 router = APIRouter()
 
 
-async def _get_team(db: AsyncSession, team_id: int) -> Team | None:
-    result = await db.execute(select(Team).where(Team.id == team_id))
-    return result.scalar_one_or_none()
-
-
-async def _get_team_membership(
-    db: AsyncSession, team_id: int, user_id: int
-) -> TeamMembership | None:
-    stmt = select(TeamMembership).where(
-        TeamMembership.team_id == team_id,
-        TeamMembership.user_id == user_id,
-    )
-    result = await db.execute(stmt)
-    return result.scalar_one_or_none()
-
-
-async def _get_user_by_email(db: AsyncSession, email: str) -> User | None:
-    result = await db.execute(select(User).where(User.email == email))
-    return result.scalar_one_or_none()
-
+def _member_detail(membership: TeamMembership, user: User | Principal) -> dict:
+    """Source for a ``TeamMemberDetail``; see ``trusted_response``."""
+    return {
+        "user_id": user.id,
+        "email": user.email,
+        "role": membership.role,
+        "status": membership.status,
+        "invited_by_id": membership.invited_by_id,
+        "joined_at": membership.created_at,
+    }
+
+
+async def _serialize_teams(db: AsyncSession, teams: Sequence[Team]) -> list[dict]:
+    """Sources for ``TeamDetail`` responses, members included."""
+    members_by_team = await _fetch_members_by_team(db, [team.id for team in teams])
+    return [
+        {
+            "id": team.id,
+            "name": team.name,
+            "owner_id": team.owner_id,
+            "created_at": team.created_at,
+            "updated_at": team.updated_at,
+            "members": members_by_team.get(team.id, []),
+        }
+        for team in teams
+    ]
+
+
+async def _fetch_members_by_team(
+    db: AsyncSession, team_ids: Sequence[int]
+) -> dict[int, list[dict]]:
+    """Load members for every team in one query, grouped by team id."""
+    if not team_ids:
+        return {}
 
-async def _get_user_by_id(db: AsyncSession, user_id: int) -> User | None:
-    result = await db.execute(select(User).where(User.id == user_id))
-    return result.scalar_one_or_none()
-
-
-async def _serialize_team(
-    db: AsyncSession, team: Team
-) -> TeamDetail:
-    members = await _fetch_team_members(db, team.id)
-    return TeamDetail(
-        id=team.id,
-        name=team.name,
-        owner_id=team.owner_id,
-        created_at=team.created_at,
-        updated_at=team.updated_at,
-        members=members,
-    )
-
-
-async def _fetch_team_members(
-    db: AsyncSession, team_id: int
-) -> list[TeamMemberDetail]:
     stmt = (
         select(TeamMembership, User)
         .join(User, TeamMembership.user_id == User.id)
-        .where(TeamMembership.team_id == team_id)
+        .where(TeamMembership.team_id.in_(team_ids))
+        .order_by(TeamMembership.team_id, TeamMembership.id)
     )
     result = await db.execute(stmt)
-    members: list[TeamMemberDetail] = []
+    members: dict[int, list[dict]] = defaultdict(list)
     for membership, user in result.all():
-        members.append(
-            TeamMemberDetail(
-                user_id=user.id,
-                email=user.email,
-                role=membership.role,
-                status=membership.status,
-                invited_by_id=membership.invited_by_id,
-                joined_at=membership.created_at,
-            )
-        )
+        members[membership.team_id].append(_member_detail(membership, user))
     return members
 
 
-def _ensure_can_manage(team_membership: TeamMembership | None) -> None:
-    if not team_membership or team_membership.role not in {"owner", "admin"}:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have permission to manage this team.",
-        )
-
-
 @router.post("", response_model=TeamDetail, status_code=status.HTTP_201_CREATED)
 async def create_team(
     payload: TeamCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_auth_user),
-) -> TeamDetail:
-    result = await db.execute(select(Team).where(Team.name == payload.name))
-    if result.scalar_one_or_none():
+    current_user: Principal = Depends(get_auth_principal),
+) -> JSONResponse:
+    team = await insert_or_conflict(
+        db,
+        Team,
+        {"name": payload.name, "owner_id": current_user.id},
+        conflict_on=[func.lower(Team.name)],
+    )
+    if team is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="A team with that name already exists.",
         )
 
-    team = Team(name=payload.name, owner_id=current_user.id)
-    db.add(team)
-    await db.flush()
-
     membership = TeamMembership(
         team_id=team.id,
         user_id=current_user.id,
@@ -116,26 +101,41 @@ async def create_team(
     )
     db.add(membership)
     await db.commit()
-    await db.refresh(team)
 
-    return await _serialize_team(db, team)
+    # The owner is the only member, so the response needs no members query.
+    return trusted_response(
+        TeamDetail,
+        {
+            "id": team.id,
+            "name": team.name,
+            "owner_id": team.owner_id,
+            "created_at": team.created_at,
+            "updated_at": team.updated_at,
+            "members": [_member_detail(membership, current_user)],
+        },
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
-@router.get("", response_model=list[TeamDetail])
-async def list_teams(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_auth_user),
-) -> list[TeamDetail]:
-    stmt = (
+def _teams_for_user(user_id: int) -> Select:
+    """Teams ``user_id`` belongs to, oldest first."""
+    return (
         select(Team)
         .join(TeamMembership, TeamMembership.team_id == Team.id)
-        .where(TeamMembership.user_id == current_user.id)
+        .where(TeamMembership.user_id == user_id)
         .order_by(Team.created_at)
     )
-    result = await db.execute(stmt)
+
+
+@router.get("", response_model=list[TeamDetail])
+async def list_teams(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_auth_principal),
+) -> JSONResponse:
+    result = await db.execute(_teams_for_user(current_user.id))
     teams = result.scalars().unique().all()
 
-    return [await _serialize_team(db, team) for team in teams]
+    return trusted_response(TeamDetail, await _serialize_teams(db, teams), many=True)
 
 
 @router.post(
@@ -147,60 +147,30 @@ async def invite_member(
     team_id: int,
     payload: TeamInviteRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_auth_user),
-) -> TeamMemberDetail:
-    team = await _get_team(db, team_id)
-    if not team:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found.")
-
-    current_membership = await _get_team_membership(db, team_id, current_user.id)
-    _ensure_can_manage(current_membership)
-
-    target_user = await _get_user_by_email(db, payload.email)
-    if not target_user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Invited user not found.",
-        )
-
-    existing_membership = await _get_team_membership(db, team_id, target_user.id)
-    if existing_membership:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User is already part of the team.",
-        )
-
-    membership = TeamMembership(
+    current_user: Principal = Depends(get_auth_principal),
+    team_service: TeamService = Depends(get_team_service),
+) -> JSONResponse:
+    member = await team_service.invite_member(
+        db,
         team_id=team_id,
-        user_id=target_user.id,
+        actor_id=current_user.id,
+        email=payload.email,
         role=payload.role,
-        status="active",
-        invited_by_id=current_user.id,
-    )
-    db.add(membership)
-    await db.commit()
-    await db.refresh(membership)
-
-    member_detail = TeamMemberDetail(
-        user_id=target_user.id,
-        email=target_user.email,
-        role=membership.role,
-        status=membership.status,
-        invited_by_id=membership.invited_by_id,
-        joined_at=membership.created_at,
     )
 
     notifier.send_user_notification(
-        user_id=target_user.id,
+        user_id=member.user_id,
         payload={
             "event": "team_invitation",
-            "team_id": team.id,
-            "team_name": team.name,
-            "role": membership.role,
+            "team_id": member.team_id,
+            "team_name": member.team_name,
+            "role": member.role,
         },
     )
 
-    return member_detail
+    return trusted_response(
+        TeamMemberDetail, member, status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.patch(
@@ -212,54 +182,27 @@ async def update_member(
     member_id: int,
     payload: TeamMemberUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_auth_user),
-) -> TeamMemberDetail:
-    team = await _get_team(db, team_id)
-    if not team:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found.")
-
-    actor_membership = await _get_team_membership(db, team_id, current_user.id)
-    _ensure_can_manage(actor_membership)
-
-    membership = await _get_team_membership(db, team_id, member_id)
-    if not membership:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Member not found in this team.",
-        )
-
-    if payload.role:
-        membership.role = payload.role
-    if payload.status:
-        membership.status = payload.status
-
-    await db.commit()
-    await db.refresh(membership)
-
-    member_user = await _get_user_by_id(db, member_id)
-    if not member_user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found."
-        )
-
-    detail = TeamMemberDetail(
-        user_id=member_user.id,
-        email=member_user.email,
-        role=membership.role,
-        status=membership.status,
-        invited_by_id=membership.invited_by_id,
-        joined_at=membership.created_at,
+    current_user: Principal = Depends(get_auth_principal),
+    team_service: TeamService = Depends(get_team_service),
+) -> JSONResponse:
+    member = await team_service.update_member(
+        db,
+        team_id=team_id,
+        actor_id=current_user.id,
+        member_id=member_id,
+        role=payload.role,
+        member_status=payload.status,
     )
 
     notifier.send_user_notification(
-        user_id=member_user.id,
+        user_id=member.user_id,
         payload={
             "event": "team_membership_updated",
-            "team_id": team.id,
-            "team_name": team.name,
-            "role": membership.role,
-            "status": membership.status,
+            "team_id": member.team_id,
+            "team_name": member.team_name,
+            "role": member.role,
+            "status": member.status,
         },
     )
 
-    return detail
+    return trusted_response(TeamMemberDetail, member)
@@ -10,6 +10,8 @@ from .user import (
     UserCreate,
     UserLogin,
     UserDetail,
+    UserPage,
+    UserSummary,
     UserUpdate,
 )
 from .team import (
@@ -41,6 +41,26 @@ class UserDetail(UserBase):
         from_attributes = True
 
 
+class UserSummary(BaseModel):
+    """Projection of UserDetail; only the requested fields are populated."""
+
+    id: int
+    email: str | None = None
+    first_name: str | None = None
+    last_name: str | None = None
+    is_active: bool | None = None
+    is_admin: bool | None = None
+    is_email_verified: bool | None = None
+
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
+class UserPage(BaseModel):
+    items: list[UserSummary]
+    next_cursor: int | None = None
+
+
 class Token(BaseModel):
     access: str
     refresh: str
@@ -1,11 +1,21 @@
 from __future__ import annotations
 
 from .email import EmailService, get_email_service
+from .hashing import HashExecutor, get_hash_executor
+from .outbox import EmailOutbox, get_email_outbox
+from .team import MemberChange, TeamService, get_team_service
 from .user import UserService, get_user_service
 
 __all__ = [
+    "EmailOutbox",
     "EmailService",
+    "HashExecutor",
+    "MemberChange",
+    "TeamService",
     "UserService",
+    "get_email_outbox",
     "get_email_service",
+    "get_hash_executor",
+    "get_team_service",
     "get_user_service",
 ]
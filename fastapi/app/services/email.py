@@ -6,13 +6,20 @@ from email.mime.text import MIMEText
 from functools import lru_cache
 from pathlib import Path
 from string import Template
-from typing import Mapping
+from typing import Iterable, Mapping
 
 from app.core.config import settings
+from app.services.outbox import EmailOutbox, OutboundEmail, get_email_outbox
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=64)
+def _load_template(path: Path, mtime_ns: int | None) -> Template:
+    """Read and parse ``path`` once; a new ``mtime_ns`` forces a re-read."""
+    return Template(path.read_text(encoding="utf-8"))
+
+
 class EmailService:
     def __init__(
         self,
@@ -20,13 +27,20 @@ class EmailService:
         template_dir: Path | None = None,
         smtp_backend: type[smtplib.SMTP] = smtplib.SMTP,
         settings_obj=None,
+        outbox: EmailOutbox | None = None,
+        reload_templates: bool | None = None,
     ) -> None:
         self._settings = settings_obj or settings
         self._smtp_backend = smtp_backend
+        self._outbox = outbox
         self._template_dir = (
             template_dir or Path(__file__).resolve().parents[1] / "templates" / "email"
         )
-        self._template_dir.mkdir(parents=True, exist_ok=True)
+        # Outside debug mode templates are parsed once and never re-read;
+        # in debug mode an mtime check picks up edits without a restart.
+        self._reload_templates = (
+            bool(self._settings.debug) if reload_templates is None else reload_templates
+        )
 
     def send_verification_email(self, recipient: str, token: str) -> None:
         link = f"{self._settings.app_url.rstrip('/')}/verify-email?token={token}"
@@ -53,26 +67,50 @@ class EmailService:
         message["From"] = self._settings.from_email or username
         message["To"] = recipient
 
+        # Outside the app lifespan (scripts, tests, other workers) the outbox
+        # is not running, so mail is sent directly instead.
+        if self._outbox is not None and self._outbox.running:
+            self._outbox.enqueue(
+                OutboundEmail(
+                    sender=message["From"],
+                    recipient=recipient,
+                    payload=message.as_string(),
+                )
+            )
+            return
+
         try:
             with self._smtp_backend(
                 self._settings.smtp_server, self._settings.smtp_port
             ) as server:
-                server.starttls()
+                if self._settings.smtp_starttls:
+                    server.starttls()
                 server.login(username, password)
                 server.sendmail(message["From"], [recipient], message.as_string())
         except Exception as exc:  # noqa: BLE001
             logger.exception("Email delivery failed: %s", exc)
 
+    def render_batch(
+        self, template_name: str, contexts: Iterable[Mapping[str, str]]
+    ) -> list[str]:
+        """Render one body per context, e.g. for personalized bulk sends."""
+        template = self._template(template_name)
+        return [template.substitute(context) for context in contexts]
+
     def _render(self, template_name: str, context: Mapping[str, str]) -> str:
+        return self._template(template_name).substitute(context)
+
+    def _template(self, template_name: str) -> Template:
         template_path = self._template_dir / template_name
-        if not template_path.exists():
+        try:
+            mtime = template_path.stat().st_mtime_ns if self._reload_templates else None
+            return _load_template(template_path, mtime)
+        except FileNotFoundError as exc:
             raise FileNotFoundError(
                 f"Template '{template_name}' not found in {self._template_dir}"
-            )
-        template = Template(template_path.read_text(encoding="utf-8"))
-        return template.substitute(context)
+            ) from exc
 
 
 @lru_cache(maxsize=1)
 def get_email_service() -> EmailService:
-    return EmailService()
+    return EmailService(outbox=get_email_outbox())
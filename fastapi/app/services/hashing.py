@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException
+from starlette import status
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class HashExecutorMetrics:
+    submitted: int = 0
+    rejected: int = 0
+    completed: int = 0
+    queue_wait_seconds_total: float = 0.0
+    queue_wait_seconds_max: float = 0.0
+
+    def observe_wait(self, seconds: float) -> None:
+        self.completed += 1
+        self.queue_wait_seconds_total += seconds
+        self.queue_wait_seconds_max = max(self.queue_wait_seconds_max, seconds)
+
+
+class HashExecutor:
+    """Runs CPU-bound password hashing off the event loop with bounded queueing.
+
+    pbkdf2 releases the GIL inside hashlib, so a small thread pool gives real
+    parallelism. Work beyond ``max_pending`` outstanding jobs is rejected with
+    a 503 instead of growing an unbounded backlog during login storms.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int,
+        max_pending: int,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hash"
+        )
+        self._max_pending = max_pending
+        self._pending = 0
+        self._clock = clock
+        self.metrics = HashExecutorMetrics()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        if self._pending >= self._max_pending:
+            self.metrics.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service is busy, please retry shortly.",
+                headers={"Retry-After": "1"},
+            )
+
+        self._pending += 1
+        self.metrics.submitted += 1
+        enqueued_at = self._clock()
+
+        def _timed() -> tuple[float, T]:
+            return self._clock() - enqueued_at, func(*args)
+
+        try:
+            loop = asyncio.get_running_loop()
+            waited, result = await loop.run_in_executor(self._executor, _timed)
+        finally:
+            self._pending -= 1
+        self.metrics.observe_wait(waited)
+        return result
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache(maxsize=1)
+def get_hash_executor() -> HashExecutor:
+    return HashExecutor(
+        max_workers=settings.password_hash_workers,
+        max_pending=settings.password_hash_max_pending,
+    )
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import smtplib
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class OutboundEmail:
+    sender: str
+    recipient: str
+    payload: str
+    attempts: int = 0
+    last_error: str | None = None
+
+
+@dataclass(slots=True)
+class OutboxMetrics:
+    enqueued: int = 0
+    delivered: int = 0
+    retried: int = 0
+    dead_lettered: int = 0
+
+
+class _SMTPConnection:
+    """A lazily opened SMTP session that is reused until it fails.
+
+    A reused session the server has closed is reopened once, transparently.
+    """
+
+    def __init__(self, backend: type[smtplib.SMTP], settings_obj) -> None:
+        self._backend = backend
+        self._settings = settings_obj
+        self._server: smtplib.SMTP | None = None
+
+    def send(self, message: OutboundEmail) -> None:
+        if self._server is not None:
+            try:
+                self._deliver(message)
+                return
+            except smtplib.SMTPServerDisconnected:
+                # The server dropped the idle connection; reconnecting is not
+                # a failed attempt.
+                self.close()
+        self._server = self._open()
+        self._deliver(message)
+
+    def _deliver(self, message: OutboundEmail) -> None:
+        assert self._server is not None
+        self._server.sendmail(message.sender, [message.recipient], message.payload)
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:  # noqa: BLE001
+            pass
+        self._server = None
+
+    def _open(self) -> smtplib.SMTP:
+        server = self._backend(self._settings.smtp_server, self._settings.smtp_port)
+        if self._settings.smtp_starttls:
+            server.starttls()
+        server.login(self._settings.smtp_username, self._settings.smtp_password)
+        return server
+
+
+class EmailOutbox:
+    """Queues outgoing mail and delivers it from background workers.
+
+    Each worker owns one persistent SMTP connection. Failed deliveries are
+    retried with exponential backoff and parked in ``dead_letters`` once
+    ``max_attempts`` is exhausted.
+    """
+
+    def __init__(
+        self,
+        *,
+        smtp_backend: type[smtplib.SMTP] = smtplib.SMTP,
+        settings_obj=None,
+        workers: int | None = None,
+        max_size: int | None = None,
+        max_attempts: int | None = None,
+        retry_base_seconds: float | None = None,
+        retry_max_seconds: float | None = None,
+        dead_letter_limit: int = 1000,
+    ) -> None:
+        self._settings = settings_obj or settings
+        self._smtp_backend = smtp_backend
+        self._workers = workers or self._settings.email_outbox_workers
+        self._max_size = max_size or self._settings.email_outbox_max_size
+        self._max_attempts = max_attempts or self._settings.email_max_attempts
+        self._retry_base = retry_base_seconds or self._settings.email_retry_base_seconds
+        self._retry_max = retry_max_seconds or self._settings.email_retry_max_seconds
+        self._queue: asyncio.Queue[OutboundEmail] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._scheduled_retries: set[asyncio.TimerHandle] = set()
+        self.dead_letters: deque[OutboundEmail] = deque(maxlen=dead_letter_limit)
+        self.metrics = OutboxMetrics()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_size)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"email-outbox-{index}")
+            for index in range(self._workers)
+        ]
+
+    async def stop(self, *, timeout: float = 10.0) -> None:
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self.drain(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Email outbox stopped with undelivered messages.")
+        for handle in self._scheduled_retries:
+            handle.cancel()
+        self._scheduled_retries.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def drain(self) -> None:
+        """Wait until the queue is empty and no retries are pending."""
+        assert self._queue is not None
+        while True:
+            await self._queue.join()
+            if not self._scheduled_retries:
+                return
+            await asyncio.sleep(self._retry_base / 2)
+
+    def enqueue(self, message: OutboundEmail) -> None:
+        """Hand a message to the workers; must be called from the event loop."""
+        if self._queue is None:
+            raise RuntimeError("Email outbox has not been started.")
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            message.last_error = "outbox full"
+            self._dead_letter(message)
+            return
+        self.metrics.enqueued += 1
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        connection = _SMTPConnection(self._smtp_backend, self._settings)
+        try:
+            while True:
+                message = await self._queue.get()
+                try:
+                    await asyncio.to_thread(connection.send, message)
+                except Exception as exc:  # noqa: BLE001
+                    connection.close()
+                    self._handle_failure(message, exc)
+                else:
+                    self.metrics.delivered += 1
+                finally:
+                    self._queue.task_done()
+        finally:
+            connection.close()
+
+    def _handle_failure(self, message: OutboundEmail, exc: Exception) -> None:
+        message.attempts += 1
+        message.last_error = repr(exc)
+        if message.attempts >= self._max_attempts:
+            self._dead_letter(message)
+            return
+
+        delay = min(self._retry_base * 2 ** (message.attempts - 1), self._retry_max)
+        logger.warning(
+            "Email delivery to %s failed (attempt %s), retrying in %.1fs: %s",
+            message.recipient,
+            message.attempts,
+            delay,
+            exc,
+        )
+        self.metrics.retried += 1
+        loop = asyncio.get_running_loop()
+        handle: asyncio.TimerHandle | None = None
+
+        def _requeue() -> None:
+            self._scheduled_retries.discard(handle)
+            assert self._queue is not None
+            try:
+                self._queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._dead_letter(message)
+
+        handle = loop.call_later(delay, _requeue)
+        self._scheduled_retries.add(handle)
+
+    def _dead_letter(self, message: OutboundEmail) -> None:
+        self.metrics.dead_lettered += 1
+        self.dead_letters.append(message)
+        logger.error(
+            "Email to %s moved to dead-letter store after %s attempts: %s",
+            message.recipient,
+            message.attempts,
+            message.last_error,
+        )
+
+
+@lru_cache(maxsize=1)
+def get_email_outbox() -> EmailOutbox:
+    return EmailOutbox()
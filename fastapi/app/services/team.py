@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import Select, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from app.core.database import insert_or_conflict
+from app.models import Team, TeamMembership, User
+
+MANAGER_ROLES = frozenset({"owner", "admin"})
+
+
+@dataclass(slots=True)
+class MemberChange:
+    """A membership row as written, plus what the response and notification need."""
+
+    team_id: int
+    team_name: str
+    user_id: int
+    email: str
+    role: str
+    status: str
+    invited_by_id: int | None
+    joined_at: datetime
+
+
+def _returning_member(statement):
+    return statement.returning(
+        TeamMembership.role,
+        TeamMembership.status,
+        TeamMembership.invited_by_id,
+        TeamMembership.created_at,
+    )
+
+
+class TeamService:
+    """Team membership writes issued as a resolve query plus one RETURNING write.
+
+    The resolve query loads the team, the actor's role and the target user in
+    a single round-trip, which is enough to report the same errors as the
+    step-by-step lookups did. The write then reports a duplicate or missing
+    membership itself, via ``ON CONFLICT DO NOTHING`` or an UPDATE that
+    matches no row, and returns the columns the response needs.
+    """
+
+    @staticmethod
+    def _resolve_statement(team_id: int, actor_id: int, target_clause) -> Select:
+        actor = (
+            select(TeamMembership.role)
+            .where(
+                TeamMembership.team_id == team_id, TeamMembership.user_id == actor_id
+            )
+            .cte("actor")
+        )
+        target = select(User.id, User.email).where(target_clause).cte("target")
+        return (
+            select(Team.name, actor.c.role, target.c.id, target.c.email)
+            .select_from(Team)
+            .outerjoin(actor, true())
+            .outerjoin(target, true())
+            .where(Team.id == team_id)
+        )
+
+    async def _resolve(
+        self, db: AsyncSession, team_id: int, actor_id: int, target_clause
+    ) -> tuple[str, int | None, str | None]:
+        row = (
+            await db.execute(self._resolve_statement(team_id, actor_id, target_clause))
+        ).first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Team not found."
+            )
+        team_name, actor_role, target_id, target_email = row
+        if actor_role not in MANAGER_ROLES:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You do not have permission to manage this team.",
+            )
+        return team_name, target_id, target_email
+
+    async def invite_member(
+        self,
+        db: AsyncSession,
+        *,
+        team_id: int,
+        actor_id: int,
+        email: str,
+        role: str,
+    ) -> MemberChange:
+        """Add the user with ``email`` to the team; two statements on success."""
+        team_name, user_id, user_email = await self._resolve(
+            db, team_id, actor_id, User.email_matches(email)
+        )
+        if user_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Invited user not found.",
+            )
+
+        membership = await insert_or_conflict(
+            db,
+            TeamMembership,
+            {
+                "team_id": team_id,
+                "user_id": user_id,
+                "role": role,
+                "status": "active",
+                "invited_by_id": actor_id,
+            },
+            conflict_on=["team_id", "user_id"],
+        )
+        if membership is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="User is already part of the team.",
+            )
+        await db.commit()
+        return MemberChange(
+            team_id,
+            team_name,
+            user_id,
+            user_email,
+            membership.role,
+            membership.status,
+            membership.invited_by_id,
+            membership.created_at,
+        )
+
+    async def update_member(
+        self,
+        db: AsyncSession,
+        *,
+        team_id: int,
+        actor_id: int,
+        member_id: int,
+        role: str | None = None,
+        member_status: str | None = None,
+    ) -> MemberChange:
+        """Change a member's role and/or status; two statements on success."""
+        team_name, user_id, user_email = await self._resolve(
+            db, team_id, actor_id, User.id == member_id
+        )
+
+        values: dict[str, Any] = {}
+        if role:
+            values["role"] = role
+        if member_status:
+            values["status"] = member_status
+        if not values:
+            # Nothing to change: still fetch the row, without bumping updated_at.
+            values["updated_at"] = TeamMembership.updated_at
+
+        statement = (
+            update(TeamMembership)
+            .where(
+                TeamMembership.team_id == team_id, TeamMembership.user_id == member_id
+            )
+            .values(**values)
+        )
+        row = (await db.execute(_returning_member(statement))).first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Member not found in this team.",
+            )
+        await db.commit()
+        return MemberChange(team_id, team_name, user_id, user_email, *row)
+
+
+@lru_cache(maxsize=1)
+def get_team_service() -> TeamService:
+    return TeamService()
@@ -8,6 +8,8 @@ from jose import ExpiredSignatureError, JWTError, jwt
 from starlette import status
 
 from app.core.config import pwd_context, settings
+from app.core.metrics import track
+from app.services.hashing import HashExecutor, get_hash_executor
 
 
 class UserService:
@@ -18,10 +20,12 @@ class UserService:
         *,
         secret_key: str | None = None,
         algorithm: str | None = None,
+        hash_executor: HashExecutor | None = None,
     ) -> None:
         self._secret_key = secret_key or settings.secret_key
         self._algorithm = algorithm or settings.algorithm
         self._pwd_context = pwd_context
+        self._hash_executor = hash_executor or get_hash_executor()
 
     def hash_password(self, password: str) -> str:
         return self._pwd_context.hash(password)
@@ -29,6 +33,18 @@ class UserService:
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         return self._pwd_context.verify(plain_password, hashed_password)
 
+    async def hash_password_async(self, password: str) -> str:
+        with track("password_hash"):
+            return await self._hash_executor.run(self.hash_password, password)
+
+    async def verify_password_async(
+        self, plain_password: str, hashed_password: str
+    ) -> bool:
+        with track("password_hash"):
+            return await self._hash_executor.run(
+                self.verify_password, plain_password, hashed_password
+            )
+
     def create_tokens(self, user_id: int) -> dict[str, str]:
         access_expire = timedelta(
             minutes=self._as_int(settings.access_token_expire_minutes, default=30)
@@ -90,9 +106,7 @@ class UserService:
 
     def create_password_reset_token(self, user_id: int) -> str:
         expires = timedelta(
-            minutes=self._as_int(
-                settings.password_reset_expiration_minutes, default=30
-            )
+            minutes=self._as_int(settings.password_reset_expiration_minutes, default=30)
         )
         return self._encode_token(
             subject=str(user_id),
@@ -126,7 +140,8 @@ class UserService:
         }
         if extra:
             payload.update(extra)
-        return jwt.encode(payload, self._secret_key, algorithm=self._algorithm)
+        with track("jwt"):
+            return jwt.encode(payload, self._secret_key, algorithm=self._algorithm)
 
     def _decode_token(
         self,
@@ -139,11 +154,12 @@ class UserService:
         expired_detail: str = "Token expired",
     ) -> dict[str, str]:
         try:
-            payload = jwt.decode(
-                token,
-                self._secret_key,
-                algorithms=[self._algorithm],
-            )
+            with track("jwt"):
+                payload = jwt.decode(
+                    token,
+                    self._secret_key,
+                    algorithms=[self._algorithm],
+                )
         except ExpiredSignatureError as exc:
             raise HTTPException(
                 status_code=expired_status,
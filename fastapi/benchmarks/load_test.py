@@ -0,0 +1,245 @@
+"""Throughput and latency of the auth, team and websocket endpoints under load.
+
+Runs each scenario against a running server for ``--duration`` seconds at a
+fixed ``--concurrency`` and reports requests per second and p50/p95/p99
+latency. Log in as users created by ``benchmarks.seed``. Results are printed as
+JSON lines and written to ``--output``. Pass ``--baseline`` with an earlier
+result file to print the change for each scenario.
+
+    python -m benchmarks.seed --users 1000000 --teams 100000
+    uvicorn main:app --workers 4
+    python -m benchmarks.load_test --concurrency 64 --duration 30 \\
+        --baseline benchmarks/results/before.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import httpx
+from websockets.asyncio.client import connect
+
+PASSWORD = "loadtest-password"
+EMAIL_TEMPLATE = "loadtest-{}@example.com"
+BACKEND = "fastapi"
+ROUTES = {
+    "login": "/api/v1/user/login",
+    "refresh": "/api/v1/user/refresh",
+    "me": "/api/v1/user/me",
+    "teams": "/api/v1/teams",
+    "websocket": "/ws/notifications",
+}
+SCENARIOS = ("login", "refresh", "me", "teams", "websocket")
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+@dataclass(slots=True)
+class Session:
+    access: str
+    refresh: str
+
+
+@dataclass(slots=True)
+class Samples:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, elapsed: float) -> dict:
+        summary = {
+            "requests": len(self.latencies) + self.errors,
+            "errors": self.errors,
+            "rps": round(len(self.latencies) / elapsed, 1),
+        }
+        if len(self.latencies) < 2:
+            return {**summary, "p50_ms": None, "p95_ms": None, "p99_ms": None}
+        cuts = statistics.quantiles(self.latencies, n=100, method="inclusive")
+        return {
+            **summary,
+            "p50_ms": round(cuts[49] * 1000, 2),
+            "p95_ms": round(cuts[94] * 1000, 2),
+            "p99_ms": round(cuts[98] * 1000, 2),
+        }
+
+
+def _email(users: int) -> str:
+    return EMAIL_TEMPLATE.format(random.randint(1, users))
+
+
+def _tokens(body: dict) -> Session:
+    token = body.get("token", body)
+    return Session(access=token["access"], refresh=token["refresh"])
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, ws_url: str, users: int) -> None:
+        self.client = client
+        self.ws_url = ws_url
+        self.users = users
+
+    async def _post(self, path: str, payload: dict) -> dict:
+        response = await self.client.post(path, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    async def _get(self, path: str, session: Session) -> None:
+        response = await self.client.get(
+            path, headers={"Authorization": f"Bearer {session.access}"}
+        )
+        response.raise_for_status()
+
+    async def log_in(self, number: int) -> Session:
+        body = await self._post(
+            ROUTES["login"],
+            {"email": EMAIL_TEMPLATE.format(number), "password": PASSWORD},
+        )
+        return _tokens(body)
+
+    async def login(self, session: Session) -> None:
+        await self._post(
+            ROUTES["login"], {"email": _email(self.users), "password": PASSWORD}
+        )
+
+    async def refresh(self, session: Session) -> None:
+        # Refresh tokens may be single-use (rotation), so each worker keeps
+        # following its own chain.
+        fresh = _tokens(
+            await self._post(ROUTES["refresh"], {"refresh": session.refresh})
+        )
+        session.refresh = fresh.refresh
+
+    async def me(self, session: Session) -> None:
+        await self._get(ROUTES["me"], session)
+
+    async def teams(self, session: Session) -> None:
+        await self._get(ROUTES["teams"], session)
+
+    async def websocket(self, session: Session) -> None:
+        async with connect(
+            f"{self.ws_url}{ROUTES['websocket']}?token={session.access}",
+            open_timeout=30,
+        ):
+            pass
+
+
+async def _run(
+    operation: Callable[[Session], Awaitable[None]],
+    sessions: list[Session],
+    duration: float,
+) -> dict:
+    samples = Samples()
+    deadline = time.perf_counter() + duration
+
+    async def worker(session: Session) -> None:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                await operation(session)
+            except Exception:  # noqa: BLE001 - any failure counts as an error
+                samples.errors += 1
+            else:
+                samples.latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(session) for session in sessions))
+    return samples.summary(time.perf_counter() - started)
+
+
+async def load_test(args: argparse.Namespace) -> dict:
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    ws_url = args.base_url.replace("http", "ws", 1)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=30
+    ) as client:
+        harness = LoadTest(client, ws_url, args.users)
+        sessions = list(
+            await asyncio.gather(
+                *(harness.log_in(number) for number in range(1, args.concurrency + 1))
+            )
+        )
+        results = {}
+        for name in args.scenarios:
+            operation = getattr(harness, name)
+            await _run(operation, sessions, args.warmup)
+            results[name] = await _run(operation, sessions, args.duration)
+            print(json.dumps({"scenario": name, **results[name]}))
+    return {
+        "backend": BACKEND,
+        "base_url": args.base_url,
+        "started_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "concurrency": args.concurrency,
+        "duration_seconds": args.duration,
+        "seeded_users": args.users,
+        "python": platform.python_version(),
+        "scenarios": results,
+    }
+
+
+def compare(current: dict, baseline: dict) -> list[dict]:
+    """Relative change per scenario; higher ``rps`` and lower latency are better."""
+    changes = []
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        change = {"scenario": name}
+        for metric in ("rps", "p50_ms", "p95_ms", "p99_ms"):
+            if before.get(metric) and result.get(metric) is not None:
+                change[f"{metric}_change_pct"] = round(
+                    (result[metric] / before[metric] - 1) * 100, 1
+                )
+        changes.append(change)
+    return changes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument(
+        "--duration", type=float, default=30.0, help="seconds per scenario"
+    )
+    parser.add_argument(
+        "--warmup",
+        type=float,
+        default=3.0,
+        help="unrecorded seconds before each scenario",
+    )
+    parser.add_argument(
+        "--users",
+        type=int,
+        default=1_000_000,
+        help="number of seeded users to log in as",
+    )
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    args = parser.parse_args()
+
+    result = asyncio.run(load_test(args))
+    output = (
+        args.output or RESULTS_DIR / f"{BACKEND}-{datetime.now(UTC):%Y%m%dT%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2) + "\n")
+    print(json.dumps({"output": str(output)}))
+    if args.baseline:
+        for change in compare(result, json.loads(args.baseline.read_text())):
+            print(json.dumps(change))
+
+
+if __name__ == "__main__":
+    main()
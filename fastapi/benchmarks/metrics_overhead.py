@@ -0,0 +1,87 @@
+"""Per-request cost of the metrics middleware, and of ``track`` when disabled.
+
+Requests are driven straight through the ASGI interface of a one-route app
+that opens a JWT span, so the numbers isolate the instrumentation itself.
+
+    python -m benchmarks.metrics_overhead --requests 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+import timeit
+
+from fastapi import FastAPI
+
+from app.core.metrics import MetricsMiddleware, track
+
+
+def _app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int) -> dict:
+        with track("jwt"):
+            pass
+        return {"id": item_id}
+
+    return app
+
+
+async def _drive(app: FastAPI, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/items/1",
+        "raw_path": b"/items/1",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        return None
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+
+    noop_ns = timeit.timeit(lambda: track("db").__enter__(), number=1_000_000) * 1000
+    print(json.dumps({"disabled_track_ns_per_call": round(noop_ns, 1)}))
+    for name, instrumented in (("disabled", False), ("enabled", True)):
+        app = _app(instrumented)
+        asyncio.run(_drive(app, 1_000))  # warm-up
+        elapsed = asyncio.run(_drive(app, args.requests))
+        print(
+            json.dumps(
+                {
+                    "metrics": name,
+                    "requests": args.requests,
+                    "us_per_request": round(elapsed / args.requests * 1e6, 2),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
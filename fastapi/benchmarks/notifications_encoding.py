@@ -0,0 +1,59 @@
+"""CPU spent serializing one broadcast, per recipient vs once at publish.
+
+python -m benchmarks.notifications_encoding --recipients 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from app.notifications.encoding import ENCODER_NAME, encode_frame
+
+PAYLOAD = {
+    "event": "team_invitation",
+    "team": {"id": 42, "name": "Platform"},
+    "role": "member",
+    "invited_by": {"id": 7, "email": "owner@example.com", "first_name": "Ada"},
+}
+
+
+def _per_recipient(recipients: int) -> None:
+    for _ in range(recipients):
+        json.dumps(PAYLOAD)
+
+
+def _once(recipients: int) -> None:  # noqa: ARG001
+    # Every writer is handed the same frame; nothing else is serialized.
+    encode_frame(PAYLOAD)
+
+
+def _cpu_ms(func, recipients: int, rounds: int) -> float:
+    started = time.process_time()
+    for _ in range(rounds):
+        func(recipients)
+    return (time.process_time() - started) * 1000 / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recipients", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    before = _cpu_ms(_per_recipient, args.recipients, args.rounds)
+    after = _cpu_ms(_once, args.recipients, args.rounds)
+    print(
+        json.dumps(
+            {
+                "recipients": args.recipients,
+                "encoder": ENCODER_NAME,
+                "per_recipient_cpu_ms": round(before, 3),
+                "encode_once_cpu_ms": round(after, 3),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
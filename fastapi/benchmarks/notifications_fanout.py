@@ -0,0 +1,128 @@
+"""Broadcast latency with many websockets, a few of them slow.
+
+Compares the per-connection writers used by ``NotificationManager`` with the
+previous behaviour of awaiting every ``send_text`` in turn.
+
+    python -m benchmarks.notifications_fanout --sockets 10000 --slow 50
+
+Slow sockets that fall ``--max-pending`` frames behind lose notifications under
+``drop_oldest`` and ``coalesce``; the frames dropped are reported with the
+latencies.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from app.notifications import InMemoryBackend, NotificationManager
+
+
+class TimedWebSocket:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.received_at: float | None = None
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, message: str) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        else:
+            await asyncio.sleep(0)
+        if self.received_at is None:
+            self.received_at = time.perf_counter()
+
+    async def close(self, code: int = 1000) -> None:
+        pass
+
+
+def _sockets(total: int, slow: int, delay: float) -> list[TimedWebSocket]:
+    step = max(total // max(slow, 1), 1)
+    return [
+        TimedWebSocket(
+            delay if slow and index % step == 0 and index // step < slow else 0
+        )
+        for index in range(total)
+    ]
+
+
+def _report(
+    name: str, started: float, sockets: list[TimedWebSocket], dropped: int = 0
+) -> dict:
+    fast = sorted(
+        (socket.received_at - started) * 1000
+        for socket in sockets
+        if not socket.delay and socket.received_at is not None
+    )
+    quantiles = statistics.quantiles(fast, n=100)
+    return {
+        "mode": name,
+        "fast_sockets": len(fast),
+        "p50_ms": round(quantiles[49], 2),
+        "p99_ms": round(quantiles[98], 2),
+        "max_ms": round(fast[-1], 2),
+        "dropped_frames": dropped,
+    }
+
+
+async def _sequential(args: argparse.Namespace) -> dict:
+    sockets = _sockets(args.sockets, args.slow, args.delay)
+    message = json.dumps({"event": "benchmark"})
+    started = time.perf_counter()
+    for socket in sockets:
+        await socket.send_text(message)
+    return _report("sequential", started, sockets)
+
+
+async def _writers(args: argparse.Namespace) -> dict:
+    manager = NotificationManager(
+        backend=InMemoryBackend(),
+        max_pending=args.max_pending,
+        send_timeout=args.delay * 2,
+        slow_consumer_policy=args.policy,
+    )
+    sockets = _sockets(args.sockets, args.slow, args.delay)
+    for index, socket in enumerate(sockets):
+        await manager.connect(index, socket)
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    manager._broadcast(json.dumps({"event": "benchmark"}))
+    while any(not socket.delay and socket.received_at is None for socket in sockets):
+        await asyncio.sleep(0.001)
+    dropped = sum(
+        connection.dropped
+        for connections in manager._connections.values()
+        for connection in connections.values()
+    )
+    name = f"per-connection writers ({args.policy})"
+    result = _report(name, started, sockets, dropped)
+    await manager.stop()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sockets", type=int, default=10_000)
+    parser.add_argument("--slow", type=int, default=50)
+    parser.add_argument(
+        "--delay", type=float, default=0.05, help="seconds per slow send"
+    )
+    parser.add_argument("--max-pending", type=int, default=100)
+    parser.add_argument(
+        "--policy",
+        choices=("drop_oldest", "coalesce", "disconnect"),
+        default="drop_oldest",
+        help="slow-consumer policy; the first two drop frames for slow sockets",
+    )
+    args = parser.parse_args()
+    for mode in (_sequential, _writers):
+        print(json.dumps(asyncio.run(mode(args))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Seed the configured database with load-test volumes of users and teams.
+
+Users are verified, share one password and are named ``loadtest-<n>@example.com``
+so ``benchmarks.load_test`` can log in as any of them. Team ``n`` is owned by
+user ``n`` and gets ``--members-per-team`` other members drawn at random, so
+the first users all own a team. Rows go in through batched Core inserts; the
+password is hashed once.
+
+    python -m benchmarks.seed --users 1000000 --teams 100000 --members-per-team 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import UTC, datetime
+from typing import Iterator
+
+from sqlalchemy import func, insert, select
+
+from app import models  # noqa: F401
+from app.core.database import Base, engine
+from app.models import Team, TeamMembership, User
+from app.services import UserService
+from benchmarks.load_test import EMAIL_TEMPLATE, PASSWORD
+
+
+def _batches(rows: Iterator[dict], size: int) -> Iterator[list[dict]]:
+    batch: list[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _insert(
+    connection, table, rows: Iterator[dict], batch_size: int
+) -> list[int]:
+    ids: list[int] = []
+    for batch in _batches(rows, batch_size):
+        result = await connection.execute(insert(table).returning(table.id), batch)
+        ids.extend(result.scalars())
+    return ids
+
+
+async def seed(
+    users: int, teams: int, members_per_team: int, batch_size: int, seed: int
+) -> dict:
+    if teams > users:
+        raise SystemExit("--teams cannot exceed --users: team n is owned by user n")
+    rng = random.Random(seed)
+    now = datetime.now(UTC)
+    password = UserService().hash_password(PASSWORD)
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        existing = await connection.scalar(
+            select(func.count())
+            .select_from(User)
+            .where(User.email.like(EMAIL_TEMPLATE.format("%")))
+        )
+        if existing:
+            raise SystemExit(
+                f"{existing} load-test users already exist; seed an empty database"
+            )
+
+    started = time.perf_counter()
+    async with engine.begin() as connection:
+        user_ids = await _insert(
+            connection,
+            User,
+            (
+                {
+                    "email": EMAIL_TEMPLATE.format(n),
+                    "password": password,
+                    "first_name": "Load",
+                    "last_name": f"Test {n}",
+                    "is_active": True,
+                    "is_admin": False,
+                    "is_email_verified": True,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for n in range(1, users + 1)
+            ),
+            batch_size,
+        )
+        team_ids = await _insert(
+            connection,
+            Team,
+            (
+                {
+                    "name": f"loadtest-team-{n}",
+                    "owner_id": user_ids[n - 1],
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for n in range(1, teams + 1)
+            ),
+            batch_size,
+        )
+
+        def memberships() -> Iterator[dict]:
+            for index, team_id in enumerate(team_ids):
+                owner_id = user_ids[index]
+                yield {
+                    "team_id": team_id,
+                    "user_id": owner_id,
+                    "role": "owner",
+                    "status": "active",
+                    "invited_by_id": None,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                members: set[int] = set()
+                while len(members) < min(members_per_team, users - 1):
+                    candidate = user_ids[rng.randrange(users)]
+                    if candidate != owner_id:
+                        members.add(candidate)
+                for user_id in members:
+                    yield {
+                        "team_id": team_id,
+                        "user_id": user_id,
+                        "role": "member",
+                        "status": "active",
+                        "invited_by_id": owner_id,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+
+        membership_count = len(
+            await _insert(connection, TeamMembership, memberships(), batch_size)
+        )
+
+    return {
+        "users": len(user_ids),
+        "teams": len(team_ids),
+        "memberships": membership_count,
+        "seconds": round(time.perf_counter() - started, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--teams", type=int, default=100_000)
+    parser.add_argument("--members-per-team", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument(
+        "--seed", type=int, default=0, help="random seed for membership sampling"
+    )
+    args = parser.parse_args()
+
+    summary = asyncio.run(
+        seed(args.users, args.teams, args.members_per_team, args.batch_size, args.seed)
+    )
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Cost of serializing large list responses, validated versus trusted output.
+
+Two one-route apps return the same team listing, built from ORM-like rows:
+one lets FastAPI validate the rows into ``list[TeamDetail]`` (``EmailStr``
+checks included) and encode them with the stdlib ``json`` module, as the
+routes did before; the other uses ``trusted_response``. Requests are driven
+straight through the ASGI interface, so only serialization differs.
+
+    python -m benchmarks.serialization --teams 500 --members 20 --requests 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+
+from app.core.serialization import trusted_response
+from app.schemas import TeamDetail
+
+
+def _teams(teams: int, members: int) -> list[dict]:
+    now = datetime.now(UTC)
+    return [
+        {
+            "id": team_id,
+            "name": f"team-{team_id}",
+            "owner_id": 1,
+            "created_at": now,
+            "updated_at": now,
+            "members": [
+                SimpleNamespace(
+                    user_id=user_id,
+                    email=f"user-{user_id}@example.com",
+                    role="member",
+                    status="active",
+                    invited_by_id=1,
+                    joined_at=now,
+                )
+                for user_id in range(members)
+            ],
+        }
+        for team_id in range(teams)
+    ]
+
+
+def _app(rows: list[dict], trusted: bool) -> FastAPI:
+    app = FastAPI()
+
+    if trusted:
+
+        @app.get("/teams", response_model=list[TeamDetail])
+        async def list_trusted():
+            return trusted_response(TeamDetail, rows, many=True)
+
+    else:
+
+        @app.get("/teams", response_model=list[TeamDetail])
+        async def list_validated():
+            return rows
+
+    return app
+
+
+async def _drive(app: FastAPI, requests: int) -> tuple[float, int]:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/teams",
+        "raw_path": b"/teams",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+    body_size = 0
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        nonlocal body_size
+        if message["type"] == "http.response.body":
+            body_size = len(message["body"])
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return time.perf_counter() - started, body_size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--teams", type=int, default=500)
+    parser.add_argument("--members", type=int, default=20, help="members per team")
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = _teams(args.teams, args.members)
+    for name, trusted in (("validated", False), ("trusted", True)):
+        app = _app(rows, trusted)
+        asyncio.run(_drive(app, 2))  # warm-up
+        elapsed, body_size = asyncio.run(_drive(app, args.requests))
+        print(
+            json.dumps(
+                {
+                    "output": name,
+                    "teams": args.teams,
+                    "members_per_team": args.members,
+                    "response_bytes": body_size,
+                    "ms_per_response": round(elapsed / args.requests * 1000, 2),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,33 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core import database
 from app.core.config import settings
-from app.routes import auth_router, notifications_router, team_router
+from app.core.metrics import MetricsMiddleware, instrument_engine
+from app.notifications import notifier
+from app.routes import auth_router, metrics_router, notifications_router, team_router
+from app.services import get_email_outbox
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    outbox = get_email_outbox()
+    await outbox.start()
+    await notifier.start()
+    try:
+        yield
+    finally:
+        await notifier.stop()
+        await outbox.stop()
+
 
 app = FastAPI(
     title=settings.project_name,
     version="1.0.0",
     description="Full-featured FastAPI boilerplate with modern SQLAlchemy patterns.",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -22,6 +42,15 @@ app.include_router(auth_router, prefix="/api/v1/user", tags=["user"])
 app.include_router(team_router, prefix="/api/v1/teams", tags=["teams"])
 app.include_router(notifications_router)
 
+# Left out entirely when disabled, so uninstrumented requests pay nothing
+# beyond a context-variable lookup in the tracked helpers.
+if settings.metrics_enabled:
+    for instrumented_engine in (database.engine, database.read_engine):
+        if instrumented_engine is not None:
+            instrument_engine(instrumented_engine)
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router, prefix=settings.metrics_path)
+
 
 if __name__ == "__main__":
     import uvicorn
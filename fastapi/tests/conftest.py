@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Callable, Iterator
+from functools import partial
 import sys
 from pathlib import Path
 import os
 
 import pytest
+import pytest_asyncio
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
@@ -17,6 +20,7 @@ os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
 
 import app.models  # noqa: F401
 from app.core.database import Base
+from app.core.query_budget import QueryBudget
 
 
 @pytest.fixture()
@@ -37,3 +41,27 @@ def db_session() -> Iterator[Session]:
     finally:
         session.close()
         engine.dispose()
+
+
+@pytest_asyncio.fixture()
+async def async_db_session() -> AsyncIterator[AsyncSession]:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    TestingSessionLocal = async_sessionmaker(
+        bind=engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    async with TestingSessionLocal() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture()
+def query_budget(async_db_session: AsyncSession) -> Callable[..., QueryBudget]:
+    """``QueryBudget`` factory that watches the ``async_db_session`` engine."""
+    return partial(QueryBudget, binds=[async_db_session])
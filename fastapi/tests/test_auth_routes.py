@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.cache import NullPrincipalCache, Principal
+from app.models import User
+from app.routes.auth import (
+    _stream_users_ndjson,
+    _user_columns,
+    list_users,
+    register,
+    update_user_me,
+)
+from app.schemas import UserCreate, UserUpdate
+from app.services import UserService
+
+
+async def _seed_users(session, count: int) -> Principal:
+    admin = User(
+        email="admin@example.com", password="x", first_name="Admin", is_admin=True
+    )
+    session.add(admin)
+    session.add_all(
+        User(email=f"user{index}@example.com", password="x", first_name=f"User{index}")
+        for index in range(count - 1)
+    )
+    await session.commit()
+    return Principal.from_user(admin)
+
+
+@pytest.mark.asyncio
+async def test_list_users_walks_keyset_pages(async_db_session) -> None:
+    admin = await _seed_users(async_db_session, 5)
+
+    seen: list[int] = []
+    cursor = None
+    while True:
+        response = await list_users(
+            current_user=admin,
+            db=async_db_session,
+            cursor=cursor,
+            limit=2,
+            fields=None,
+            output="json",
+        )
+        page = json.loads(response.body)
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == sorted(seen)
+    assert len(seen) == 5
+
+
+@pytest.mark.asyncio
+async def test_list_users_projects_requested_fields(async_db_session) -> None:
+    admin = await _seed_users(async_db_session, 2)
+
+    response = await list_users(
+        current_user=admin,
+        db=async_db_session,
+        cursor=None,
+        limit=10,
+        fields="email",
+        output="json",
+    )
+
+    page = json.loads(response.body)
+    assert page["items"][0] == {"id": admin.id, "email": "admin@example.com"}
+
+
+def test_user_columns_rejects_unknown_fields() -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        _user_columns("email,password")
+
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export_streams_every_row(async_db_session) -> None:
+    await _seed_users(async_db_session, 7)
+    session_factory = async_sessionmaker(
+        bind=async_db_session.bind, expire_on_commit=False
+    )
+
+    lines = [
+        line
+        async for line in _stream_users_ndjson(
+            session_factory, columns=_user_columns("email"), cursor=None, batch_size=3
+        )
+    ]
+
+    records = [json.loads(line) for line in lines]
+    assert len(records) == 7
+    assert set(records[0]) == {"id", "email"}
+
+
+@pytest.mark.asyncio
+async def test_insert_fetches_server_timestamps_in_the_same_statement(
+    async_db_session, query_budget
+) -> None:
+    user = User(email="new@example.com", password="x", first_name="New")
+    async_db_session.add(user)
+
+    with query_budget(1) as budget:
+        await async_db_session.commit()
+
+    assert budget.count == 1
+    assert user.id is not None
+    assert user.created_at is not None and user.updated_at is not None
+
+
+@pytest.mark.asyncio
+async def test_update_user_me_is_a_single_statement(
+    async_db_session, query_budget
+) -> None:
+    user = User(email="me@example.com", password="x", first_name="Old")
+    async_db_session.add(user)
+    await async_db_session.commit()
+
+    with query_budget(1) as budget:
+        response = await update_user_me(
+            UserUpdate(first_name="Updated"),
+            current_user=user,
+            db=async_db_session,
+            principal_cache=NullPrincipalCache(),
+        )
+
+    assert budget.count == 1
+    body = json.loads(response.body)
+    assert body["first_name"] == "Updated"
+    assert body["updated_at"] is not None
+
+
+def _register_email_service(sent: list) -> SimpleNamespace:
+    return SimpleNamespace(
+        send_verification_email=lambda email, token: sent.append(email)
+    )
+
+
+@pytest.mark.asyncio
+async def test_register_inserts_in_one_statement(
+    async_db_session, query_budget
+) -> None:
+    sent: list[str] = []
+
+    with query_budget(1) as budget:
+        response = await register(
+            UserCreate(email="new@example.com", password="secret123", first_name="New"),
+            db=async_db_session,
+            user_service=UserService(),
+            email_service=_register_email_service(sent),
+        )
+
+    assert budget.count == 1
+    assert response.status_code == 201
+    body = json.loads(response.body)
+    assert body["user"]["email"] == "new@example.com"
+    assert body["user"]["created_at"] is not None
+    assert sent == ["new@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_register_rejects_taken_email_without_a_lookup(
+    async_db_session, query_budget
+) -> None:
+    async_db_session.add(
+        User(email="taken@example.com", password="x", first_name="Taken")
+    )
+    await async_db_session.commit()
+    sent: list[str] = []
+
+    with query_budget(1), pytest.raises(HTTPException) as excinfo:
+        await register(
+            UserCreate(
+                email="Taken@Example.com", password="secret123", first_name="Again"
+            ),
+            db=async_db_session,
+            user_service=UserService(),
+            email_service=_register_email_service(sent),
+        )
+
+    assert excinfo.value.status_code == 400
+    assert excinfo.value.detail == "Email already registered"
+    assert sent == []
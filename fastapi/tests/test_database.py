@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core import database
+from app.core.config import settings
+from app.core.database import (
+    Base,
+    InstrumentedQueuePool,
+    MemoryRecentWrites,
+    PrimarySession,
+    RedisRecentWrites,
+    RoutingSession,
+    build_engine,
+    engine_options,
+    insert_or_conflict,
+    pool_metrics,
+)
+from app.core.dependency import get_read_db
+from app.models import User
+
+
+def test_in_memory_sqlite_keeps_default_pool() -> None:
+    options = engine_options("sqlite+aiosqlite:///:memory:", settings)
+
+    assert "poolclass" not in options
+    assert "pool_size" not in options
+
+
+def test_pool_settings_are_applied() -> None:
+    config = replace(
+        settings,
+        db_pool_size=3,
+        db_max_overflow=2,
+        db_pool_recycle_seconds=600,
+        db_pool_timeout_seconds=5,
+        db_pool_use_lifo=False,
+        db_pool_liveness="recycle",
+    )
+
+    options = engine_options("postgresql+asyncpg://db/app", config)
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 3
+    assert options["max_overflow"] == 2
+    assert options["pool_recycle"] == 600
+    assert options["pool_timeout"] == 5
+    assert options["pool_use_lifo"] is False
+    assert options["pool_pre_ping"] is False
+
+
+def test_unknown_liveness_strategy_is_rejected() -> None:
+    with pytest.raises(RuntimeError):
+        engine_options(
+            "postgresql+asyncpg://db/app",
+            replace(settings, db_pool_liveness="sometimes"),
+        )
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_track_checkouts_and_in_use(tmp_path) -> None:
+    config = replace(
+        settings, db_pool_size=2, db_max_overflow=0, db_pool_liveness="recycle"
+    )
+    engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", config)
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            assert pool_metrics(engine)["in_use"] == 1
+
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+        metrics = pool_metrics(engine)
+    finally:
+        await engine.dispose()
+
+    assert metrics["in_use"] == 0
+    assert metrics["size"] == 2
+    assert metrics["checkouts"] == 2
+    assert metrics["checkout_wait_seconds_max"] >= 0
+    assert metrics["disconnects"] == 0
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_recent_writes_expire_after_window() -> None:
+    clock = FakeClock()
+    writes = MemoryRecentWrites(5, clock=clock)
+    await writes.mark(1)
+
+    clock.now = 4
+    assert await writes.contains(1)
+    assert not await writes.contains(2)
+    assert not await writes.contains(None)
+
+    clock.now = 6
+    assert not await writes.contains(1)
+
+
+class FakeRedis:
+    """Minimal stand-in for the redis.asyncio key commands."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, tuple[object, int | None]] = {}
+
+    async def set(self, key: str, value: object, px: int | None = None) -> None:
+        self.values[key] = (value, px)
+
+    async def exists(self, key: str) -> int:
+        return int(key in self.values)
+
+
+@pytest.mark.asyncio
+async def test_redis_recent_writes_expire_with_the_window() -> None:
+    client = FakeRedis()
+    writes = RedisRecentWrites(url=None, window_seconds=5, client=client)
+    await writes.mark(1)
+
+    assert client.values == {"recent-write:1": (1, 5000)}
+    assert await writes.contains(1)
+    assert not await writes.contains(2)
+
+
+async def _create_engine_with_user(path, email: str):
+    engine = build_engine(f"sqlite+aiosqlite:///{path}", settings)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(
+            User.__table__.insert().values(email=email, password="x", first_name="Ada")
+        )
+    return engine
+
+
+def _sessionmaker(engine, session_class) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=engine,
+        class_=AsyncSession,
+        sync_session_class=session_class,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_routing_session_reads_replica_until_primary_commits(tmp_path) -> None:
+    primary_engine = await _create_engine_with_user(
+        tmp_path / "primary.db", "primary@example.com"
+    )
+    replica_engine = await _create_engine_with_user(
+        tmp_path / "replica.db", "replica@example.com"
+    )
+    emails = select(User.email).order_by(User.id)
+    try:
+        async with _sessionmaker(primary_engine, PrimarySession)() as primary:
+            async with _sessionmaker(replica_engine, RoutingSession)(
+                info={"primary": primary.sync_session}
+            ) as reader:
+                assert (await reader.scalars(emails)).all() == ["replica@example.com"]
+
+                primary.add(
+                    User(email="new@example.com", password="x", first_name="New")
+                )
+                await primary.commit()
+
+                assert primary.info["wrote"] is True
+                assert (await reader.scalars(emails)).all() == [
+                    "primary@example.com",
+                    "new@example.com",
+                ]
+    finally:
+        await primary_engine.dispose()
+        await replica_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_insert_or_conflict_returns_none_on_conflict(tmp_path) -> None:
+    engine = await _create_engine_with_user(
+        tmp_path / "primary.db", "taken@example.com"
+    )
+    try:
+        async with _sessionmaker(engine, PrimarySession)() as session:
+            values = {"password": "x", "first_name": "Ada"}
+            taken = await insert_or_conflict(
+                session,
+                User,
+                {"email": "taken@example.com", **values},
+                conflict_on=["email"],
+            )
+            created = await insert_or_conflict(
+                session,
+                User,
+                {"email": "new@example.com", **values},
+                conflict_on=["email"],
+            )
+            await session.commit()
+
+            assert taken is None
+            assert created.id is not None and created.created_at is not None
+            assert session.info["wrote"] is True
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_commit_marks_the_acting_user_in_the_shared_store(
+    monkeypatch, tmp_path
+) -> None:
+    engine = await _create_engine_with_user(tmp_path / "primary.db", "a@example.com")
+    writes = RedisRecentWrites(url=None, window_seconds=5, client=FakeRedis())
+    monkeypatch.setattr(database, "read_engine", engine)
+    monkeypatch.setattr(database, "recent_writes", writes)
+    try:
+        async with _sessionmaker(engine, PrimarySession)(
+            info={"user_id": 7}
+        ) as session:
+            session.add(User(email="b@example.com", password="x", first_name="B"))
+            await session.commit()
+
+        assert await writes.contains(7)
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_get_read_db_keeps_recent_writers_on_primary(
+    monkeypatch, async_db_session
+) -> None:
+    monkeypatch.setattr(database, "read_engine", async_db_session.bind)
+    monkeypatch.setattr(database, "recent_writes", MemoryRecentWrites(5))
+    principal = SimpleNamespace(id=7)
+
+    reads = get_read_db(principal, async_db_session)
+    assert isinstance((await reads.__anext__()).sync_session, RoutingSession)
+    await reads.aclose()
+
+    await database.recent_writes.mark(7)
+    reads = get_read_db(principal, async_db_session)
+    assert await reads.__anext__() is async_db_session
+    await reads.aclose()
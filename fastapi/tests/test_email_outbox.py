@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import smtplib
+import socket
+from dataclasses import replace
+
+import pytest
+
+from app.core.config import settings
+from app.services.email import EmailService
+from app.services.outbox import EmailOutbox, OutboundEmail
+
+SMTP_SETTINGS = replace(
+    settings,
+    smtp_server="127.0.0.1",
+    smtp_username="mailer@example.com",
+    smtp_password="supersecret",
+    from_email="Boilerplate <mailer@example.com>",
+    smtp_starttls=False,
+)
+
+
+class FlakySMTP:
+    """Fails the first ``failures`` sends and records every connection."""
+
+    connections = 0
+    failures = 0
+    delivered: list[str] = []
+
+    def __init__(self, host: str, port: int) -> None:
+        FlakySMTP.connections += 1
+
+    @classmethod
+    def reset(cls, *, failures: int = 0) -> None:
+        cls.connections = 0
+        cls.failures = failures
+        cls.delivered = []
+
+    def starttls(self) -> None:
+        pass
+
+    def login(self, username: str, password: str) -> None:
+        pass
+
+    def sendmail(self, sender: str, recipients: list[str], message: str) -> None:
+        if FlakySMTP.failures:
+            FlakySMTP.failures -= 1
+            raise smtplib.SMTPServerDisconnected("connection dropped")
+        FlakySMTP.delivered.extend(recipients)
+
+    def quit(self) -> None:
+        pass
+
+    def __enter__(self) -> "FlakySMTP":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+def _outbox(**overrides) -> EmailOutbox:
+    options = {
+        "smtp_backend": FlakySMTP,
+        "settings_obj": SMTP_SETTINGS,
+        "workers": 1,
+        "max_attempts": 3,
+        "retry_base_seconds": 0.01,
+        "retry_max_seconds": 0.05,
+    }
+    options.update(overrides)
+    return EmailOutbox(**options)
+
+
+@pytest.mark.asyncio
+async def test_outbox_reuses_one_connection_per_worker() -> None:
+    FlakySMTP.reset()
+    outbox = _outbox()
+    await outbox.start()
+    service = EmailService(settings_obj=SMTP_SETTINGS, outbox=outbox)
+
+    for index in range(5):
+        service.send_verification_email(f"user{index}@example.com", "token")
+    await outbox.stop()
+
+    assert len(FlakySMTP.delivered) == 5
+    assert FlakySMTP.connections == 1
+    assert outbox.metrics.delivered == 5
+
+
+@pytest.mark.asyncio
+async def test_outbox_retries_with_fresh_connection() -> None:
+    FlakySMTP.reset(failures=2)
+    outbox = _outbox()
+    await outbox.start()
+
+    outbox.enqueue(
+        OutboundEmail(sender="a@example.com", recipient="b@example.com", payload="hi")
+    )
+    await outbox.stop()
+
+    assert FlakySMTP.delivered == ["b@example.com"]
+    assert FlakySMTP.connections == 3
+    assert outbox.metrics.retried == 2
+    assert not outbox.dead_letters
+
+
+@pytest.mark.asyncio
+async def test_outbox_reopens_dropped_idle_connection_without_a_retry() -> None:
+    FlakySMTP.reset()
+    outbox = _outbox()
+    await outbox.start()
+
+    outbox.enqueue(
+        OutboundEmail(
+            sender="a@example.com", recipient="first@example.com", payload="hi"
+        )
+    )
+    await outbox.drain()
+    FlakySMTP.failures = 1  # the server closed the idle connection
+    outbox.enqueue(
+        OutboundEmail(
+            sender="a@example.com", recipient="second@example.com", payload="hi"
+        )
+    )
+    await outbox.stop()
+
+    assert FlakySMTP.delivered == ["first@example.com", "second@example.com"]
+    assert FlakySMTP.connections == 2
+    assert outbox.metrics.retried == 0
+
+
+def test_service_sends_directly_when_outbox_is_not_running() -> None:
+    FlakySMTP.reset()
+    outbox = _outbox()
+    service = EmailService(
+        smtp_backend=FlakySMTP, settings_obj=SMTP_SETTINGS, outbox=outbox
+    )
+
+    service.send_verification_email("user@example.com", "token")
+
+    assert FlakySMTP.delivered == ["user@example.com"]
+    assert outbox.metrics.enqueued == 0
+
+
+@pytest.mark.asyncio
+async def test_outbox_dead_letters_after_max_attempts() -> None:
+    FlakySMTP.reset(failures=10)
+    outbox = _outbox(max_attempts=2)
+    await outbox.start()
+
+    outbox.enqueue(
+        OutboundEmail(sender="a@example.com", recipient="b@example.com", payload="hi")
+    )
+    await outbox.stop()
+
+    assert FlakySMTP.delivered == []
+    assert len(outbox.dead_letters) == 1
+    assert outbox.dead_letters[0].attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_outbox_delivers_to_local_smtp_server() -> None:
+    pytest.importorskip("aiosmtpd")
+    from aiosmtpd.controller import Controller
+    from aiosmtpd.handlers import Sink
+    from aiosmtpd.smtp import AuthResult
+
+    class RecordingHandler(Sink):
+        def __init__(self) -> None:
+            self.envelopes = []
+
+        async def handle_DATA(self, server, session, envelope):
+            self.envelopes.append(envelope)
+            return "250 OK"
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    handler = RecordingHandler()
+    controller = Controller(
+        handler,
+        hostname="127.0.0.1",
+        port=port,
+        auth_require_tls=False,
+        authenticator=lambda *args: AuthResult(success=True),
+    )
+    controller.start()
+    try:
+        local_settings = replace(SMTP_SETTINGS, smtp_port=port)
+        outbox = EmailOutbox(settings_obj=local_settings, workers=2, max_attempts=1)
+        await outbox.start()
+        service = EmailService(settings_obj=local_settings, outbox=outbox)
+
+        service.send_password_reset_email("user@example.com", "resettoken")
+        await outbox.stop()
+    finally:
+        controller.stop()
+
+    assert len(handler.envelopes) == 1
+    envelope = handler.envelopes[0]
+    assert envelope.rcpt_tos == ["user@example.com"]
+    assert b"/reset-password?token=resettoken" in envelope.content
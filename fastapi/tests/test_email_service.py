@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from dataclasses import replace
 
 import pytest
@@ -89,3 +90,51 @@ def test_send_email_with_credentials() -> None:
     assert sender == "Boilerplate <mailer@example.com>"
     assert recipients == ["user@example.com"]
     assert "/reset-password?token=resettoken" in message
+
+
+def _write_template(path, text: str, mtime_ns: int) -> None:
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_templates_are_compiled_once(tmp_path) -> None:
+    template = tmp_path / "greeting.html"
+    _write_template(template, "Hello ${name}, $$5 off", 1_000_000_000)
+    service = EmailService(template_dir=tmp_path, reload_templates=False)
+
+    assert service._render("greeting.html", {"name": "Ada"}) == "Hello Ada, $5 off"
+
+    _write_template(template, "Changed ${name}", 2_000_000_000)
+    assert service._render("greeting.html", {"name": "Ada"}) == "Hello Ada, $5 off"
+
+
+def test_templates_reload_when_mtime_changes(tmp_path) -> None:
+    template = tmp_path / "greeting.html"
+    _write_template(template, "Hello ${name}", 1_000_000_000)
+    service = EmailService(template_dir=tmp_path, reload_templates=True)
+    assert service._render("greeting.html", {"name": "Ada"}) == "Hello Ada"
+
+    _write_template(template, "Goodbye $name", 2_000_000_000)
+
+    assert service._render("greeting.html", {"name": "Ada"}) == "Goodbye Ada"
+
+
+def test_render_batch_personalizes_each_body() -> None:
+    service = EmailService()
+
+    bodies = service.render_batch(
+        "verify_email.html",
+        [{"verification_link": f"https://example.com/{index}"} for index in range(3)],
+    )
+
+    assert len(bodies) == 3
+    assert all(
+        f"https://example.com/{index}" in body for index, body in enumerate(bodies)
+    )
+
+
+def test_missing_template_raises() -> None:
+    service = EmailService()
+
+    with pytest.raises(FileNotFoundError):
+        service._render("missing.html", {})
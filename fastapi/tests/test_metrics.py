@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import database, metrics
+from app.core.config import settings
+from app.core.metrics import (
+    Histogram,
+    MetricsMiddleware,
+    instrument_engine,
+    render_metrics,
+    track,
+)
+from app.routes.metrics import read_metrics
+from app.services import HashExecutor
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    histogram = Histogram("demo_seconds", "Demo.", ("route",), (0.1, 1.0))
+    histogram.observe(("/a",), 0.05)
+    histogram.observe(("/a",), 0.5)
+    histogram.observe(("/a",), 5)
+
+    lines = histogram.render()
+
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'demo_seconds_sum{route="/a"} 5.55' in lines
+    assert 'demo_seconds_count{route="/a"} 3' in lines
+
+
+def test_track_is_a_shared_noop_outside_requests() -> None:
+    assert track("jwt") is track("db")
+
+
+def test_middleware_records_route_phases_and_queries() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_engine(engine)
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/instrumented/{item_id}")
+    async def read_item(item_id: int) -> dict:
+        with track("jwt"):
+            pass
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            await connection.execute(text("SELECT 2"))
+        return {"id": item_id}
+
+    with TestClient(app) as client:
+        assert client.get("/instrumented/1").status_code == 200
+        assert client.get("/instrumented/2").status_code == 200
+
+    output = render_metrics()
+    route = 'route="/instrumented/{item_id}"'
+    assert (
+        f'http_request_duration_seconds_count{{method="GET",{route},status="200"}} 2'
+        in output
+    )
+    assert f"http_request_queries_sum{{{route}}} 4.0" in output
+    assert f'http_request_phase_seconds_count{{{route},phase="jwt"}} 2' in output
+    assert metrics._current.get() is None
+
+
+@pytest.mark.asyncio
+async def test_monotonic_stats_are_exported_as_counters(monkeypatch, tmp_path) -> None:
+    engine = database.build_engine(f"sqlite+aiosqlite:///{tmp_path / 'm.db'}", settings)
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "read_engine", None)
+    executor = HashExecutor(max_workers=1, max_pending=1)
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+        output = read_metrics(executor).body.decode()
+    finally:
+        executor.shutdown()
+        await engine.dispose()
+
+    for name in (
+        "db_pool_checkouts_total",
+        "db_pool_checkout_wait_seconds_total",
+        "db_pool_disconnects_total",
+        "password_hash_submitted_total",
+        "password_hash_rejected_total",
+        "password_hash_completed_total",
+        "password_hash_queue_wait_seconds_total",
+        "notifications_publish_failures_total",
+    ):
+        assert f"# TYPE {name} counter" in output
+    for name in ("db_pool_in_use", "db_pool_size", "password_hash_pending"):
+        assert f"# TYPE {name} gauge" in output
+    assert 'db_pool_checkouts_total{engine="primary"} 1' in output
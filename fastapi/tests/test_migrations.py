@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.dialects import sqlite
+
+from app.core.config import settings
+from app.models import Team, TeamMembership, User
+from app.routes.team import _teams_for_user
+from app.services import TeamService
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture()
+def migrated_engine(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    monkeypatch.setattr(settings, "database_url", url)
+    # No config file, so env.py leaves the test run's logging alone.
+    config = Config()
+    config.set_main_option("script_location", str(ROOT_DIR / "alembic"))
+    command.upgrade(config, "head")
+
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User),
+            [
+                {
+                    "email": f"user{index}@example.com",
+                    "password": "x",
+                    "first_name": "User",
+                }
+                for index in range(200)
+            ],
+        )
+        connection.execute(
+            insert(Team),
+            [{"name": f"team-{index}", "owner_id": index + 1} for index in range(100)],
+        )
+        connection.execute(
+            insert(TeamMembership),
+            [
+                {
+                    "team_id": team,
+                    "user_id": (team * 7 + offset) % 200 + 1,
+                    "role": "member",
+                }
+                for team in range(1, 101)
+                for offset in range(5)
+            ],
+        )
+        connection.execute(text("ANALYZE"))
+    yield engine
+    engine.dispose()
+
+
+def _plan(engine, statement) -> str:
+    sql = statement.compile(
+        dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    with engine.connect() as connection:
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return "\n".join(row.detail for row in rows)
+
+
+def test_teams_for_user_reads_memberships_from_the_composite_index(
+    migrated_engine,
+) -> None:
+    plan = _plan(migrated_engine, _teams_for_user(8))
+
+    index = "ix_team_memberships_user_id_team_id"
+    assert f"team_memberships USING COVERING INDEX {index} (user_id=?)" in plan
+    assert "SEARCH teams USING INTEGER PRIMARY KEY" in plan
+
+
+def test_membership_lookup_seeks_on_team_and_user(migrated_engine) -> None:
+    plan = _plan(
+        migrated_engine,
+        TeamService._resolve_statement(1, 8, User.email_matches("user7@example.com")),
+    )
+
+    # Either composite index answers (team_id, user_id) with a single seek.
+    assert re.search(
+        r"SEARCH team_memberships USING (COVERING )?INDEX \w+ "
+        r"\((team_id=\? AND user_id=\?|user_id=\? AND team_id=\?)\)",
+        plan,
+    )
+    assert "SEARCH users USING INDEX ix_users_email_lower (<expr>=?)" in plan
+
+
+def test_email_lookup_ignores_case_through_the_lower_index(migrated_engine) -> None:
+    statement = select(User.id).where(User.email_matches("User7@Example.COM"))
+
+    assert "SEARCH users USING INDEX ix_users_email_lower (<expr>=?)" in _plan(
+        migrated_engine, statement
+    )
+    with migrated_engine.connect() as connection:
+        assert connection.execute(statement).scalar_one() == 8
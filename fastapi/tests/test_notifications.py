@@ -0,0 +1,417 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import tempfile
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from app.notifications import (
+    InMemoryBackend,
+    NotificationManager,
+    RedisBackend,
+    UnixSocketBackend,
+)
+from app.notifications.encoding import _json_encode, encode_frame
+from app.notifications.outbound import coalesce_key
+
+
+class FakeWebSocket:
+    def __init__(self) -> None:
+        self.messages: list[str] = []
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, message: str) -> None:
+        self.messages.append(message)
+
+
+class FakeRedis:
+    """Minimal stand-in for the redis.asyncio publish/subscribe API."""
+
+    def __init__(self) -> None:
+        self._subscribers: dict[str, list[asyncio.Queue]] = {}
+
+    def pubsub(self) -> "FakePubSub":
+        return FakePubSub(self)
+
+    async def publish(self, channel: str, data: str) -> int:
+        queues = self._subscribers.get(channel, [])
+        for queue in queues:
+            queue.put_nowait({"type": "message", "channel": channel, "data": data})
+        return len(queues)
+
+
+class FakePubSub:
+    DROPPED = object()
+
+    def __init__(self, server: FakeRedis) -> None:
+        self._server = server
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def drop(self) -> None:
+        """Make ``listen`` fail as if the server connection was lost."""
+        self._queue.put_nowait(self.DROPPED)
+
+    async def subscribe(self, channel: str) -> None:
+        self._server._subscribers.setdefault(channel, []).append(self._queue)
+        self._queue.put_nowait({"type": "subscribe", "channel": channel, "data": 1})
+
+    async def unsubscribe(self, channel: str) -> None:
+        self._server._subscribers[channel].remove(self._queue)
+
+    async def aclose(self) -> None:
+        pass
+
+    async def listen(self):
+        while True:
+            message = await self._queue.get()
+            if message is self.DROPPED:
+                raise ConnectionError("connection lost")
+            yield message
+
+
+async def _wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met before timeout")
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_delivers_to_local_sockets() -> None:
+    manager = NotificationManager(backend=InMemoryBackend())
+    await manager.start()
+    socket = FakeWebSocket()
+    other = FakeWebSocket()
+    await manager.connect(1, socket)
+    await manager.connect(2, other)
+
+    manager.send_user_notification(user_id=1, payload={"event": "ping"})
+    manager.broadcast({"event": "hello"})
+
+    await _wait_for(lambda: len(socket.messages) == 2 and len(other.messages) == 1)
+    assert json.loads(socket.messages[0]) == {"event": "ping"}
+    assert json.loads(other.messages[0]) == {"event": "hello"}
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_unix_socket_backend_fans_out_across_managers() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "notify.sock")
+        worker_a = NotificationManager(backend=UnixSocketBackend(path=path))
+        worker_b = NotificationManager(backend=UnixSocketBackend(path=path))
+        await worker_a.start()
+        await worker_b.start()
+        socket = FakeWebSocket()
+        await worker_a.connect(7, socket)
+
+        worker_b.send_user_notification(user_id=7, payload={"event": "team_invitation"})
+
+        await _wait_for(lambda: socket.messages)
+        assert json.loads(socket.messages[0]) == {"event": "team_invitation"}
+        await worker_b.stop()
+        await worker_a.stop()
+
+
+@pytest.mark.asyncio
+async def test_unix_socket_backend_survives_broker_host_exit() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "notify.sock")
+        host, *workers = [
+            NotificationManager(
+                backend=UnixSocketBackend(path=path, reconnect_delay=0.01)
+            )
+            for _ in range(3)
+        ]
+        for manager in (host, *workers):
+            await manager.start()
+        socket = FakeWebSocket()
+        await workers[1].connect(3, socket)
+
+        stale = [worker._backend._writer for worker in workers]
+        await host.stop()
+        await _wait_for(
+            lambda: all(
+                worker._backend._writer not in (None, old)
+                for worker, old in zip(workers, stale)
+            )
+        )
+        workers[0].send_user_notification(
+            user_id=3, payload={"event": "after_failover"}
+        )
+
+        await _wait_for(lambda: socket.messages)
+        assert json.loads(socket.messages[0]) == {"event": "after_failover"}
+        for manager in workers:
+            await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_fans_out_across_managers() -> None:
+    server = FakeRedis()
+    worker_a = NotificationManager(
+        backend=RedisBackend(url=None, channel="n", client=server)
+    )
+    worker_b = NotificationManager(
+        backend=RedisBackend(url=None, channel="n", client=server)
+    )
+    await worker_a.start()
+    await worker_b.start()
+    socket_a = FakeWebSocket()
+    socket_b = FakeWebSocket()
+    await worker_a.connect(1, socket_a)
+    await worker_b.connect(2, socket_b)
+
+    worker_a.broadcast({"event": "maintenance"})
+
+    await _wait_for(lambda: socket_a.messages and socket_b.messages)
+    assert json.loads(socket_b.messages[0]) == {"event": "maintenance"}
+    await worker_a.stop()
+    await worker_b.stop()
+
+
+@pytest.mark.asyncio
+async def test_redis_listener_skips_malformed_frames(caplog) -> None:
+    server = FakeRedis()
+    manager = NotificationManager(
+        backend=RedisBackend(url=None, channel="n", client=server)
+    )
+    await manager.start()
+    socket = FakeWebSocket()
+    await manager.connect(1, socket)
+
+    await server.publish("n", "{not json")
+    manager.broadcast({"event": "maintenance"})
+
+    await _wait_for(lambda: socket.messages)
+    assert json.loads(socket.messages[0]) == {"event": "maintenance"}
+    assert "malformed notification frame" in caplog.text
+    await manager.stop()
+
+
+class FailingBackend(InMemoryBackend):
+    async def publish(self, envelope) -> None:
+        raise ConnectionError("broker down")
+
+
+@pytest.mark.asyncio
+async def test_publish_failures_are_logged_and_counted(caplog) -> None:
+    manager = NotificationManager(backend=FailingBackend())
+    await manager.start()
+
+    manager.broadcast({"event": "maintenance"})
+
+    await _wait_for(lambda: manager.publish_failures == 1)
+    assert "Failed to publish notification" in caplog.text
+    assert "broker down" in caplog.text
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_unix_socket_listener_retries_failed_reconnects() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "notify.sock")
+        backend = UnixSocketBackend(path=path, reconnect_delay=0.01)
+        manager = NotificationManager(backend=backend)
+        await manager.start()
+        socket = FakeWebSocket()
+        await manager.connect(5, socket)
+
+        connect = backend._connect
+        failures = []
+
+        async def flaky_connect():
+            if len(failures) < 2:
+                failures.append(1)
+                raise RuntimeError("broker unavailable")
+            return await connect()
+
+        backend._connect = flaky_connect
+        backend._writer.transport.abort()
+        await _wait_for(lambda: len(failures) == 2 and backend._writer is not None)
+        manager.send_user_notification(user_id=5, payload={"event": "after_retry"})
+
+        await _wait_for(lambda: socket.messages)
+        assert json.loads(socket.messages[0]) == {"event": "after_retry"}
+        await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_resubscribes_after_disconnect() -> None:
+    server = FakeRedis()
+    backend = RedisBackend(url=None, channel="n", client=server, reconnect_delay=0.01)
+    manager = NotificationManager(backend=backend)
+    await manager.start()
+    socket = FakeWebSocket()
+    await manager.connect(4, socket)
+
+    dropped = backend._pubsub
+    dropped.drop()
+    await _wait_for(lambda: backend._pubsub not in (None, dropped))
+    manager.send_user_notification(user_id=4, payload={"event": "after_resubscribe"})
+
+    await _wait_for(lambda: socket.messages)
+    assert [json.loads(message) for message in socket.messages] == [
+        {"event": "after_resubscribe"}
+    ]
+    await manager.stop()
+
+
+class SlowWebSocket(FakeWebSocket):
+    def __init__(self, delay: float) -> None:
+        super().__init__()
+        self.delay = delay
+        self.closed_with: int | None = None
+
+    async def send_text(self, message: str) -> None:
+        await asyncio.sleep(self.delay)
+        self.messages.append(message)
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_with = code
+
+
+@pytest.mark.asyncio
+async def test_slow_socket_does_not_delay_fast_sockets() -> None:
+    manager = NotificationManager(backend=InMemoryBackend(), send_timeout=5)
+    await manager.start()
+    slow = SlowWebSocket(delay=1)
+    fast = FakeWebSocket()
+    await manager.connect(1, slow)
+    await manager.connect(2, fast)
+
+    manager.broadcast({"event": "hello"})
+
+    await _wait_for(lambda: fast.messages, timeout=0.5)
+    assert slow.messages == []
+    manager.disconnect(1, slow)
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_policy_keeps_newest_frames() -> None:
+    manager = NotificationManager(
+        backend=InMemoryBackend(), max_pending=2, slow_consumer_policy="drop_oldest"
+    )
+    slow = SlowWebSocket(delay=0.05)
+    await manager.connect(1, slow)
+
+    manager._send_user_notification(user_id=1, frame=json.dumps({"n": 0}))
+    await asyncio.sleep(0.01)  # the writer is now busy sending frame 0
+    for index in range(1, 6):
+        manager._send_user_notification(user_id=1, frame=json.dumps({"n": index}))
+
+    await _wait_for(lambda: len(slow.messages) == 3)
+    assert [json.loads(message)["n"] for message in slow.messages] == [0, 4, 5]
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_coalesce_policy_replaces_frames_with_the_same_key() -> None:
+    manager = NotificationManager(
+        backend=InMemoryBackend(), max_pending=2, slow_consumer_policy="coalesce"
+    )
+    slow = SlowWebSocket(delay=0.05)
+    await manager.connect(1, slow)
+
+    def send(index: int, event: str) -> None:
+        payload = {"n": index, "event": event, "team_id": 7}
+        manager._send_user_notification(
+            user_id=1, frame=json.dumps(payload), key=coalesce_key(payload)
+        )
+
+    send(0, "team_updated")
+    await asyncio.sleep(0.01)  # the writer is now busy sending frame 0
+    send(1, "team_updated")
+    send(2, "member_joined")
+    send(3, "team_updated")
+    send(4, "team_updated")
+
+    await _wait_for(lambda: len(slow.messages) == 3)
+    await asyncio.sleep(0.1)
+    assert [json.loads(message)["n"] for message in slow.messages] == [0, 2, 4]
+    await manager.stop()
+
+
+def test_coalesce_key_covers_event_and_team() -> None:
+    assert coalesce_key({"event": "team_updated", "team_id": 7}) == "team_updated:7"
+    assert coalesce_key({"event": "team_updated", "team_id": 8}) == "team_updated:8"
+    assert coalesce_key({"message": "hello"}) is None
+
+
+@pytest.mark.asyncio
+async def test_disconnect_policy_and_send_timeout_close_socket() -> None:
+    manager = NotificationManager(
+        backend=InMemoryBackend(),
+        max_pending=1,
+        send_timeout=0.05,
+        slow_consumer_policy="disconnect",
+    )
+    overflowing = SlowWebSocket(delay=0.01)
+    stalled = SlowWebSocket(delay=10)
+    await manager.connect(1, overflowing)
+    await manager.connect(2, stalled)
+
+    manager._broadcast(json.dumps({"n": 1}))
+    manager._send_user_notification(user_id=1, frame=json.dumps({"n": 2}))
+    manager._send_user_notification(user_id=1, frame=json.dumps({"n": 3}))
+
+    await _wait_for(lambda: overflowing.closed_with and stalled.closed_with)
+    assert overflowing.closed_with == 1013
+    assert stalled.closed_with == 1013
+    assert not manager._connections
+
+
+@pytest.mark.asyncio
+async def test_broadcast_encodes_payload_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.notifications import manager as manager_module
+
+    calls = []
+
+    def counting_encode(payload):
+        calls.append(payload)
+        return json.dumps(payload)
+
+    monkeypatch.setattr(manager_module, "encode_frame", counting_encode)
+    manager = NotificationManager(backend=InMemoryBackend())
+    await manager.start()
+    sockets = [FakeWebSocket() for _ in range(20)]
+    for index, socket in enumerate(sockets):
+        await manager.connect(index, socket)
+
+    manager.broadcast({"event": "maintenance"})
+
+    await _wait_for(lambda: all(socket.messages for socket in sockets))
+    assert len(calls) == 1
+    assert all(socket.messages[0] is sockets[0].messages[0] for socket in sockets)
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_envelope_without_frame_is_still_delivered() -> None:
+    manager = NotificationManager(backend=InMemoryBackend())
+    socket = FakeWebSocket()
+    await manager.connect(5, socket)
+
+    await manager._deliver({"user_id": 5, "payload": {"event": "legacy"}})
+
+    await _wait_for(lambda: socket.messages)
+    assert json.loads(socket.messages[0]) == {"event": "legacy"}
+    await manager.stop()
+
+
+@pytest.mark.parametrize("encode", [encode_frame, _json_encode])
+def test_payload_round_trips_through_every_encoder(encode) -> None:
+    sent_at = datetime(2024, 5, 1, 12, 30, 15, 250000, tzinfo=UTC)
+    payload = {"event": "team_updated", "sent_at": sent_at, "roles": {7: "owner"}}
+
+    decoded = json.loads(encode(payload))
+
+    assert datetime.fromisoformat(decoded.pop("sent_at")) == sent_at
+    assert decoded == {"event": "team_updated", "roles": {"7": "owner"}}
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import inspect
+from datetime import UTC, datetime
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import event
+
+from app.core.cache import MemoryPrincipalCache, Principal
+from app.core.dependency import get_auth_principal, get_db
+from app.models import User
+from app.services.user import UserService
+
+
+def _principal(user_id: int = 1, first_name: str = "Ada") -> Principal:
+    now = datetime.now(UTC)
+    return Principal(
+        id=user_id,
+        email=f"user{user_id}@example.com",
+        first_name=first_name,
+        last_name="",
+        is_active=True,
+        is_admin=False,
+        is_email_verified=True,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_expires_entries_after_ttl() -> None:
+    clock = FakeClock()
+    cache = MemoryPrincipalCache(ttl_seconds=10, max_entries=10, clock=clock)
+    await cache.set(_principal())
+
+    assert (await cache.get(1)).first_name == "Ada"
+
+    clock.now = 11
+    assert await cache.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_evicts_least_recently_used() -> None:
+    cache = MemoryPrincipalCache(ttl_seconds=60, max_entries=2)
+    await cache.set(_principal(1))
+    await cache.set(_principal(2))
+    await cache.get(1)
+    await cache.set(_principal(3))
+
+    assert await cache.get(1) is not None
+    assert await cache.get(2) is None
+    assert await cache.get(3) is not None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_hides_stale_entry() -> None:
+    cache = MemoryPrincipalCache(ttl_seconds=60, max_entries=10)
+    await cache.set(_principal(first_name="Old"))
+
+    await cache.invalidate(1)
+    assert await cache.get(1) is None
+
+    await cache.set(_principal(first_name="New"))
+    assert (await cache.get(1)).first_name == "New"
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_keeps_nothing_for_invalidated_users() -> None:
+    cache = MemoryPrincipalCache(ttl_seconds=60, max_entries=2)
+    for user_id in range(1, 101):
+        await cache.set(_principal(user_id))
+        await cache.invalidate(user_id)
+
+    assert len(cache._entries) == 0
+
+
+def test_principal_json_round_trip() -> None:
+    principal = _principal()
+
+    assert Principal.from_json(principal.to_json()) == principal
+
+
+@pytest.mark.asyncio
+async def test_get_auth_principal_skips_database_on_cache_hit(async_db_session) -> None:
+    user = User(email="cached@example.com", password="x", first_name="Cache")
+    async_db_session.add(user)
+    await async_db_session.commit()
+
+    statements: list[str] = []
+    sync_engine = async_db_session.bind.sync_engine
+
+    def _record(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    event.listen(sync_engine, "before_cursor_execute", _record)
+    try:
+        token = UserService().create_tokens(user.id)["access"]
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        cache = MemoryPrincipalCache(ttl_seconds=60, max_entries=10)
+
+        first = await get_auth_principal(credentials, async_db_session, cache)
+        second = await get_auth_principal(credentials, async_db_session, cache)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _record)
+
+    assert first == second
+    assert first.email == "cached@example.com"
+    assert len(statements) == 1
+
+
+def test_get_auth_principal_loads_misses_from_the_primary() -> None:
+    # A replica read right after an invalidating write would cache the old row.
+    db = inspect.signature(get_auth_principal).parameters["db"].default
+
+    assert db.dependency is get_db
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import select
+
+from app.core.query_budget import QueryBudget, QueryBudgetExceeded
+from app.models import User
+
+
+async def _load_users_one_by_one(session, user_ids: list[int]) -> list[User]:
+    users = []
+    for user_id in user_ids:
+        result = await session.execute(select(User).where(User.id == user_id))
+        users.append(result.scalar_one_or_none())
+    return users
+
+
+@pytest.mark.asyncio
+async def test_repeated_statements_are_reported_with_call_sites(
+    async_db_session, query_budget
+) -> None:
+    with pytest.raises(QueryBudgetExceeded) as excinfo:
+        with query_budget():
+            await _load_users_one_by_one(async_db_session, [1, 2, 3])
+
+    message = str(excinfo.value)
+    assert "repeated more than 2 times" in message
+    assert "[repeated]" in message
+    assert "tests/test_query_budget.py" in message
+    assert "_load_users_one_by_one" in message
+
+
+@pytest.mark.asyncio
+async def test_budget_fails_when_exceeded(async_db_session, query_budget) -> None:
+    with pytest.raises(QueryBudgetExceeded, match="2 queries executed, budget is 1"):
+        with query_budget(1, max_repeats=None):
+            await _load_users_one_by_one(async_db_session, [1, 2])
+
+
+@pytest.mark.asyncio
+async def test_decorator_passes_within_budget(async_db_session) -> None:
+    @QueryBudget(1, binds=[async_db_session])
+    async def load_all() -> list[User]:
+        return (await async_db_session.scalars(select(User))).all()
+
+    assert await load_all() == []
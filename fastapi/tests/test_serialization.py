@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.core.serialization import construct, encode, trusted_response
+from app.models import User
+from app.schemas import TeamDetail, UserAuth, UserSummary
+
+NOW = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=UTC)
+
+
+def _user(**overrides) -> User:
+    values = dict(
+        id=7,
+        email="ada@example.com",
+        password="hashed",
+        first_name="Ada",
+        last_name="Lovelace",
+        is_active=True,
+        is_admin=False,
+        is_email_verified=True,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+    values.update(overrides)
+    return User(**values)
+
+
+def _team() -> dict:
+    member = {
+        "user_id": 7,
+        "email": "ada@example.com",
+        "role": "owner",
+        "status": "active",
+        "invited_by_id": None,
+        "joined_at": NOW,
+    }
+    return {
+        "id": 1,
+        "name": "core",
+        "owner_id": 7,
+        "created_at": NOW,
+        "updated_at": NOW,
+        "members": [member],
+    }
+
+
+def _invalid_auth() -> dict:
+    token = {"access": "a", "refresh": "r"}
+    return {"user": _user(email="not-an-email"), "token": token}
+
+
+@pytest.mark.parametrize(
+    ("model", "source"),
+    [
+        (UserAuth, {"user": _user(), "token": {"access": "a", "refresh": "r"}}),
+        (TeamDetail, _team()),
+    ],
+)
+def test_trusted_output_matches_validated_output(model, source) -> None:
+    validated = model.model_validate(source, from_attributes=True)
+
+    response = trusted_response(model, source)
+
+    assert response.body == validated.model_dump_json().encode()
+    assert construct(model, source) == validated
+
+
+def test_trusted_output_skips_validation() -> None:
+    response = trusted_response(UserAuth, _invalid_auth())
+
+    assert json.loads(response.body)["user"]["email"] == "not-an-email"
+
+
+def test_validation_runs_when_trusted_output_is_disabled(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "trusted_output", False)
+
+    with pytest.raises(ValidationError):
+        trusted_response(UserAuth, _invalid_auth())
+
+
+def test_projection_keeps_only_selected_fields() -> None:
+    line = encode(
+        UserSummary, {"id": 3, "email": "grace@example.com"}, exclude_unset=True
+    )
+
+    assert json.loads(line) == {"id": 3, "email": "grace@example.com"}
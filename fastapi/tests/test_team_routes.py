@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.cache import Principal
+from app.models import Team, TeamMembership, User
+from app.routes.team import create_team, invite_member, list_teams, update_member
+from app.schemas import TeamCreate, TeamInviteRequest, TeamMemberUpdate
+from app.services import TeamService
+
+
+async def _seed_teams(session, team_count: int) -> User:
+    owner = User(email="owner@example.com", password="x", first_name="Owner")
+    member = User(email="member@example.com", password="x", first_name="Member")
+    session.add_all([owner, member])
+    await session.flush()
+
+    for index in range(team_count):
+        team = Team(name=f"team-{index}", owner_id=owner.id)
+        session.add(team)
+        await session.flush()
+        session.add_all(
+            [
+                TeamMembership(team_id=team.id, user_id=owner.id, role="owner"),
+                TeamMembership(team_id=team.id, user_id=member.id, role="member"),
+            ]
+        )
+    await session.commit()
+    return owner
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("team_count", [1, 10, 50])
+async def test_list_teams_query_count_is_flat(
+    async_db_session, query_budget, team_count
+) -> None:
+    owner = await _seed_teams(async_db_session, team_count)
+    principal = Principal.from_user(owner)
+
+    with query_budget(2, max_repeats=1) as budget:
+        response = await list_teams(db=async_db_session, current_user=principal)
+
+    teams = json.loads(response.body)
+    assert len(teams) == team_count
+    assert all(len(team["members"]) == 2 for team in teams)
+    assert {member["email"] for member in teams[0]["members"]} == {
+        "owner@example.com",
+        "member@example.com",
+    }
+    assert budget.count == 2
+
+
+@pytest.mark.asyncio
+async def test_create_team_inserts_team_and_owner_in_two_statements(
+    async_db_session, query_budget
+) -> None:
+    owner = User(email="owner@example.com", password="x", first_name="Owner")
+    async_db_session.add(owner)
+    await async_db_session.commit()
+
+    with query_budget(2) as budget:
+        response = await create_team(
+            TeamCreate(name="core"),
+            db=async_db_session,
+            current_user=Principal.from_user(owner),
+        )
+
+    assert budget.count == 2
+    assert response.status_code == 201
+    body = json.loads(response.body)
+    assert (body["name"], body["owner_id"]) == ("core", owner.id)
+    assert [(member["email"], member["role"]) for member in body["members"]] == [
+        ("owner@example.com", "owner")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_create_team_rejects_taken_name_without_a_lookup(
+    async_db_session, query_budget
+) -> None:
+    team, owner, _, _ = await _seed_team(async_db_session)
+
+    with query_budget(1), pytest.raises(HTTPException) as excinfo:
+        await create_team(
+            TeamCreate(name=team.name.upper()),
+            db=async_db_session,
+            current_user=Principal.from_user(owner),
+        )
+
+    assert excinfo.value.status_code == 400
+    assert excinfo.value.detail == "A team with that name already exists."
+
+
+async def _seed_team(session) -> tuple[Team, User, User, User]:
+    owner = User(email="owner@example.com", password="x", first_name="Owner")
+    member = User(email="member@example.com", password="x", first_name="Member")
+    outsider = User(email="outsider@example.com", password="x", first_name="Outsider")
+    session.add_all([owner, member, outsider])
+    await session.flush()
+    team = Team(name="core", owner_id=owner.id)
+    session.add(team)
+    await session.flush()
+    session.add_all(
+        [
+            TeamMembership(team_id=team.id, user_id=owner.id, role="owner"),
+            TeamMembership(team_id=team.id, user_id=member.id, role="member"),
+        ]
+    )
+    await session.commit()
+    return team, owner, member, outsider
+
+
+@pytest.mark.asyncio
+async def test_invite_member_resolves_and_inserts_in_two_statements(
+    async_db_session, query_budget
+) -> None:
+    team, owner, _, outsider = await _seed_team(async_db_session)
+
+    with query_budget(2) as budget:
+        response = await invite_member(
+            team.id,
+            TeamInviteRequest(email="Outsider@Example.com", role="admin"),
+            db=async_db_session,
+            current_user=Principal.from_user(owner),
+            team_service=TeamService(),
+        )
+
+    assert budget.count == 2
+    assert response.status_code == 201
+    body = json.loads(response.body)
+    assert body["user_id"] == outsider.id
+    assert body["email"] == "outsider@example.com"
+    assert (body["role"], body["status"], body["invited_by_id"]) == (
+        "admin",
+        "active",
+        owner.id,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("actor", "email", "status_code", "statements"),
+    [
+        ("member", "outsider@example.com", 403, 1),
+        ("owner", "nobody@example.com", 404, 1),
+        ("owner", "member@example.com", 400, 2),
+    ],
+)
+async def test_invite_member_errors(
+    async_db_session, query_budget, actor, email, status_code, statements
+) -> None:
+    team, owner, member, _ = await _seed_team(async_db_session)
+    principal = Principal.from_user(owner if actor == "owner" else member)
+
+    with query_budget() as budget, pytest.raises(HTTPException) as excinfo:
+        await invite_member(
+            team.id,
+            TeamInviteRequest(email=email),
+            db=async_db_session,
+            current_user=principal,
+            team_service=TeamService(),
+        )
+
+    assert excinfo.value.status_code == status_code
+    assert budget.count == statements
+
+
+@pytest.mark.asyncio
+async def test_update_member_resolves_and_updates_in_two_statements(
+    async_db_session, query_budget
+) -> None:
+    team, owner, member, _ = await _seed_team(async_db_session)
+
+    with query_budget(2) as budget:
+        response = await update_member(
+            team.id,
+            member.id,
+            TeamMemberUpdate(role="admin"),
+            db=async_db_session,
+            current_user=Principal.from_user(owner),
+            team_service=TeamService(),
+        )
+
+    assert budget.count == 2
+    body = json.loads(response.body)
+    assert (body["user_id"], body["email"], body["role"], body["status"]) == (
+        member.id,
+        "member@example.com",
+        "admin",
+        "active",
+    )
+
+
+@pytest.mark.asyncio
+async def test_update_member_rejects_non_members(
+    async_db_session, query_budget
+) -> None:
+    team, owner, _, outsider = await _seed_team(async_db_session)
+
+    with query_budget(2), pytest.raises(HTTPException) as excinfo:
+        await update_member(
+            team.id,
+            outsider.id,
+            TeamMemberUpdate(status="suspended"),
+            db=async_db_session,
+            current_user=Principal.from_user(owner),
+            team_service=TeamService(),
+        )
+
+    assert excinfo.value.status_code == 404
+    assert excinfo.value.detail == "Member not found in this team."
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
 from jose import jwt
 
 from app.core.config import settings
+from app.services.hashing import HashExecutor
 from app.services.user import UserService
 
 
@@ -23,6 +29,38 @@ def test_hash_and_verify_long_password() -> None:
     assert service.verify_password(password, hashed)
 
 
+@pytest.mark.asyncio
+async def test_async_hash_and_verify_run_in_executor() -> None:
+    executor = HashExecutor(max_workers=2, max_pending=4)
+    service = UserService(hash_executor=executor)
+
+    hashed = await service.hash_password_async("Sup3rSecure!")
+
+    assert await service.verify_password_async("Sup3rSecure!", hashed)
+    assert not await service.verify_password_async("wrong-password", hashed)
+    assert executor.metrics.completed == 3
+    assert executor.pending == 0
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hash_executor_rejects_when_queue_is_full() -> None:
+    executor = HashExecutor(max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    blocked = asyncio.create_task(executor.run(release.wait))
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await executor.run(lambda: None)
+
+    release.set()
+    await blocked
+    assert exc_info.value.status_code == 503
+    assert executor.metrics.rejected == 1
+    executor.shutdown()
+
+
 def test_token_creation_and_decoding() -> None:
     service = UserService()
 